@@ -0,0 +1,95 @@
+"""
+Background writer for auto-saves.
+
+The main loop prepares a save job (a frozen snapshot of what has to be
+written) and hands it to BackgroundSaver, whose thread does the file I/O while
+the player keeps playing. Jobs that pile up while a write is in flight are
+coalesced: consecutive journal entries are merged into one write, and a new
+base snapshot makes everything queued before it unnecessary.
+
+Write failures are kept until the main loop asks for them with take_errors(),
+so they can be shown at the next prompt instead of in the middle of a command.
+"""
+
+import threading
+
+class BackgroundSaver:
+    """Runs save jobs one at a time on a worker thread"""
+
+    def __init__(self):
+        self._pending = []
+        self._busy = False
+        self._errors = []
+        self._condition = threading.Condition()
+        self._thread = None
+        self.coalesced = 0
+
+    def submit(self, job):
+        """Queue a job.
+
+        Jobs have run(), and optionally merge(later) -> bool to absorb a later
+        job, supersedes(earlier) -> bool if they make a queued job unnecessary,
+        cancel() for when they are dropped and failed() for when run() raises.
+        """
+        with self._condition:
+            if hasattr(job, "supersedes"):
+                kept = []
+                for queued in self._pending:
+                    if job.supersedes(queued):
+                        if hasattr(queued, "cancel"):
+                            queued.cancel()
+                        self.coalesced += 1
+                    else:
+                        kept.append(queued)
+                self._pending = kept
+            if self._pending and hasattr(self._pending[-1], "merge") and self._pending[-1].merge(job):
+                self.coalesced += 1
+                return
+            self._pending.append(job)
+            self._condition.notify_all()
+
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="background-save", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                job = self._pending.pop(0)
+                self._busy = True
+            try:
+                if job is not None:
+                    job.run()
+            except Exception as e:
+                if hasattr(job, "failed"):
+                    job.failed()
+                with self._condition:
+                    self._errors.append(e)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+            if job is None:
+                return
+
+    def wait(self, timeout=None):
+        """Block until every queued write has finished; returns False on timeout"""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def take_errors(self):
+        """Return and clear the write errors since the last call"""
+        with self._condition:
+            errors, self._errors = self._errors, []
+        return errors
+
+    def stop(self):
+        """Finish pending writes and stop the worker thread"""
+        if self._thread is not None:
+            with self._condition:
+                self._pending.append(None)
+                self._condition.notify_all()
+            self._thread.join(timeout=30)
+            self._thread = None
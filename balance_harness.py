@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo balance harness: thousands of games played by a bot.
+
+    python balance_harness.py --games 2000 --workers 8 --seed 1 --csv runs.csv --json report.json
+
+Each game is a new game played through the headless GameEngine, so it runs
+the real world generation and command handlers. A simple bot decides every
+turn: fight what is in the room (or run when it is low on HP), take weapons
+and armor, equip armor, buy a weapon or armor at shops, descend when it can,
+and otherwise explore towards rooms it has not seen, outwards from the start.
+
+Games are split over a multiprocessing pool. Game i uses seed `seed + i` for
+the world, the rng_streams and the bot itself, so any game in the report can
+be played again on its own:
+
+    python balance_harness.py --replay-seed 1234 --verbose
+
+The report has one row per game (death floor, distance reached, level, gold,
+turns survived, ...) and the distribution of each of them.
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+DIRECTIONS = {"north": (0, 1), "south": (0, -1), "east": (1, 0), "west": (-1, 0)}
+
+# Columns of the per-game report
+RESULT_FIELDS = ("seed", "died", "death_floor", "turns", "floor", "max_distance", "level", "gold",
+                 "enemies_defeated", "bosses_defeated", "damage_taken", "weapons_broken", "error")
+
+class BotPlayer:
+    """Explore/fight/flee/buy policy over the game state"""
+
+    def __init__(self, seed, flee_fraction=0.3):
+        self.rng = random.Random(seed)
+        self.flee_fraction = flee_fraction
+        self.visited = set()  # (floor, x, y)
+
+    def choose(self, state, room):
+        """(command, choices) for the next turn"""
+        self.visited.add((state.player_floor, state.player_x, state.player_y))
+        enemy = room.get("enemy")
+        swarm = isinstance(enemy, list)
+        if enemy and (swarm or not enemy.get("is_training_dummy")):
+            low = state.player_hp <= state.player_max_hp * self.flee_fraction
+            if low and not swarm and state.player_stamina >= 10:
+                return "run", []
+            switch = self.weapon_switch(state)
+            if switch is not None:
+                return "switch", [switch]
+            # Target the first enemy of a swarm; "no" declines the restart on death
+            return "attack", ["1", "no"]
+        if room.get("crystal_type"):
+            return "consume", []
+        take = self.take_choice(state, room)
+        if take is not None:
+            return "take", [take]
+        if room.get("mysterious_key") and state.player_floor not in state.mysterious_keys:
+            return "take_key", []
+        if not state.equipped_armor:
+            wearable = [i for i, armor in enumerate(state.armor_inventory) if armor.get("durability", 0) > 0]
+            if wearable:
+                return "equip", [str(wearable[0] + 1)]
+        if room.get("type") == "shop" and room.get("shop"):
+            purchase = self.purchase(state, room["shop"])
+            if purchase:
+                return "buy", [purchase]
+        if room.get("type") == "stairwell" and (state.player_floor in state.mysterious_keys
+                                                or state.player_floor in state.unlocked_floors):
+            return "descend", []
+        return self.explore(state), []
+
+    @staticmethod
+    def take_choice(state, room):
+        """take choice of an item there is room for, or None.
+
+        One item a turn: "all" raises on rooms with several weapons or armors.
+        """
+        from constants import MAX_WEAPONS, MAX_ARMOR
+        weapons, armors = room.get("weapons") or [], room.get("armors") or []
+        if weapons and len(state.inventory) < MAX_WEAPONS:
+            return "1"
+        if armors and len(state.armor_inventory) < MAX_ARMOR:
+            return str(len(weapons) + 1)
+        return None
+
+    @staticmethod
+    def usable(state, weapon):
+        if weapon.get("is_broken") or weapon.get("durability", 0) <= 0 or weapon["name"] == "Spell Book":
+            return False
+        return not weapon.get("requires_mana") or state.player_mana >= weapon.get("mana_cost", 10)
+
+    def weapon_switch(self, state):
+        """switch choice that puts the best usable weapon (or fists) in hand, or None to keep the current one"""
+        usable = [i for i, weapon in enumerate(state.inventory) if self.usable(state, weapon)]
+        if usable:
+            best = max(usable, key=lambda i: state.inventory[i]["damage"])
+            if state.using_fists or not self.usable(state, state.inventory[0]):
+                return str(best + 1)
+            return None
+        if state.inventory and not state.using_fists:
+            return "0"
+        return None
+
+    def purchase(self, state, shop):
+        """Shop choice worth buying, or None"""
+        if not state.inventory:
+            affordable = [i for i, item in enumerate(shop.get("items", []))
+                          if item.get("cost", 0) <= state.player_money]
+            if affordable:
+                return str(affordable[0] + 1)
+        wearing = state.equipped_armor or any(armor.get("durability", 0) > 0 for armor in state.armor_inventory)
+        if not wearing and shop.get("armor") and state.player_money >= 14:
+            return "R"
+        return None
+
+    def explore(self, state):
+        """Step to an unvisited neighbour, preferring ones further from the start"""
+        x, y = state.player_x, state.player_y
+        options = []
+        for direction, (dx, dy) in DIRECTIONS.items():
+            seen = (state.player_floor, x + dx, y + dy) in self.visited
+            options.append((seen, -(abs(x + dx) + abs(y + dy)), self.rng.random(), direction))
+        return min(options)[-1]
+
+def play_game(seed, max_turns=2000, verbose=False):
+    """Play one bot game from seed; returns its result row"""
+    from game_engine import GameEngine
+    from game_state import state
+    from script_runner import start_game, render_events
+    from world_generation import distance_from_start
+
+    start_game(seed)
+    engine = GameEngine()
+    bot = BotPlayer(seed)
+    result = dict.fromkeys(RESULT_FIELDS)
+    result.update(seed=seed, died=False, max_distance=0, error="")
+    turns = 0
+    try:
+        while not engine.over and turns < max_turns:
+            command, choices = bot.choose(state, engine.current_room())
+            events = engine.step(command, choices)
+            turns += 1
+            if verbose:
+                print(f"> {' | '.join([command, *choices])}")
+                print("\n".join(render_events(events)))
+            result["max_distance"] = max(result["max_distance"], distance_from_start(state.player_x, state.player_y))
+            if state.player_hp <= 0:
+                result["died"] = True
+                result["death_floor"] = state.player_floor
+                break
+    except Exception as e:
+        # Reported with the seed so the game can be replayed
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    result.update(turns=turns, floor=state.player_floor, level=state.player_level, gold=state.player_money,
+                  enemies_defeated=state.enemies_defeated, bosses_defeated=state.bosses_defeated,
+                  damage_taken=state.total_damage_taken, weapons_broken=state.weapons_broken)
+    return result
+
+def _play_batch(args):
+    seeds, max_turns = args
+    return [play_game(seed, max_turns) for seed in seeds]
+
+def run_games(games, seed=0, workers=None, max_turns=2000, batch_size=25):
+    """Result rows of games bot games played over a process pool, in seed order"""
+    seeds = list(range(seed, seed + games))
+    batches = [(seeds[i:i + batch_size], max_turns) for i in range(0, len(seeds), batch_size)]
+    if workers == 1:
+        return [row for batch in map(_play_batch, batches) for row in batch]
+    with Pool(workers) as pool:
+        return [row for batch in pool.imap(_play_batch, batches) for row in batch]
+
+def distribution(values):
+    """Summary statistics of a list of numbers"""
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+    return {
+        "count": len(ordered),
+        "mean": round(statistics.fmean(ordered), 3),
+        "stdev": round(statistics.pstdev(ordered), 3),
+        "min": ordered[0],
+        "p10": percentile(10),
+        "p50": percentile(50),
+        "p90": percentile(90),
+        "max": ordered[-1],
+        "histogram": {str(value): ordered.count(value) for value in sorted(set(ordered))}
+        if len(set(ordered)) <= 30 else None,
+    }
+
+def summarize(results):
+    """Report dict: death rate, errors and the distribution of every numeric column"""
+    deaths = [row for row in results if row["died"]]
+    errors = [row for row in results if row["error"]]
+    report = {
+        "games": len(results),
+        "death_rate": round(len(deaths) / len(results), 4) if results else 0,
+        "errors": len(errors),
+        "error_seeds": [row["seed"] for row in errors][:50],
+        "death_floor": distribution([row["death_floor"] for row in deaths]),
+    }
+    for column in ("turns", "max_distance", "floor", "level", "gold", "enemies_defeated", "damage_taken"):
+        report[column] = distribution([row[column] for row in results])
+    return report
+
+def write_csv(results, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play bot games and report balance statistics")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game; game i uses seed + i")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per CPU)")
+    parser.add_argument("--max-turns", type=int, default=2000, help="turns before a game is stopped")
+    parser.add_argument("--csv", help="write one row per game to this file")
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--replay-seed", type=int, help="play only the game with this seed")
+    parser.add_argument("--verbose", action="store_true", help="print every turn of --replay-seed")
+    args = parser.parse_args(argv)
+
+    if args.replay_seed is not None:
+        result = play_game(args.replay_seed, args.max_turns, verbose=args.verbose)
+        print(json.dumps(result, indent=2))
+        return result
+
+    start = time.perf_counter()
+    results = run_games(args.games, args.seed, args.workers, args.max_turns)
+    elapsed = time.perf_counter() - start
+    report = summarize(results)
+    report["seconds"] = round(elapsed, 3)
+
+    print(f"\n=== BALANCE REPORT ({report['games']} games, {elapsed:.1f}s) ===")
+    print(f"Death rate: {report['death_rate']:.1%}   Errors: {report['errors']}")
+    for column in ("death_floor", "turns", "max_distance", "floor", "level", "gold", "enemies_defeated"):
+        stats = report[column]
+        if stats["count"]:
+            print(f"{column:>16}: mean {stats['mean']:>8}  p10 {stats['p10']:>5}  p50 {stats['p50']:>5}  "
+                  f"p90 {stats['p90']:>5}  max {stats['max']:>5}")
+    if report["error_seeds"]:
+        print(f"Seeds that raised: {', '.join(map(str, report['error_seeds'][:10]))}")
+    if args.csv:
+        write_csv(results, args.csv)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+if __name__ == "__main__":
+    main()
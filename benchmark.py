@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+Performance benchmarks for Adventure Game
+Run all benchmarks: python benchmark.py
+Run one benchmark:  python benchmark.py chunk_generation
+"""
+
+import random
+import sys
+import os
+import time
+import tracemalloc
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import world_generation
+from constants import CHUNK_SIZE
+
+def bench_chunk_generation(chunks=40, size=CHUNK_SIZE):
+    """Rooms per second: scalar generate_room versus vectorized generate_chunk (both compact when COMPACT_ROOMS is on)"""
+    from bulk_generation import generate_chunk, numpy_available
+
+    print(f"\n=== CHUNK GENERATION ({chunks} chunks of {size}x{size}) ===")
+    total_rooms = chunks * size * size
+
+    rng = random.Random(1)
+    start = time.perf_counter()
+    for chunk in range(chunks):
+        for i in range(size * size):
+            x = chunk * size + i % size
+            y = i // size
+            world_generation.generate_room(1, x, y, (), rng)
+    scalar_time = time.perf_counter() - start
+    scalar_rate = total_rooms / scalar_time
+    print(f"Scalar generate_room:  {scalar_rate:,.0f} rooms/sec")
+
+    if not numpy_available():
+        print("Vectorized generate_chunk: skipped (NumPy not installed)")
+        return
+
+    start = time.perf_counter()
+    for chunk in range(chunks):
+        generate_chunk(1, chunk, 0, size, seed=1)
+    bulk_time = time.perf_counter() - start
+    bulk_rate = total_rooms / bulk_time
+    print(f"Vectorized generate_chunk: {bulk_rate:,.0f} rooms/sec ({bulk_rate / scalar_rate:.2f}x)")
+
+def bench_room_memory(rooms=100_000):
+    """Bytes per room for a world of plain dict rooms versus compact __slots__ records"""
+    from models import compact_room
+
+    print(f"\n=== ROOM MEMORY ({rooms:,} rooms) ===")
+    side = int(rooms ** 0.5)
+
+    def measure(build):
+        rng = random.Random(1)
+        tracemalloc.start()
+        world = {}
+        for i in range(rooms):
+            x, y = i % side, i // side
+            world[(x, y)] = build(world_generation.create_room(1, x, y, (), rng))
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return used / rooms
+
+    dict_bytes = measure(lambda room: room)
+    print(f"Plain dicts:     {dict_bytes:,.0f} bytes/room")
+    compact_bytes = measure(compact_room)
+    print(f"__slots__ rooms: {compact_bytes:,.0f} bytes/room ({1 - compact_bytes / dict_bytes:.0%} smaller)")
+
+def bench_save_streaming(rooms=20_000):
+    """Peak memory of saving and loading a world: whole-document json versus the streaming save format"""
+    import json
+    import tempfile
+    from unittest.mock import patch
+    import save_load
+    from models import to_plain
+    from save_stream import iter_save_document
+
+    print(f"\n=== SAVE STREAMING ({rooms:,} rooms) ===")
+    side = int(rooms ** 0.5)
+    rng = random.Random(1)
+    worlds = {1: {}}
+    for i in range(rooms):
+        x, y = i % side, i // side
+        worlds[1][(x, y)] = world_generation.create_room(1, x, y, (), rng)
+
+    def peak(action):
+        tracemalloc.start()
+        base, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        action()
+        elapsed = time.perf_counter() - start
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return (peak_bytes - base) / 1024 / 1024, elapsed
+
+    with tempfile.TemporaryDirectory() as save_dir, patch("save_load.SAVE_DIR", save_dir), \
+            patch("save_load.SAVE_BACKEND", "json"):
+        path = save_load.get_save_file_path("bench")
+
+        def dump_whole():
+            with open(path, "w") as f:
+                json.dump({"player_floor": 1, "worlds": save_load.build_world_data(worlds)}, f, default=to_plain)
+
+        def load_whole():
+            with open(path) as f:
+                data = json.load(f)
+            return {int(floor): {tuple(map(int, key.split(","))): room for key, room in rooms.items()}
+                    for floor, rooms in data["worlds"].items()}
+
+        def load_streamed():
+            loaded = {}
+            with open(path) as f:
+                for item in iter_save_document(f):
+                    if item[0] == "room":
+                        _, floor, key, room = item
+                        loaded.setdefault(int(floor), {})[tuple(map(int, key.split(",")))] = room
+            return loaded
+
+        for label, save, load in (("json.dump/json.load", dump_whole, load_whole),
+                                  ("streaming", lambda: save_load.write_save_data("bench", {"player_floor": 1}, worlds),
+                                   load_streamed)):
+            save_mb, save_time = peak(save)
+            load_mb, load_time = peak(load)
+            print(f"{label:20s} save: {save_mb:7.1f} MB peak, {save_time:.2f}s | "
+                  f"load: {load_mb:7.1f} MB peak, {load_time:.2f}s")
+
+def bench_save_migration(rooms=20_000):
+    """Load time of a save from before schema versioning (migrated once) versus a current one"""
+    import io
+    import tempfile
+    from contextlib import redirect_stdout
+    from unittest.mock import patch
+    import save_load
+    from chunk_store import close_worlds
+    from save_migrations import migrate_max_durability
+
+    print(f"\n=== SAVE MIGRATION ({rooms:,} rooms) ===")
+    side = int(rooms ** 0.5)
+    rng = random.Random(1)
+    worlds = {1: {}}
+    for i in range(rooms):
+        x, y = i % side, i // side
+        room = world_generation.create_room(1, x, y, (), rng)
+        for weapon in room.get("weapons") or ():
+            weapon.pop("max_durability", None)
+        worlds[1][(x, y)] = room
+
+    old_seed = world_generation.world_seed
+    world_generation.set_world_seed(None)
+    data = {"save_name": "bench", "player_floor": 1, "player_x": 0, "player_y": 0, "floors_visited": 1}
+    with tempfile.TemporaryDirectory() as save_dir, patch("save_load.SAVE_DIR", save_dir), \
+            patch("save_load.SAVE_BACKEND", "json"):
+        with redirect_stdout(io.StringIO()):
+            save_load.write_save_data("bench", data, worlds)
+
+        def timed_load():
+            start = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                loaded = save_load.load_game("bench")
+            elapsed = time.perf_counter() - start
+            close_worlds(loaded["worlds"])
+            return elapsed, loaded["worlds"]
+
+        first, _ = timed_load()
+        second, loaded_worlds = timed_load()
+        start = time.perf_counter()
+        migrate_max_durability({}, {floor: dict(loaded_worlds[floor].items()) for floor in loaded_worlds})
+        walk = time.perf_counter() - start
+    world_generation.set_world_seed(old_seed)
+
+    print(f"Room walk that every load used to run: {walk:.2f}s")
+    print(f"Unversioned save (migrated and rewritten once): {first:.2f}s")
+    print(f"Current save (no migration steps):              {second:.2f}s")
+
+def bench_save_codecs(rooms=20_000):
+    """File size and save/load round-trip time of JSON saves versus binary saves"""
+    import io
+    import json
+    from save_load import build_room_data
+    from save_stream import write_save_document, iter_save_document
+    from save_binary import write_binary_save, read_binary_save
+
+    print(f"\n=== SAVE CODECS ({rooms:,} rooms) ===")
+    side = int(rooms ** 0.5)
+    rng = random.Random(1)
+    room_data = []
+    for i in range(rooms):
+        x, y = i % side, i // side
+        room_data.append(((1, x, y), build_room_data(world_generation.create_room(1, x, y, (), rng))))
+    fields = [("player_floor", "1"), ("player_x", "0"), ("player_y", "0")]
+
+    def json_round_trip():
+        f = io.StringIO()
+        write_save_document(f, fields, ((key, json.dumps(room, sort_keys=True)) for key, room in room_data), [1])
+        text = f.getvalue()
+        list(iter_save_document(io.StringIO(text)))
+        return len(text.encode("utf-8"))
+
+    def binary_round_trip(compression):
+        f = io.BytesIO()
+        write_binary_save(f, fields, room_data, [1], compression)
+        read_binary_save(io.BytesIO(f.getvalue()))
+        return len(f.getvalue())
+
+    results = []
+    for label, round_trip in (("JSON", json_round_trip),
+                              ("binary + zlib", lambda: binary_round_trip("zlib")),
+                              ("binary + lzma", lambda: binary_round_trip("lzma"))):
+        start = time.perf_counter()
+        size = round_trip()
+        results.append((label, size, time.perf_counter() - start))
+
+    json_size = results[0][1]
+    for label, size, elapsed in results:
+        print(f"{label:14s} {size / 1024:9,.0f} KB ({size / json_size:6.1%} of JSON), "
+              f"save + load {elapsed:.2f}s")
+
+def bench_shared_saves(rooms=20_000, slots=5, changes=10):
+    """Disk use and save time of several slots of one world: JSON files versus manifests with shared chunks"""
+    import io
+    import tempfile
+    from contextlib import redirect_stdout
+    from unittest.mock import patch
+    import save_load
+
+    print(f"\n=== SHARED SAVES ({rooms:,} rooms, {slots} slots, {changes} changed rooms between saves) ===")
+    side = int(rooms ** 0.5)
+    rng = random.Random(1)
+    old_seed = world_generation.world_seed
+    world_generation.set_world_seed(None)
+    data = {"save_name": "bench", "player_floor": 1, "player_x": 0, "player_y": 0}
+
+    def disk_use(directory):
+        return sum(os.path.getsize(os.path.join(root, name))
+                   for root, _, names in os.walk(directory) for name in names)
+
+    for backend in ("json", "objects"):
+        worlds = {1: {}}
+        for i in range(rooms):
+            x, y = i % side, i // side
+            worlds[1][(x, y)] = world_generation.create_room(1, x, y, (), rng)
+        times = []
+        with tempfile.TemporaryDirectory() as save_dir, patch("save_load.SAVE_DIR", save_dir), \
+                patch("save_load.SAVE_BACKEND", backend), redirect_stdout(io.StringIO()):
+            for slot in range(slots):
+                for _ in range(changes if slot else 0):
+                    x, y = rng.randrange(side), rng.randrange(side)
+                    world_generation.get_room(1, x, y, worlds, [])["description"] = f"Changed in slot {slot}"
+                start = time.perf_counter()
+                save_load.write_save_data(f"slot{slot}", data, worlds)
+                times.append(time.perf_counter() - start)
+            size = disk_use(save_dir)
+        print(f"{backend:8s} {size / 1024:9,.0f} KB for {slots} slots, "
+              f"first save {times[0]:.2f}s, later saves {sum(times[1:]) / max(len(times) - 1, 1):.3f}s each")
+    world_generation.set_world_seed(old_seed)
+
+def bench_instant_resume(floors=8, rooms_per_floor=5_000):
+    """Time until a loaded save is playable: full load versus instant resume"""
+    import io
+    import tempfile
+    from contextlib import redirect_stdout
+    from unittest.mock import patch
+    import save_load
+    from chunk_store import close_worlds
+
+    print(f"\n=== INSTANT RESUME ({floors} floors x {rooms_per_floor:,} rooms) ===")
+    side = int(rooms_per_floor ** 0.5)
+    rng = random.Random(1)
+    worlds = {floor: {} for floor in range(1, floors + 1)}
+    for floor, rooms in worlds.items():
+        for i in range(rooms_per_floor):
+            x, y = i % side, i // side
+            rooms[(x, y)] = world_generation.create_room(floor, x, y, (), rng)
+
+    old_seed = world_generation.world_seed
+    world_generation.set_world_seed(None)
+    data = {"save_name": "bench", "player_floor": 1, "player_x": 0, "player_y": 0,
+            "schema_version": save_load.SAVE_SCHEMA_VERSION}
+    results = []
+    with tempfile.TemporaryDirectory() as save_dir, patch("save_load.SAVE_DIR", save_dir), \
+            patch("save_load.SAVE_BACKEND", "objects"), redirect_stdout(io.StringIO()):
+        save_load.write_save_data("bench", data, worlds)
+        for label, resume in (("Full load", False), ("Instant resume", True)):
+            with patch("save_load.INSTANT_RESUME", resume):
+                start = time.perf_counter()
+                loaded = save_load.load_game("bench")
+                playable = time.perf_counter() - start
+                world_generation.get_room(1, 0, 0, loaded["worlds"], [])
+                dict(loaded["worlds"].items())
+                complete = time.perf_counter() - start
+            close_worlds(loaded["worlds"])
+            results.append((label, playable, complete))
+    world_generation.set_world_seed(old_seed)
+
+    for label, playable, complete in results:
+        print(f"{label:15s} playable after {playable:.2f}s, every floor loaded after {complete:.2f}s")
+
+def bench_state_snapshot(saves=5_000):
+    """Time to prepare the player fields of a save: encoding every field versus GameState.snapshot()"""
+    import json
+    from game_state import SAVED_FIELDS, GameState
+    from models import to_plain
+
+    print(f"\n=== STATE SNAPSHOT ({saves:,} saves, one move between saves) ===")
+    state = GameState(
+        inventory=[{"name": f"Sword {i}", "damage": 8 + i, "durability": 20} for i in range(10)],
+        waypoints={f"Camp {i}": (1, i, -i) for i in range(50)},
+        discovered_enemies={f"Enemy {i}" for i in range(200)},
+        learned_spells=[f"Spell {i}" for i in range(30)])
+
+    start = time.perf_counter()
+    for i in range(saves):
+        state.player_x = i
+        fields = {field: getattr(state, field) for field in SAVED_FIELDS}
+        encoded = {field: json.dumps(sorted(value) if isinstance(value, set) else value, sort_keys=True,
+                                     default=to_plain) for field, value in fields.items()}
+    full_time = (time.perf_counter() - start) / saves
+    print(f"Encode every field: {full_time * 1e6:,.0f} us/save")
+
+    start = time.perf_counter()
+    for i in range(saves):
+        state.player_x = i
+        encoded = state.snapshot("bench").encoded
+    snapshot_time = (time.perf_counter() - start) / saves
+    print(f"GameState.snapshot: {snapshot_time * 1e6:,.0f} us/save ({full_time / snapshot_time:.1f}x faster)")
+
+def bench_frame_render(frames=20_000):
+    """Terminal writes and time per show_room frame, with and without the status section cache"""
+    import io
+    from contextlib import redirect_stdout
+    from frame_renderer import status_panel
+    from game_engine import GameEngine
+    from game_state import state
+
+    print(f"\n=== FRAME RENDER ({frames:,} frames) ===")
+
+    class CountingStream(io.StringIO):
+        writes = 0
+
+        def write(self, text):
+            self.writes += 1
+            return super().write(text)
+
+    world_generation.set_world_seed(1)
+    state.reset()
+    state.inventory = [{"name": f"Sword {i}", "damage": 5, "durability": 10} for i in range(4)]
+    state.learned_spells = ["Fireball", "Heal", "Lightning"]
+    state.mysterious_keys = {1: True, 2: True}
+    engine = GameEngine()
+    room = engine.current_room()
+
+    def measure(cached):
+        stream = CountingStream()
+        with redirect_stdout(stream):
+            start = time.perf_counter()
+            for _ in range(frames):
+                if not cached:
+                    status_panel.clear()
+                engine.show_room(room)
+            elapsed = time.perf_counter() - start
+        return elapsed / frames, stream.writes / frames, stream.getvalue().count("\n") / frames
+
+    uncached_time, writes, lines = measure(False)
+    cached_time, _, _ = measure(True)
+    print(f"Writes per frame: {writes:.0f} (the frame has {lines:.0f} lines, one print each before)")
+    print(f"Rebuilding every section: {uncached_time * 1e6:,.1f} us/frame")
+    print(f"Cached status sections:   {cached_time * 1e6:,.1f} us/frame ({uncached_time / cached_time:.2f}x)")
+    state.reset()
+
+def bench_combat_matrix(fights=200):
+    """Fights per second: handle_attack one swing at a time versus the vectorized combat matrix"""
+    from types import SimpleNamespace
+    from combat_matrix import build_matrix, numpy_available
+    from command_handlers import handle_attack
+    from constants import spells
+    from game_io import EventRecorder, use_console
+
+    print(f"\n=== COMBAT MATRIX ({fights} fights per cell) ===")
+    rng = random.Random(1)
+    scalar_fights = 2000
+    start = time.perf_counter()
+    with use_console(EventRecorder()):
+        for _ in range(scalar_fights):
+            room = {"enemy": {"name": "Orc", "hp": rng.randint(17, 33), "base_attack": 10, "armor_pierce": 1}}
+            inventory = [{"name": "Sword", "damage": rng.randint(10, 20), "durability": 20}]
+            player = SimpleNamespace(player_hp=50, player_mana=20, equipped_armor=None)
+            while room["enemy"] and handle_attack(room, inventory, 20, None, player.player_hp, set(), {}, 1, 0, [],
+                                                  spells, False, player=player):
+                pass
+    scalar_rate = scalar_fights / (time.perf_counter() - start)
+    print(f"Scalar handle_attack: {scalar_rate:,.0f} fights/sec")
+
+    if not numpy_available():
+        print("Vectorized combat matrix: skipped (NumPy not installed)")
+        return
+
+    start = time.perf_counter()
+    matrix = build_matrix(fights)
+    elapsed = time.perf_counter() - start
+    total = matrix.death_probability.size * fights
+    print(f"Vectorized combat matrix: {total / elapsed:,.0f} fights/sec "
+          f"({total:,} fights in {elapsed:.2f}s, {total / elapsed / scalar_rate:.0f}x)")
+
+def bench_status_effects(enemies=50_000, turns=200):
+    """Time per turn to expire status effects across a world: scanning every enemy versus the expiry heap"""
+    from game_state import state
+    from game_io import EventRecorder, use_console
+    from status_effects import EffectScheduler
+
+    print(f"\n=== STATUS EFFECTS ({enemies:,} affected enemies, {turns} turns) ===")
+
+    def populate():
+        rng = random.Random(1)
+        world = [{"name": "Goblin", "hp": 20, "effects": []} for _ in range(enemies)]
+        return world, [(enemy["effects"], rng.choice(("Burning", "Poisoned", "Stunned")), rng.randint(1, turns))
+                       for enemy in world]
+
+    state.effect_turn = 0
+    world, effects = populate()
+    for entity_effects, name, expires in effects:
+        entity_effects.append([name, 0, expires])
+    start = time.perf_counter()
+    for turn in range(turns):
+        for enemy in world:
+            if enemy["effects"]:
+                enemy["effects"][:] = [effect for effect in enemy["effects"] if effect[2] > turn]
+    scan = (time.perf_counter() - start) / turns
+
+    state.effect_turn = 0
+    scheduler = EffectScheduler()
+    world, effects = populate()
+    with use_console(EventRecorder()):
+        for entity_effects, name, duration in effects:
+            scheduler.apply(entity_effects, name, "Goblin", duration=duration)
+        start = time.perf_counter()
+        for _ in range(turns):
+            scheduler.end_turn()
+        heap = (time.perf_counter() - start) / turns
+    state.reset()
+
+    print(f"Scan every enemy:  {scan * 1000:.3f} ms/turn")
+    print(f"Expiry heap:       {heap * 1000:.3f} ms/turn ({scan / heap:.0f}x)")
+
+BENCHMARKS = {
+    "chunk_generation": bench_chunk_generation,
+    "room_memory": bench_room_memory,
+    "save_streaming": bench_save_streaming,
+    "save_migration": bench_save_migration,
+    "save_codecs": bench_save_codecs,
+    "shared_saves": bench_shared_saves,
+    "instant_resume": bench_instant_resume,
+    "state_snapshot": bench_state_snapshot,
+    "frame_render": bench_frame_render,
+    "combat_matrix": bench_combat_matrix,
+    "status_effects": bench_status_effects
+}
+
+def run_benchmarks(names=None):
+    for name in names or BENCHMARKS:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name}")
+            print(f"Available benchmarks: {', '.join(BENCHMARKS)}")
+            continue
+        BENCHMARKS[name]()
+
+if __name__ == "__main__":
+    run_benchmarks(sys.argv[1:])
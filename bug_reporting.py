@@ -125,18 +125,17 @@ def manual_bug_report(error, context="Unknown", game_state=None):
 def capture_game_state():
     """Capture current game state for bug reports"""
     try:
-        # Import main game variables (this might fail if called from wrong context)
-        import main
+        from game_state import state
         game_state = {
-            "player_position": f"Floor {getattr(main, 'player_floor', 'Unknown')}, ({getattr(main, 'player_x', 'Unknown')}, {getattr(main, 'player_y', 'Unknown')})",
+            "player_position": f"Floor {state.player_floor}, ({state.player_x}, {state.player_y})",
             "player_stats": {
-                "hp": getattr(main, 'player_hp', 'Unknown'),
-                "max_hp": getattr(main, 'player_max_hp', 'Unknown'),
-                "stamina": getattr(main, 'player_stamina', 'Unknown'),
-                "mana": getattr(main, 'player_mana', 'Unknown')
+                "hp": state.player_hp,
+                "max_hp": state.player_max_hp,
+                "stamina": state.player_stamina,
+                "mana": state.player_mana
             },
-            "inventory_count": len(getattr(main, 'inventory', [])),
-            "armor_count": len(getattr(main, 'armor_inventory', [])),
+            "inventory_count": len(state.inventory),
+            "armor_count": len(state.armor_inventory),
             "current_command": "Unknown"
         }
         return game_state
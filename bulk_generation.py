@@ -0,0 +1,157 @@
+"""
+Vectorized bulk room generation for world building and simulation.
+
+create_room makes up to a dozen separate random draws per room while walking
+down the room type cascade. generate_chunk draws each of those rolls for a
+whole chunk at once as NumPy arrays, including the armor and regular enemy
+stats, and only calls the scalar generators for the rarer nested content
+(weapons, spider swarms, chests, shops) of the rooms that need it. The probabilities
+are the same as the scalar path, but the random stream is different, so a bulk
+chunk is not a copy of the rooms get_room would produce for the same seed.
+
+NumPy is optional - the rest of the game does not need it.
+"""
+
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import world_generation
+from constants import CHUNK_SIZE, COMPACT_ROOMS, room_descriptions, enemy_stats
+from models import compact_room
+
+ENEMY_NAMES = list(enemy_stats.keys())
+
+# Room kinds, in the order create_room checks them
+ROOM_NORMAL = 0
+ROOM_STAIRWELL = 1
+ROOM_KEY_DOOR = 2
+ROOM_CHEST = 3
+ROOM_SHOP = 4
+
+def numpy_available():
+    return np is not None
+
+def roll_room_kinds(rng, count):
+    """Roll the stairwell/key door/chest/shop cascade for `count` rooms"""
+    stairwell = rng.integers(1, 26, count) == 1  # 1 in 25
+    key_door = rng.integers(1, 26, count) == 1   # 1 in 25
+    chest = rng.integers(1, 16, count) == 1      # 1 in 15
+    shop = rng.random(count) < 0.1               # 10%
+    # np.select takes the first matching condition, just like the if-cascade
+    return np.select(
+        [stairwell, key_door, chest, shop],
+        [ROOM_STAIRWELL, ROOM_KEY_DOOR, ROOM_CHEST, ROOM_SHOP],
+        default=ROOM_NORMAL
+    )
+
+def roll_armors(rng, count, scaled):
+    """Armor for `count` rooms, all rolls drawn as arrays"""
+    base_defense = rng.integers(2, 5, count).tolist()
+    base_durability = rng.integers(8, 16, count).tolist()
+    is_broken = (rng.random(count) < 0.04).tolist()
+    durability_roll = rng.integers(0, 2, count).tolist()
+    max_durability_roll = rng.integers(0, 2, count).tolist()
+    max_durability_extra = rng.integers(2, 7, count).tolist()
+    names = rng.integers(0, len(world_generation.armor_names), count).tolist()
+    defense_roll = rng.integers(0, 2, count).tolist()
+    return [
+        world_generation.build_armor(scaled[i], base_defense[i], base_durability[i], is_broken[i],
+                                     durability_roll[i], max_durability_roll[i], max_durability_extra[i],
+                                     world_generation.armor_names[names[i]], defense_roll[i])
+        for i in range(count)
+    ]
+
+def roll_enemies(rng, count, scaled):
+    """Regular (non-swarm) enemies for `count` rooms, all rolls drawn as arrays"""
+    names = rng.integers(0, len(ENEMY_NAMES), count).tolist()
+    variation = rng.integers(-3, 4, count).tolist()
+    hp_roll = rng.integers(1, 3, count).tolist()
+    return [
+        world_generation.build_enemy(scaled[i], ENEMY_NAMES[names[i]], variation[i], hp_roll[i])
+        for i in range(count)
+    ]
+
+def chunk_rng(seed, floor, cx, cy, size):
+    """NumPy generator for one chunk, derived from the world seed like room streams are"""
+    return np.random.default_rng(world_generation.room_seed(f"chunk{size}:{seed}", floor, cx, cy))
+
+def generate_chunk(floor, cx, cy, size=CHUNK_SIZE, seed=None, learned_spells=()):
+    """Generate every room of chunk (cx, cy) on a floor.
+
+    Returns {(x, y): room} for the size x size rooms starting at
+    (cx * size, cy * size). The crystal roll of the scalar path is skipped
+    because it never changes the room it belongs to.
+    """
+    if np is None:
+        raise ImportError("generate_chunk needs NumPy - install it with 'pip install numpy'")
+    if seed is None:
+        seed = world_generation.world_seed
+        if seed is None:
+            seed = world_generation.new_world_seed()
+
+    rng = chunk_rng(seed, floor, cx, cy, size)
+    count = size * size
+    offsets = np.arange(count)
+    xs = (cx * size + offsets % size).tolist()
+    ys = (cy * size + offsets // size).tolist()
+
+    kinds = roll_room_kinds(rng, count)
+    normal = kinds == ROOM_NORMAL
+    has_weapon = normal & (rng.random(count) < 0.3)
+    has_armor = normal & (rng.random(count) < 0.2)
+    has_key = normal & (rng.integers(1, 51, count) == 1)
+    has_enemy = normal & (rng.random(count) < 0.5)
+    is_swarm = rng.random(count) < 0.15
+    descriptions = rng.integers(0, len(room_descriptions), count).tolist()
+    # Same distance scaling as distance_from_start: capped at 100 rooms, // 4
+    scaled = np.minimum(np.abs(cx * size + offsets % size) + np.abs(cy * size + offsets // size), 100) // 4
+    armor_rooms = np.flatnonzero(has_armor)
+    room_armors = dict(zip(armor_rooms.tolist(), roll_armors(rng, len(armor_rooms), scaled[armor_rooms].tolist())))
+    enemy_rooms = np.flatnonzero(has_enemy & ~is_swarm)
+    room_enemies = dict(zip(enemy_rooms.tolist(), roll_enemies(rng, len(enemy_rooms), scaled[enemy_rooms].tolist())))
+
+    # Nested content (items, enemies, shops) comes from one scalar stream per chunk
+    detail_rng = random.Random(int(rng.integers(0, 1 << 62)))
+
+    kinds = kinds.tolist()
+    has_weapon = has_weapon.tolist()
+    has_armor = has_armor.tolist()
+    has_key = has_key.tolist()
+    has_enemy = has_enemy.tolist()
+    is_swarm = is_swarm.tolist()
+
+    rooms = {}
+    for i in range(count):
+        x, y = xs[i], ys[i]
+        if floor == 1 and x == 0 and y == 0:
+            rooms[(x, y)] = world_generation.create_start_room()
+            continue
+
+        kind = kinds[i]
+        if kind == ROOM_STAIRWELL:
+            rooms[(x, y)] = world_generation.create_stairwell_room()
+            continue
+
+        if kind == ROOM_KEY_DOOR:
+            room = world_generation.create_key_door_room(floor, x, y, detail_rng)
+        elif kind == ROOM_CHEST:
+            room = world_generation.create_chest_room(x, y, detail_rng)
+        elif kind == ROOM_SHOP:
+            room = world_generation.create_shop_room(x, y, learned_spells, detail_rng)
+        else:
+            weapons = [world_generation.create_weapon(x, y, detail_rng)] if has_weapon[i] else []
+            armors = [room_armors[i]] if has_armor[i] else []
+            key = world_generation.create_mysterious_key(floor) if has_key[i] else None
+            enemy = None
+            if has_enemy[i]:
+                enemy = world_generation.create_spider_swarm(x, y, detail_rng) if is_swarm[i] else room_enemies[i]
+            room = world_generation.create_normal_room(room_descriptions[descriptions[i]], enemy, weapons, armors, key)
+        rooms[(x, y)] = room
+    if COMPACT_ROOMS:
+        # The same room type generate_room hands out
+        return {key: compact_room(room) for key, room in rooms.items()}
+    return rooms
@@ -0,0 +1,294 @@
+"""
+Chunked world storage for the Adventure Game.
+
+Rooms are grouped into fixed-size square chunks per floor. A limited number of
+recently used ("hot") chunks stay in memory; the least recently used chunk is
+spilled to a per-save chunk file when the limit is exceeded and paged back in
+the next time one of its rooms is touched.
+
+ChunkedWorlds and ChunkedFloor behave like the plain {floor: {(x, y): room}}
+dictionaries, so get_room, the command handlers and main.py work unchanged.
+"""
+
+import glob
+import os
+import shelve
+import threading
+from collections import OrderedDict
+
+from constants import CHUNK_SIZE, MAX_HOT_CHUNKS
+
+def chunk_coords(x, y, chunk_size=CHUNK_SIZE):
+    """Chunk that contains room (x, y) - floor division keeps negative rooms in the right chunk"""
+    return x // chunk_size, y // chunk_size
+
+class ChunkStore:
+    """In-memory LRU of hot chunks backed by an on-disk chunk file"""
+
+    def __init__(self, path, chunk_size=CHUNK_SIZE, max_hot_chunks=MAX_HOT_CHUNKS):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.max_hot_chunks = max_hot_chunks
+        self._hot = OrderedDict()  # (floor, cx, cy) -> {(x, y): room}
+        self._cold_keys = set()    # chunks currently living only in the chunk file
+        self._cold = None          # shelve, opened on the first spill
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _cold_file(self):
+        if self._cold is None:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            # The JSON save is the source of truth, so every session starts with an empty chunk file
+            self._cold = shelve.open(self.path, flag="n")
+        return self._cold
+
+    @staticmethod
+    def _cold_name(key):
+        return "%d:%d:%d" % key
+
+    def get_chunk(self, floor, cx, cy, create=False):
+        """Return a chunk's room dict, paging it in from disk if needed"""
+        key = (floor, cx, cy)
+        chunk = self._hot.get(key)
+        if chunk is not None:
+            self.hits += 1
+            self._hot.move_to_end(key)
+            return chunk
+
+        if key in self._cold_keys:
+            chunk = self._cold_file().pop(self._cold_name(key))
+            self._cold_keys.discard(key)
+        elif create:
+            chunk = {}
+        else:
+            return None
+
+        self.misses += 1
+        self._hot[key] = chunk
+        self._evict()
+        return chunk
+
+    def _evict(self):
+        while len(self._hot) > self.max_hot_chunks:
+            key, chunk = self._hot.popitem(last=False)
+            self._cold_file()[self._cold_name(key)] = chunk
+            self._cold_keys.add(key)
+            self.evictions += 1
+
+    def has_chunk(self, floor, cx, cy):
+        key = (floor, cx, cy)
+        return key in self._hot or key in self._cold_keys
+
+    def floor_chunks(self, floor):
+        """Every chunk of a floor; cold chunks are read from disk without disturbing the LRU"""
+        for key, chunk in list(self._hot.items()):
+            if key[0] == floor:
+                yield chunk
+        for key in sorted(self._cold_keys):
+            if key[0] == floor and key in self._cold_keys:
+                name = self._cold_name(key)
+                chunk = self._cold_file()[name]
+                yield chunk
+                # Write back so rooms changed during iteration are not lost
+                self._cold_file()[name] = chunk
+
+    def get_stats(self):
+        """Counters for chunk hits, misses and evictions"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hot_chunks": len(self._hot),
+            "cold_chunks": len(self._cold_keys)
+        }
+
+    def close(self):
+        """Close and remove the chunk file - it only ever holds spilled copies"""
+        if self._cold is not None:
+            self._cold.close()
+            self._cold = None
+            for file_path in glob.glob(self.path + "*"):
+                try:
+                    os.remove(file_path)
+                except OSError:
+                    pass
+        self._cold_keys.clear()
+
+class ChunkedFloor:
+    """Dict-style view of one floor stored in a ChunkStore"""
+
+    def __init__(self, store, floor):
+        self.store = store
+        self.floor = floor
+
+    def _chunk(self, pos, create=False):
+        cx, cy = chunk_coords(pos[0], pos[1], self.store.chunk_size)
+        return self.store.get_chunk(self.floor, cx, cy, create)
+
+    def __contains__(self, pos):
+        cx, cy = chunk_coords(pos[0], pos[1], self.store.chunk_size)
+        if not self.store.has_chunk(self.floor, cx, cy):
+            return False
+        return pos in self._chunk(pos)
+
+    def __getitem__(self, pos):
+        chunk = self._chunk(pos)
+        if chunk is None or pos not in chunk:
+            raise KeyError(pos)
+        return chunk[pos]
+
+    def __setitem__(self, pos, room):
+        self._chunk(pos, create=True)[pos] = room
+
+    def get(self, pos, default=None):
+        return self[pos] if pos in self else default
+
+    def items(self):
+        for chunk in self.store.floor_chunks(self.floor):
+            yield from chunk.items()
+
+    def keys(self):
+        for pos, _ in self.items():
+            yield pos
+
+    def values(self):
+        for _, room in self.items():
+            yield room
+
+    def __iter__(self):
+        return self.keys()
+
+    def __len__(self):
+        return sum(len(chunk) for chunk in self.store.floor_chunks(self.floor))
+
+class FloorLoader:
+    """Builds floors on a background thread, in the order given; wait(floor) blocks until that floor is built"""
+
+    def __init__(self, build, floors):
+        self.floors = list(floors)
+        self._build = build
+        self._results = {}
+        self._errors = {}
+        self._ready = {floor: threading.Event() for floor in self.floors}
+        self._thread = threading.Thread(target=self._run, name="floor-loader", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        for floor in self.floors:
+            try:
+                self._results[floor] = self._build(floor)
+            except Exception as e:
+                self._errors[floor] = e
+            finally:
+                self._ready[floor].set()
+
+    def wait(self, floor):
+        """The built floor, once it is ready"""
+        self._ready[floor].wait()
+        if floor in self._errors:
+            raise self._errors.pop(floor)
+        return self._results.pop(floor)
+
+    def done(self):
+        return not self._thread.is_alive()
+
+class ChunkedWorlds:
+    """Dict-style {floor: floor_rooms} container backed by a ChunkStore.
+
+    Plain dict floors are converted into ChunkedFloors when assigned. Seeded
+    floors keep only changed rooms, and those go into a ChunkedFloor too.
+    Database floors read rooms on demand, so they are stored as they are.
+
+    Floors can also be deferred to a FloorLoader: they count as present, and
+    the first lookup of one waits for just that floor.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._floors = {}
+        self._pending = {}  # floor -> FloorLoader still building it
+
+    @classmethod
+    def from_worlds(cls, path, worlds):
+        """Move an existing {floor: {(x, y): room}} world into a new chunk store"""
+        chunked = cls(ChunkStore(path))
+        for floor, world in worlds.items():
+            chunked[floor] = world
+        return chunked
+
+    def defer(self, loader):
+        """Take the floors a FloorLoader is building as they arrive"""
+        for floor in loader.floors:
+            self._pending[floor] = loader
+
+    def _arrive(self, floor):
+        loader = self._pending.pop(floor, None)
+        if loader is not None:
+            self[floor] = loader.wait(floor)
+
+    def _arrive_all(self):
+        for floor in list(self._pending):
+            self._arrive(floor)
+
+    def pending_floors(self):
+        """Floors that are still being loaded"""
+        return list(self._pending)
+
+    def __contains__(self, floor):
+        return floor in self._floors or floor in self._pending
+
+    def __getitem__(self, floor):
+        self._arrive(floor)
+        return self._floors[floor]
+
+    def __setitem__(self, floor, world):
+        from world_generation import SeededFloor
+        from save_database import RoomTable
+        self._pending.pop(floor, None)
+        if isinstance(world, SeededFloor) and isinstance(world.modified, dict):
+            world.modified = self._chunked(floor, world.modified)
+        if isinstance(world, (SeededFloor, ChunkedFloor, RoomTable)):
+            self._floors[floor] = world
+            return
+        self._floors[floor] = self._chunked(floor, world)
+
+    def _chunked(self, floor, rooms):
+        chunked_floor = ChunkedFloor(self.store, floor)
+        for pos, room in rooms.items():
+            chunked_floor[pos] = room
+        return chunked_floor
+
+    def get(self, floor, default=None):
+        self._arrive(floor)
+        return self._floors.get(floor, default)
+
+    def __iter__(self):
+        return iter(list(self._floors) + list(self._pending))
+
+    def __len__(self):
+        return len(self._floors) + len(self._pending)
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        self._arrive_all()
+        return self._floors.values()
+
+    def items(self):
+        self._arrive_all()
+        return self._floors.items()
+
+    def get_stats(self):
+        return self.store.get_stats()
+
+    def close(self):
+        self.store.close()
+
+def close_worlds(worlds):
+    """Release a world's chunk file if it has one"""
+    if isinstance(worlds, ChunkedWorlds):
+        worlds.close()
@@ -0,0 +1,174 @@
+"""
+Exact fight odds for the odds command.
+
+The only random thing in a fight is whether each attack crits - enemy hits,
+armor, durability, mana, Rat extra turns and status effect ticks all follow
+from the state. So instead of simulating, the odds are worked out by dynamic
+programming over the fight state (enemy HP, its remaining effect turns,
+player HP, weapon, durability, armor durability, mana, and the turns fought
+while enemies further back still have effects running): each state's
+outcome is the crit-weighted mix of the two states one attack can lead to,
+down to a win, a death or a stall (the weapon in hand can't attack).
+
+Attacks follow handle_attack, one `attack` per turn at the first enemy left:
+the weapon in hand until it breaks, then the next one, then fists; a
+defeated target doesn't strike back; effects tick on every enemy after the
+hit and can finish it; a target with an effect that skips its turn (Stunned)
+doesn't attack. Effects on the player are not covered.
+
+States are memoized per fight context - the weapons' stats, the enemies' and
+the armor's defense - so after one attack the next `odds` in the same fight
+is a lookup of a state the previous one already solved.
+"""
+
+from functools import lru_cache
+
+from status_effects import EFFECTS, scheduler as effect_scheduler
+
+FIST_DAMAGE = 3
+FIST_CRIT_CHANCE = 0.05
+FIST_CRIT_MULTIPLIER = 2.0
+
+class FightOdds:
+    """Outcome of fighting on to the end; hp_lost and turns are expected values"""
+
+    __slots__ = ("win", "death", "stalled", "hp_lost", "turns", "weapon_breaks")
+
+    def __init__(self, win, death, stalled, hp_lost, turns, weapon_breaks):
+        self.win = win
+        self.death = death
+        self.stalled = stalled              # Ends with a weapon that can't attack (broken, out of mana)
+        self.hp_lost = hp_lost
+        self.turns = turns                  # Attacks made
+        self.weapon_breaks = weapon_breaks  # Chance the weapon in hand breaks during the fight
+
+    def __repr__(self):
+        return (f"FightOdds(win={self.win:.4f}, death={self.death:.4f}, stalled={self.stalled:.4f}, "
+                f"hp_lost={self.hp_lost:.2f}, turns={self.turns:.2f}, weapon_breaks={self.weapon_breaks:.4f})")
+
+def weapon_profile(weapon):
+    """(damage, crit chance, crit multiplier, mana cost) of an attack with weapon, or None if it can't attack"""
+    if weapon.get("is_broken") or weapon.get("name") == "Spell Book":
+        return None
+    crit_chance = weapon.get("crit_chance", 0.05)
+    crit_multiplier = weapon.get("crit_damage", 2.0)
+    if weapon["name"] == "Dagger":
+        crit_chance += 0.15
+        crit_multiplier = max(crit_multiplier, 2.6)
+    elif weapon["name"] == "Axe":
+        crit_multiplier = max(crit_multiplier, 2.8)
+    mana_cost = weapon.get("mana_cost", 10) if weapon.get("requires_mana") else 0
+    return (weapon["damage"], crit_chance, crit_multiplier, mana_cost)
+
+def _effects(enemy):
+    """(damage effects [(damage, turns left)], turns left stunned) of enemy"""
+    damaging, stun = [], 0
+    for name, damage, turns in effect_scheduler.remaining(enemy.get("effects") or ()):
+        if damage:
+            damaging.append((damage, turns))
+        kind = EFFECTS.get(name)
+        if kind and kind.skips_turn:
+            stun = max(stun, turns)
+    return damaging, stun
+
+def enemy_profile(enemy):
+    """(attack, armor pierce, attacks per turn, damage per turn of each effect) of enemy"""
+    return (enemy["base_attack"], enemy.get("armor_pierce", 0), enemy.get("extra_turns", 1),
+            tuple(damage for damage, _ in _effects(enemy)[0]))
+
+def enemy_start(enemy):
+    """(hp, turns left of each damage effect, turns left stunned) of enemy"""
+    damaging, stun = _effects(enemy)
+    return (enemy["hp"], tuple(turns for _, turns in damaging), stun)
+
+def _after(profile, start, elapsed):
+    """enemy_start of a queued enemy after elapsed turns of its effects ticking"""
+    hp, dots, stun = start
+    hp -= sum(damage * min(turns, elapsed) for damage, turns in zip(profile[3], dots))
+    return (hp, tuple(max(0, turns - elapsed) for turns in dots), max(0, stun - elapsed))
+
+@lru_cache(maxsize=64)
+def _solver(weapons, spare_durability, enemies, queued, defense):
+    """Memoized outcome of every fight state in one context.
+
+    weapons: profiles of the weapons in the order they will be used;
+    spare_durability: durability of weapons[1:]; enemies: profiles of the
+    enemies in the order they will be fought; queued: enemy_start of
+    enemies[1:]; defense: of the equipped armor.
+
+    Queued enemies' effects tick while they wait, so states carry the turns
+    fought so far, up to the longest of those effects (usually none).
+    """
+    WIN, STALL = (1.0, 0.0, 0.0), (0.0, 0.0, 1.0)
+    horizon = max((max(dots + (stun,)) for _, dots, stun in queued), default=0)
+
+    @lru_cache(maxsize=None)
+    def outcome(k, enemy_hp, dots, stun, hp, wi, durability, armor_durability, mana, elapsed):
+        """(win, death, stall, final hp, turns, first weapon breaks) from the start of an attack"""
+        if wi < len(weapons):
+            profile = weapons[wi]
+            if profile is None or mana < profile[3]:
+                return STALL + (hp, 0.0, 0.0)
+            damage, crit_chance, crit_multiplier, cost = profile
+            mana -= cost
+            durability -= 1
+            breaks = durability <= 0
+            if breaks:
+                wi += 1
+                durability = spare_durability[wi - 1] if wi < len(weapons) else 0
+            breaks = breaks and wi == 1
+        else:
+            damage, crit_chance, crit_multiplier, breaks = FIST_DAMAGE, FIST_CRIT_CHANCE, FIST_CRIT_MULTIPLIER, False
+
+        total = [0.0] * 6
+        for chance, dealt in ((crit_chance, int(damage * crit_multiplier)), (1 - crit_chance, damage)):
+            if chance <= 0:
+                continue
+            result = after_hit(k, enemy_hp - dealt, dots, stun, hp, wi, durability, armor_durability, mana,
+                               min(elapsed + 1, horizon))
+            for i in range(5):
+                total[i] += chance * result[i]
+            total[5] += chance * (1.0 if breaks else result[5])
+        total[4] += 1  # This attack
+        return tuple(total)
+
+    def after_hit(k, enemy_hp, dots, stun, hp, wi, durability, armor_durability, mana, elapsed):
+        """The rest of the turn: effect ticks, then the target's counterattack"""
+        attack, pierce, attacks, dot_damage = enemies[k]
+        if enemy_hp > 0 and dots:
+            enemy_hp -= sum(damage for damage, turns in zip(dot_damage, dots) if turns)
+            dots = tuple(max(0, turns - 1) for turns in dots)
+        if enemy_hp <= 0:
+            # On to the next enemy its effects haven't already finished
+            for j in range(k + 1, len(enemies)):
+                start = _after(enemies[j], queued[j - 1], elapsed) if horizon else queued[j - 1]
+                if start[0] > 0:
+                    return outcome(j, *start, hp, wi, durability, armor_durability, mana, elapsed)
+            return WIN + (hp, 0.0, 0.0)
+
+        if stun:
+            stun -= 1
+        else:
+            for _ in range(attacks):
+                if armor_durability > 0:
+                    hp -= max(1, attack - max(0, defense // 2 - pierce))
+                    armor_durability -= 1
+                else:
+                    hp -= attack
+                if hp <= 0:
+                    return (0.0, 1.0, 0.0, 0, 0.0, 0.0)
+        return outcome(k, enemy_hp, dots, stun, hp, wi, durability, armor_durability, mana, elapsed)
+
+    return outcome
+
+def fight_odds(enemies, inventory, using_fists, armor, player_hp, player_mana):
+    """FightOdds of attacking enemies (a list, fought in order) until the fight ends"""
+    weapons = () if using_fists else tuple(weapon_profile(weapon) for weapon in inventory)
+    spare_durability = () if using_fists else tuple(weapon["durability"] for weapon in inventory[1:])
+    outcome = _solver(weapons, spare_durability, tuple(enemy_profile(enemy) for enemy in enemies),
+                      tuple(enemy_start(enemy) for enemy in enemies[1:]), armor["defense"] if armor else 0)
+    durability = inventory[0]["durability"] if weapons else 0
+    armor_durability = armor["durability"] if armor else 0
+    win, death, stalled, final_hp, turns, breaks = outcome(0, *enemy_start(enemies[0]), player_hp, 0, durability,
+                                                          armor_durability, player_mana, 0)
+    return FightOdds(win, death, stalled, player_hp - final_hp, turns, breaks)
@@ -0,0 +1,175 @@
+"""
+Command dispatch.
+
+Every command the game understands is registered once in a CommandRegistry
+instead of being tested in turn by a chain of string comparisons:
+
+  - exact commands ("attack", "quit") are found with one dict lookup
+  - commands that take arguments ("guide combat", "waypoint add camp") are
+    looked up by their first word
+  - a prefix trie over the command names resolves unambiguous abbreviations
+    of at least MIN_ABBREVIATION letters ("att" -> "attack", but not a stray
+    "no" -> "north") and prefix commands ("dev_" for any developer command)
+    in one walk over the typed word
+
+so a turn costs the same however many commands and mods are installed. Mod
+commands from mod_loader.mod_data['commands'] are merged in whenever the mod
+loader's generation changes, i.e. after mods are loaded or reloaded. The same
+trie answers tab completion.
+"""
+
+# Shortest abbreviation that runs a command
+MIN_ABBREVIATION = 3
+
+class Command:
+    """A registered command: handler(current_room, command) returns True to end the game loop"""
+
+    __slots__ = ("name", "handler", "takes_args", "description", "source")
+
+    def __init__(self, name, handler, takes_args=False, description="", source=None):
+        self.name = name
+        self.handler = handler
+        self.takes_args = takes_args
+        self.description = description
+        self.source = source  # Mod name for mod commands
+
+class _TrieNode:
+    __slots__ = ("children", "command", "prefix", "only")
+
+    def __init__(self):
+        self.children = {}
+        self.command = None  # Command whose name ends here
+        self.prefix = None   # Command for every word that starts here
+        self.only = None     # The one command below this node, if there is exactly one
+
+class CommandRegistry:
+    """Exact-name dict plus a prefix trie over the command names"""
+
+    def __init__(self):
+        self.exact = {}
+        self.prefixes = {}
+        self.mod_generation = None
+        self._trie = None
+
+    def register(self, name, handler, takes_args=False, description="", source=None, aliases=()):
+        command = Command(name, handler, takes_args, description, source)
+        for key in (name, *aliases):
+            self.exact[key] = command
+        self._trie = None
+        return command
+
+    def register_prefix(self, prefix, handler, description=""):
+        """handler takes every command that starts with prefix and is not registered itself"""
+        self.prefixes[prefix] = Command(prefix, handler, True, description)
+        self._trie = None
+
+    def unregister(self, name):
+        self.exact.pop(name, None)
+        self._trie = None
+
+    def _build_trie(self):
+        root = _TrieNode()
+        for key, command in self.exact.items():
+            path = [root]
+            for char in key:
+                path.append(path[-1].children.setdefault(char, _TrieNode()))
+            path[-1].command = command
+            for node in path:
+                # A node reached by several commands (aliases count once) is ambiguous
+                if node.only is None:
+                    node.only = command
+                elif node.only is not command:
+                    node.only = False
+        for prefix, command in self.prefixes.items():
+            node = root
+            for char in prefix:
+                node = node.children.setdefault(char, _TrieNode())
+            node.prefix = command
+        self._trie = root
+        return root
+
+    def resolve(self, command):
+        """(handler, command with its name spelled out), or (None, command) if nothing matches"""
+        found = self.exact.get(command)
+        if found is not None:
+            return found.handler, command
+        word, space, rest = command.partition(" ")
+        found = self.exact.get(word)
+        if found is not None:
+            return (found.handler, command) if found.takes_args else (None, command)
+
+        node = self._trie or self._build_trie()
+        prefix = None
+        for char in word:
+            node = node.children.get(char)
+            if node is None:
+                break
+            if node.prefix is not None:
+                prefix = node.prefix
+        else:
+            if node.only and len(word) >= MIN_ABBREVIATION and (node.only.takes_args or not rest):
+                return node.only.handler, node.only.name + space + rest
+        if prefix is not None:
+            return prefix.handler, command
+        return None, command
+
+    def complete(self, text):
+        """Command names that start with text, sorted"""
+        node = self._trie or self._build_trie()
+        for char in text:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        names = []
+        stack = [(text, node)]
+        while stack:
+            name, node = stack.pop()
+            if node.command is not None:
+                names.append(name)
+            stack.extend((name + char, child) for char, child in node.children.items())
+        return sorted(names)
+
+    def sync_mod_commands(self, mod_loader):
+        """Merge in the commands of the loaded mods if they changed since the last call"""
+        generation = getattr(mod_loader, "generation", None)
+        if generation == self.mod_generation:
+            return
+        self.mod_generation = generation
+        for name in [name for name, command in self.exact.items() if command.source is not None]:
+            self.unregister(name)
+
+        mod_data = getattr(mod_loader, "mod_data", {})
+        for key, data in mod_data.get("commands", {}).items():
+            mod_name, _, name = key.partition(".")
+            name = data.get("name", name)
+            function = data.get("function")
+            if isinstance(function, str):
+                function = getattr(mod_loader.loaded_mods.get(mod_name), function, None)
+            if not callable(function) or name in self.exact:
+                # Built-in commands can't be replaced by a mod
+                continue
+            self.register(name, _mod_command_handler(function), takes_args=True,
+                          description=data.get("description", ""), source=mod_name)
+
+def _mod_command_handler(function):
+    """Mod command functions take the list of arguments after the command name"""
+    def handler(current_room, command):
+        function(command.split()[1:])
+    return handler
+
+def enable_tab_completion(registry):
+    """Complete command names with Tab where readline is available"""
+    try:
+        import readline
+    except ImportError:
+        return False
+
+    def complete(text, index):
+        if " " in readline.get_line_buffer().lstrip():
+            return None
+        matches = registry.complete(text)
+        return matches[index] if index < len(matches) else None
+
+    readline.set_completer(complete)
+    readline.parse_and_bind("tab: complete")
+    return True
@@ -3,6 +3,17 @@ SAVE_FILE = "savegame.json"
 MAX_WEAPONS = 3
 MAX_ARMOR = 2
 MAX_PLAYER_HP = 250
+WORLD_SEED_MODE = True  # New games generate rooms from a world seed and only store changed rooms
+CHUNK_STORE_ENABLED = True  # Keep worlds in chunks, spilling least recently used chunks to disk
+CHUNK_SIZE = 16  # Rooms per chunk side
+MAX_HOT_CHUNKS = 64  # Chunks kept in memory before spilling to the chunk file
+PREFETCH_RADIUS = 2  # Rooms within this many steps are generated in the background (0 disables)
+SAVE_BACKEND = "objects"  # "objects" (manifest + shared chunks), "sqlite" (rooms loaded on demand, changed rooms upserted), "binary" (.sav) or "json"
+BINARY_SAVE_COMPRESSION = "zlib"  # "zlib" (fast) or "lzma" (smaller) for binary saves
+INSTANT_RESUME = True  # Loading a manifest save reads the player's floor first and the other floors in the background
+ASYNC_AUTO_SAVE = True  # Write auto-saves on a background thread instead of blocking the input loop
+JOURNAL_COMPACT_EVERY = 50  # Auto-save journal entries before they are folded into a full save
+COMPACT_ROOMS = True  # Store rooms, enemies and items as __slots__ records instead of dicts
 
 room_descriptions = [
     "A dark cave with dripping water.",
@@ -42,6 +53,7 @@ spells = {
         "damage": 6,
         "mana_cost": 12,
         "effect": "Poisoned",
+        "effect_noun": "poison",
         "effect_damage": 2,
         "effect_duration": 4,
         "cooldown": 2,
@@ -0,0 +1,104 @@
+"""
+Cached status sections for the frame shown before every command.
+
+show_room() builds the whole frame (player status, then the room) as a list
+of lines and writes it with a single say(), so a turn costs one terminal
+write instead of one per line - which matters on slow terminals and over
+SSH. The status sections rarely change from one turn to the next, so each is
+kept in a SectionCache and only re-formatted when the values it shows differ
+from last time.
+"""
+
+class SectionCache:
+    """Lines of one status section, rebuilt only when its inputs change"""
+
+    __slots__ = ("build", "inputs", "lines", "builds")
+
+    def __init__(self, build):
+        self.build = build
+        self.inputs = None
+        self.lines = ()
+        self.builds = 0
+
+    def render(self, inputs):
+        if inputs != self.inputs:
+            self.lines = self.build(*inputs)
+            self.inputs = inputs
+            self.builds += 1
+        return self.lines
+
+def _stats_lines(level, hp, max_hp, stamina, max_stamina, mana, max_mana, money):
+    return (f"Lv.{level} | Hp: {hp}/{max_hp} | Stm: {stamina}/{max_stamina} | Mp: {mana}/{max_mana} | Gold: {money}",)
+
+def _xp_lines(level, xp, xp_to_next):
+    if level < 100:
+        progress = (xp / xp_to_next) * 100 if xp_to_next > 0 else 0
+        return (f"XP: {xp}/{xp_to_next} ({progress:.1f}%)",)
+    return (f"🏆 Level: {level} (MAXIMUM LEVEL!)",)
+
+def _potion_lines(potions, stamina_potions, mana_potions, waypoint_scrolls):
+    return (f"Potions: Hp({potions}) Stm({stamina_potions}) Mp({mana_potions}) | Scrolls: {waypoint_scrolls}",)
+
+def _key_lines(key_floors, golden_keys):
+    lines = []
+    if key_floors:
+        lines.append(f"Mysterious Keys: {', '.join(f'Floor {floor}' for floor in key_floors)}")
+    if golden_keys > 0:
+        lines.append(f"Golden Keys: {golden_keys}")
+    return tuple(lines)
+
+def _armor_lines(armor):
+    if armor:
+        name, defense, durability = armor
+        return (f"Armor: {name} (Def: {defense}, Dur: {durability})",)
+    return ("Armor: None",)
+
+def _weapon_lines(weapons):
+    if not weapons:
+        return ("Weapons: Empty (using fists)",)
+    return (f"Weapons: {', '.join(f'{name}({durability})' for name, durability, is_weapon in weapons if is_weapon)}",)
+
+def _spell_lines(scrolls, learned):
+    lines = []
+    if scrolls:
+        lines.append(f"Spell Scrolls: {', '.join(f'{name} ({count})' for name, count in scrolls)}")
+    if learned:
+        lines.append(f"Learned Spells: {', '.join(f'{i + 1}.{name}' for i, name in enumerate(learned))}")
+    return tuple(lines)
+
+class StatusPanel:
+    """The PLAYER STATUS part of the frame, one SectionCache per section"""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.stats = SectionCache(_stats_lines)
+        self.xp = SectionCache(_xp_lines)
+        self.potions = SectionCache(_potion_lines)
+        self.keys = SectionCache(_key_lines)
+        self.armor = SectionCache(_armor_lines)
+        self.weapons = SectionCache(_weapon_lines)
+        self.spells = SectionCache(_spell_lines)
+
+    def render(self, lines, inventory, player_hp, player_max_hp, player_stamina, player_max_stamina, player_mana,
+               player_max_mana, player_money, player_potions, stamina_potions, mana_potions, waypoint_scrolls,
+               mysterious_keys, golden_keys, equipped_armor, spell_scrolls, learned_spells,
+               player_level, player_xp, player_xp_to_next):
+        """Append the status lines to lines"""
+        lines.append("\n--- PLAYER STATUS ---")
+        lines.extend(self.stats.render((player_level, player_hp, player_max_hp, player_stamina, player_max_stamina,
+                                        player_mana, player_max_mana, player_money)))
+        lines.extend(self.xp.render((player_level, player_xp, player_xp_to_next)))
+        lines.extend(self.potions.render((player_potions, stamina_potions, mana_potions, waypoint_scrolls)))
+        lines.extend(self.keys.render((tuple(mysterious_keys), golden_keys)))
+        armor = ((equipped_armor["name"], equipped_armor["defense"], equipped_armor["durability"])
+                 if equipped_armor else None)
+        lines.extend(self.armor.render((armor,)))
+        lines.extend(self.weapons.render((tuple((w["name"], w.get("durability", "-"), "damage" in w)
+                                                for w in inventory),)))
+        lines.extend(self.spells.render((tuple(spell_scrolls.items()), tuple(learned_spells))))
+        return lines
+
+# The panel of the terminal game
+status_panel = StatusPanel()
@@ -0,0 +1,93 @@
+"""
+Game output and prompts.
+
+Game code says things with say() and asks with ask() instead of calling
+print() and input() itself. Both go to the current console: the terminal
+by default, or an EventRecorder while GameEngine.step() runs headless, which
+turns every message and prompt into an Event and answers prompts from a list
+of choices.
+"""
+
+from contextlib import contextmanager
+
+class Event:
+    """Something the game told the player.
+
+    kind is "message" (text), "prompt" (text is the prompt, answer what it got),
+    "unknown_command", "needs_input" (a prompt no choice was left for) or "game_over".
+    """
+
+    __slots__ = ("kind", "text", "answer")
+
+    def __init__(self, kind, text="", answer=None):
+        self.kind = kind
+        self.text = text
+        self.answer = answer
+
+    def __repr__(self):
+        if self.kind == "prompt":
+            return f"Event({self.kind!r}, {self.text!r}, answer={self.answer!r})"
+        return f"Event({self.kind!r}, {self.text!r})"
+
+    def __eq__(self, other):
+        return (isinstance(other, Event) and self.kind == other.kind and self.text == other.text
+                and self.answer == other.answer)
+
+class ChoicesExhausted(EOFError):
+    """A prompt came up after every choice passed to step() was used"""
+
+    def __init__(self, prompt):
+        super().__init__(f"No choice left for prompt: {prompt!r}")
+        self.prompt = prompt
+
+class Console:
+    """The terminal"""
+
+    def say(self, *args, **kwargs):
+        print(*args, **kwargs)
+
+    def ask(self, prompt=""):
+        return input(prompt)
+
+class EventRecorder:
+    """Records what the game says as events and answers prompts from choices"""
+
+    def __init__(self, choices=()):
+        self.events = []
+        self.choices = list(choices)
+        self.next_choice = 0
+
+    def say(self, *args, sep=" ", end="\n", **kwargs):
+        text = sep.join(map(str, args)) + end
+        self.events.append(Event("message", text[:-1] if text.endswith("\n") else text))
+
+    def ask(self, prompt=""):
+        if self.next_choice >= len(self.choices):
+            raise ChoicesExhausted(prompt)
+        answer = str(self.choices[self.next_choice])
+        self.next_choice += 1
+        self.events.append(Event("prompt", prompt, answer))
+        return answer
+
+_console = Console()
+
+def say(*args, **kwargs):
+    """print() through the current console"""
+    _console.say(*args, **kwargs)
+
+def ask(prompt=""):
+    """input() through the current console"""
+    return _console.ask(prompt)
+
+def get_console():
+    return _console
+
+@contextmanager
+def use_console(console):
+    """Send say() and ask() to console for the duration of the block"""
+    global _console
+    previous, _console = _console, console
+    try:
+        yield console
+    finally:
+        _console = previous
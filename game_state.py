@@ -1,49 +1,203 @@
-# --- Game State ---
-worlds = {}  # Dictionary of floors: {floor: world}
-player_floor = 1
-player_x = 0
-player_y = 0
-inventory = []
-armor_inventory = []
-equipped_armor = None
-player_hp = 50
-player_max_hp = 50
-player_stamina = 20
-player_max_stamina = 20
-player_mana = 20
-player_max_mana = 20
-player_money = 0
-player_potions = 0
-stamina_potions = 0
-mana_potions = 0
-waypoint_scrolls = 1  # Can hold up to 3 waypoint scrolls
-mysterious_keys = {}  # Dictionary of floor-specific mysterious keys: {floor: True}
-golden_keys = 0  # Can hold up to 3 golden keys
-unlocked_floors = set()  # Set of floors that can be accessed with mysterious keys
-waypoints = {}  # Dictionary to store waypoints: {name: (floor, x, y)}
-discovered_enemies = set()  # Track which enemies have been defeated
-learned_spells = []  # List of learned spells in order
-spell_scrolls = {}  # Dictionary of spell scrolls: {spell_name: count}
-using_fists = False  # Track if player is using fists instead of weapons
-
-# --- Leveling System ---
-player_level = 1
-player_xp = 0
-player_xp_to_next = 100
+"""
+The player's game state.
+
+Everything the game loop used to keep in module globals lives in one
+GameState object, `state`, shared by main.py, the save code, bug reports
+and the developer mod.
+
+GameState tracks what changed since its last snapshot, the same way rooms are
+tracked: assigning a field marks it dirty, and a container field (inventory,
+waypoints, ...) is marked dirty whenever it is handed out, since the caller
+may change it in place. snapshot() re-encodes only the dirty fields; every
+other field shares its JSON text and frozen value with the previous snapshot,
+so a save no longer rebuilds the whole player dict.
+"""
+
+import json
+
+# Fields written to saves, in save order, with their new-game values
+SAVED_FIELDS = {
+    "inventory": [],
+    "armor_inventory": [],
+    "equipped_armor": None,
+    "player_floor": 1,
+    "player_x": 0,
+    "player_y": 0,
+    "player_hp": 50,
+    "player_max_hp": 50,
+    "player_stamina": 20,
+    "player_max_stamina": 20,
+    "player_mana": 20,
+    "player_max_mana": 20,
+    "player_money": 0,
+    "player_potions": 0,
+    "stamina_potions": 0,
+    "mana_potions": 0,
+    "mysterious_keys": {},    # {floor: True}
+    "golden_keys": 0,         # Can hold up to 3 golden keys
+    "unlocked_floors": set(), # Floors that can be accessed with mysterious keys
+    "waypoints": {},          # {name: (floor, x, y)}
+    "waypoint_scrolls": 1,    # Can hold up to 3 waypoint scrolls
+    "discovered_enemies": set(),
+    "learned_spells": [],     # In the order they were learned
+    "spell_scrolls": {},      # {spell_name: count}
+    "using_fists": False,
+    "status_effects": [],     # [[name, damage, last turn], ...] - see status_effects.py
+    "effect_turn": 0,         # The status effect clock
+    "player_level": 1,
+    "player_xp": 0,
+    "player_xp_to_next": 100,
+    "player_skill_points": 0,
+    "enemies_defeated": 0,
+    "bosses_defeated": 0,
+    "total_damage_dealt": 0,
+    "total_damage_taken": 0,
+    "critical_hits": 0,
+    "attack_count": 0,
+    "rooms_explored": 0,
+    "floors_visited": set(),
+    "move_count": 0,
+    "items_collected": 0,
+    "weapons_broken": 0,
+    "gold_earned": 0,
+}
+
+# State that is not saved as a player field (rooms are saved on their own)
+RUNTIME_FIELDS = {
+    "worlds": {},  # {floor: world}
+    "armor_broken": 0,
+    "discovered_uniques": {},
+}
+
+# Fields that are handed out as containers and may be changed in place
+CONTAINER_FIELDS = frozenset(field for field, default in SAVED_FIELDS.items()
+                             if default is None or isinstance(default, (list, dict, set)))
+SET_FIELDS = frozenset(field for field, default in SAVED_FIELDS.items() if isinstance(default, set))
+
 max_level = 100
-player_skill_points = 0  # Skill points earned from leveling up
-
-# --- Statistics Tracking ---
-enemies_defeated = 0
-bosses_defeated = 0
-total_damage_dealt = 0
-total_damage_taken = 0
-critical_hits = 0
-attack_count = 0
-rooms_explored = 0
-floors_visited = set()
-move_count = 0
-items_collected = 0
-weapons_broken = 0
-armor_broken = 0
-gold_earned = 0 
\ No newline at end of file
+
+def _encode(value):
+    from models import to_plain
+    if isinstance(value, set):
+        # Sorted, so the same set always encodes the same (str hashes differ between runs)
+        value = sorted(value, key=repr)
+    return json.dumps(value, sort_keys=True, default=to_plain)
+
+def _as_set(value):
+    """Sets come back from saves as lists; floors_visited used to be a count"""
+    if isinstance(value, int):
+        return {value} if value > 0 else set()
+    return set(value or ())
+
+class StateSnapshot(dict):
+    """Frozen save fields: {field: value}, plus .encoded {field: JSON text}"""
+
+    def __init__(self, values, encoded):
+        super().__init__(values)
+        self.encoded = encoded
+
+class _Field:
+    """Descriptor over a GameState slot that keeps the dirty set up to date"""
+
+    __slots__ = ("name", "slot", "container")
+
+    def __init__(self, name, slot, container):
+        self.name = name
+        self.slot = slot
+        self.container = container
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        if self.container:
+            obj._dirty.add(self.name)
+        return self.slot.__get__(obj, objtype)
+
+    def __set__(self, obj, value):
+        if self.name in SET_FIELDS and not isinstance(value, set):
+            value = _as_set(value)
+        self.slot.__set__(obj, value)
+        obj._dirty.add(self.name)
+
+class GameState:
+    """The player's state and world, with dirty tracking for cheap save snapshots"""
+
+    __slots__ = tuple("_" + field for field in SAVED_FIELDS) + tuple(RUNTIME_FIELDS) + ("_dirty", "_snapshot")
+
+    def __init__(self, **fields):
+        self._dirty = set()
+        self._snapshot = None
+        self.reset()
+        self.update(fields)
+
+    def reset(self):
+        """New-game values for every field"""
+        for field, default in {**SAVED_FIELDS, **RUNTIME_FIELDS}.items():
+            setattr(self, field, default.copy() if hasattr(default, "copy") else default)
+
+    def update(self, fields):
+        """Set the fields in a mapping (e.g. what load_game returns); unknown keys are ignored"""
+        for field, value in fields.items():
+            if field in SAVED_FIELDS or field in RUNTIME_FIELDS:
+                setattr(self, field, value)
+
+    def get(self, field, default=None):
+        return getattr(self, field, default)
+
+    def dirty_fields(self):
+        """Saved fields that may have changed since the last snapshot"""
+        return set(self._dirty)
+
+    def fingerprint(self):
+        """Hex hash of every saved field, to tell whether two games ended in the same state"""
+        import hashlib
+        digest = hashlib.blake2b(digest_size=16)
+        for field in SAVED_FIELDS:
+            digest.update(f"{field}={_encode(_SLOTS[field].__get__(self))}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def snapshot(self, save_name):
+        """The save fields as a StateSnapshot, re-encoding only what is dirty"""
+        import world_generation
+        from save_migrations import SAVE_SCHEMA_VERSION
+        from unique_items import discovered_uniques
+
+        values = {"save_name": save_name, "timestamp": "now", "schema_version": SAVE_SCHEMA_VERSION,
+                  "world_seed": world_generation.world_seed}
+        encoded = {field: _encode(value) for field, value in values.items()}
+        previous = self._snapshot
+        dirty, self._dirty = self._dirty, set()
+        for field in SAVED_FIELDS:
+            if previous is not None and field not in dirty:
+                values[field] = previous[field]
+                encoded[field] = previous.encoded[field]
+                continue
+            value = _SLOTS[field].__get__(self)
+            text = _encode(value)
+            if previous is not None and previous.encoded[field] == text:
+                # Handed out but not changed - keep sharing the previous copy
+                values[field] = previous[field]
+                encoded[field] = previous.encoded[field]
+            else:
+                values[field] = json.loads(text) if field in CONTAINER_FIELDS else value
+                encoded[field] = text
+        encoded["discovered_uniques"] = _encode(discovered_uniques)
+        values["discovered_uniques"] = json.loads(encoded["discovered_uniques"])
+
+        self._snapshot = StateSnapshot(values, encoded)
+        return self._snapshot
+
+_SLOTS = {field: GameState.__dict__["_" + field] for field in SAVED_FIELDS}
+for _field in SAVED_FIELDS:
+    setattr(GameState, _field, _Field(_field, _SLOTS[_field], _field in CONTAINER_FIELDS))
+
+# The game's state
+state = GameState()
+
+__all__ = ["GameState", "StateSnapshot", "state", "max_level", *SAVED_FIELDS, *RUNTIME_FIELDS]
+
+def __getattr__(name):
+    # Older code reads the state as module globals (game_state.player_hp)
+    if name in SAVED_FIELDS or name in RUNTIME_FIELDS:
+        return getattr(state, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,205 @@
+"""
+Compact data model for rooms, enemies, weapons and armor.
+
+The game was written around plain dicts, and a generated room carries about
+ten keys that are mostly None or []. Room, Enemy, Weapon and Armor keep their
+known fields in __slots__ instead of a per-object hash table, and only rare
+keys (mod data, ...) go into a small extra dict that is created on first use.
+
+Every record still behaves like a dict - room["enemy"], enemy.get("hp"),
+"chest" in room, del enemy["swarm_id"], .items() - so handle_attack,
+handle_take, show_room and mods keep working while they migrate to attribute
+access (room.enemy, weapon.damage) one at a time.
+"""
+
+_MISSING = object()
+
+class Record:
+    """Dict-compatible base for the slotted game objects"""
+
+    __slots__ = ("_extra",)
+    FIELDS = ()
+    LIST_FIELDS = ()  # fields holding a list; stored as None until the list is needed
+
+    def __init__(self, data=None, **fields):
+        self._extra = None
+        if data:
+            self.update(data)
+        if fields:
+            self.update(fields)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from a dict, leaving records that are already compact alone"""
+        if data is None or isinstance(data, Record):
+            return data
+        return cls(data)
+
+    # --- dict access layer ---
+
+    def __getitem__(self, key):
+        if key in self._field_set:
+            value = getattr(self, key, _MISSING)
+            if value is _MISSING:
+                raise KeyError(key)
+            if value is None and key in self.LIST_FIELDS:
+                value = []
+                setattr(self, key, value)
+            return value
+        if self._extra is None or key not in self._extra:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        if key in self._field_set:
+            if key in self.LIST_FIELDS and value == []:
+                value = None
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self._field_set:
+            if getattr(self, key, _MISSING) is _MISSING:
+                raise KeyError(key)
+            delattr(self, key)
+        else:
+            if self._extra is None or key not in self._extra:
+                raise KeyError(key)
+            del self._extra[key]
+            if not self._extra:
+                self._extra = None
+
+    def __contains__(self, key):
+        if key in self._field_set:
+            return getattr(self, key, _MISSING) is not _MISSING
+        return self._extra is not None and key in self._extra
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def pop(self, key, default=_MISSING):
+        try:
+            value = self[key]
+        except KeyError:
+            if default is _MISSING:
+                raise
+            return default
+        del self[key]
+        return value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, data=(), **fields):
+        items = data.items() if hasattr(data, "items") else data
+        for key, value in items:
+            self[key] = value
+        for key, value in fields.items():
+            self[key] = value
+
+    def keys(self):
+        keys = [field for field in self.FIELDS if getattr(self, field, _MISSING) is not _MISSING]
+        if self._extra:
+            keys.extend(self._extra)
+        return keys
+
+    def values(self):
+        return [self._peek(key) for key in self.keys()]
+
+    def items(self):
+        # Unused list fields are reported as fresh [] without being stored on the record
+        return [(key, self._peek(key)) for key in self.keys()]
+
+    def _peek(self, key):
+        if key in self._field_set:
+            value = getattr(self, key)
+            return [] if value is None and key in self.LIST_FIELDS else value
+        return self._extra[key]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def copy(self):
+        return type(self)(self.to_dict())
+
+    def to_dict(self):
+        """Shallow plain-dict copy"""
+        return dict(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            other = other.to_dict()
+        if not isinstance(other, dict):
+            return NotImplemented
+        return self.to_dict() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __reduce__(self):
+        # Pickle (chunk file, deepcopy) through the dict form
+        return (type(self), (self.to_dict(),))
+
+class Enemy(Record):
+    """Regular enemy, boss or training dummy; status effects are in its effects list (see status_effects.py)"""
+
+    FIELDS = ("name", "hp", "base_attack", "armor_pierce", "is_boss", "extra_turns",
+              "swarm_id", "is_training_dummy", "effects")
+    LIST_FIELDS = ("effects",)
+    __slots__ = FIELDS
+
+class Weapon(Record):
+    FIELDS = ("name", "damage", "durability", "max_durability", "is_broken", "crit_chance",
+              "crit_damage", "requires_mana", "mana_cost")
+    __slots__ = FIELDS
+
+class Armor(Record):
+    FIELDS = ("name", "defense", "durability", "max_durability")
+    __slots__ = FIELDS
+
+class Room(Record):
+    """One room; enemies, weapons and armor are converted to their compact types"""
+
+    FIELDS = ("description", "type", "enemy", "weapons", "armors", "shop", "chest",
+              "crystal_type", "mysterious_key", "life_crystal", "key_required",
+              "treasure_room", "requires_mysterious_key", "treasure_looted")
+    LIST_FIELDS = ("weapons", "armors")
+    __slots__ = FIELDS
+
+    def __setitem__(self, key, value):
+        if key == "enemy":
+            if isinstance(value, list):
+                value = [Enemy.from_dict(enemy) for enemy in value]  # spider swarm
+            else:
+                value = Enemy.from_dict(value)
+        elif key == "weapons" and value:
+            value = [Weapon.from_dict(weapon) for weapon in value]
+        elif key == "armors" and value:
+            value = [Armor.from_dict(armor) for armor in value]
+        super().__setitem__(key, value)
+
+for _cls in (Record, Enemy, Weapon, Armor, Room):
+    _cls._field_set = frozenset(_cls.FIELDS)
+
+def compact_room(room):
+    """Room record for a room dict (rooms that are already compact are returned as they are)"""
+    return Room.from_dict(room)
+
+def to_plain(obj):
+    """json.dump default= hook: records are written as plain dicts"""
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -89,10 +89,10 @@ def handle_dev_teleport(args):
         y = int(args[2])
         
         # Import and modify game state
-        import game_state
-        game_state.player_floor = floor
-        game_state.player_x = x
-        game_state.player_y = y
+        from game_state import state
+        state.player_floor = floor
+        state.player_x = x
+        state.player_y = y
         
         print(f"[DEV] Teleported to Floor {floor} at ({x}, {y})")
         print("Developer teleportation successful!")
@@ -119,7 +119,7 @@ def handle_dev_stats(args):
         value = int(args[1])
         
         # Import game state
-        import game_state
+        from game_state import state
         
         # Map stat names to game state variables
         stat_mapping = {
@@ -137,10 +137,10 @@ def handle_dev_stats(args):
             return False
         
         # Get old value
-        old_value = getattr(game_state, stat_mapping[stat])
+        old_value = getattr(state, stat_mapping[stat])
         
         # Set new value
-        setattr(game_state, stat_mapping[stat], value)
+        setattr(state, stat_mapping[stat], value)
         
         print(f"[DEV] Changed {stat} from {old_value} to {value}")
         print("Developer stat modification successful!")
@@ -171,12 +171,12 @@ def handle_dev_weapon(args):
             return False
         
         # Import game state
-        import game_state
+        from game_state import state
         from constants import MAX_WEAPONS
         
         # Check if inventory is full
-        if len(game_state.inventory) >= MAX_WEAPONS:
-            print(f"Cannot create weapon: inventory is full ({len(game_state.inventory)}/{MAX_WEAPONS})")
+        if len(state.inventory) >= MAX_WEAPONS:
+            print(f"Cannot create weapon: inventory is full ({len(state.inventory)}/{MAX_WEAPONS})")
             print("Drop a weapon first using 'drop' command")
             return False
         
@@ -188,8 +188,8 @@ def handle_dev_weapon(args):
         }
         
         # Add to inventory
-        game_state.inventory.append(custom_weapon)
-        game_state.using_fists = False  # Switch to using weapons
+        state.inventory.append(custom_weapon)
+        state.using_fists = False  # Switch to using weapons
         
         print(f"[DEV] Created weapon: {name}")
         print(f"  Damage: {damage}")
@@ -222,11 +222,11 @@ def handle_dev_spawn(args):
         return False
     
     # Import game state
-    import game_state
+    from game_state import state
     from world_generation import get_room
     
     # Get current room
-    current_room = get_room(game_state.player_floor, game_state.player_x, game_state.player_y, game_state.worlds, game_state.learned_spells)
+    current_room = get_room(state.player_floor, state.player_x, state.player_y, state.worlds, state.learned_spells)
     
     if spawn_type == "enemy":
         # Create a custom enemy
@@ -283,7 +283,7 @@ def handle_dev_info(args):
         return False
     
     # Import game state to show current info
-    import game_state
+    from game_state import state
     
     print("\n=== DEVELOPER INFO ===")
     print(f"Developer Mode: {'ENABLED' if is_developer_mode_enabled() else 'DISABLED'}")
@@ -291,11 +291,11 @@ def handle_dev_info(args):
     print(f"Author: {author}")
     
     print("\n=== CURRENT GAME STATE ===")
-    print(f"Player Position: Floor {game_state.player_floor} at ({game_state.player_x}, {game_state.player_y})")
-    print(f"Player Stats: HP {game_state.player_hp}/{game_state.player_max_hp}, Stamina {game_state.player_stamina}/{game_state.player_max_stamina}, Mana {game_state.player_mana}/{game_state.player_max_mana}")
-    print(f"Money: {game_state.player_money}")
-    print(f"Weapons: {len(game_state.inventory)} items")
-    print(f"Armor: {len(game_state.armor_inventory)} pieces")
+    print(f"Player Position: Floor {state.player_floor} at ({state.player_x}, {state.player_y})")
+    print(f"Player Stats: HP {state.player_hp}/{state.player_max_hp}, Stamina {state.player_stamina}/{state.player_max_stamina}, Mana {state.player_mana}/{state.player_max_mana}")
+    print(f"Money: {state.player_money}")
+    print(f"Weapons: {len(state.inventory)} items")
+    print(f"Armor: {len(state.armor_inventory)} pieces")
     
     print("\nAvailable Commands:")
     print("  dev_teleport <floor> <x> <y> - Teleport to location")
@@ -38,6 +38,8 @@ class ModLoader:
             'guides': {},
             'events': {}  # New event system
         }
+        # Bumped whenever mod content changes, so the game knows to pick up mod commands again
+        self.generation = 0
         
         # Get the absolute path to THIS mod loader file
         self.this_file_path = os.path.abspath(__file__)
@@ -137,6 +139,7 @@ class ModLoader:
                 keys_to_remove = [k for k in self.mod_data[data_type] if k.startswith(f"{mod_name}.")]
                 for key in keys_to_remove:
                     del self.mod_data[data_type][key]
+            self.generation += 1
             # Reload the mod
             self.load_mod(mod_name)
             print(f"Mod {mod_name} reloaded successfully!")
@@ -255,10 +258,12 @@ class ModLoader:
             for armor_id, armor_data in mod_module.armors.items():
                 self.mod_data['armors'][f"{mod_name}.{armor_id}"] = armor_data
         
-        # Load spells
+        # Load spells (and the status effects they inflict)
         if hasattr(mod_module, 'spells'):
             for spell_id, spell_data in mod_module.spells.items():
                 self.mod_data['spells'][f"{mod_name}.{spell_id}"] = spell_data
+            from status_effects import register_spell_effects
+            register_spell_effects(mod_module.spells)
         
         # Load commands
         if hasattr(mod_module, 'commands'):
@@ -294,6 +299,8 @@ class ModLoader:
         
         # Auto-load mod configuration files
         self.load_mod_config_files(mod_name)
+        
+        self.generation += 1
     
     def load_mod_guide_files(self, mod_name: str):
         """Automatically load guide files from mod directory for easy guide creation"""
@@ -820,11 +827,14 @@ def register_armor(armor_id: str, armor_data: Dict[str, Any]):
 
 def register_spell(spell_id: str, spell_data: Dict[str, Any]):
     """Register a spell (for use in mods)"""
+    from status_effects import register_spell_effects
     mod_loader.mod_data['spells'][spell_id] = spell_data
+    register_spell_effects({spell_id: spell_data})
 
 def register_command(cmd_name: str, cmd_data: Dict[str, Any]):
     """Register a command (for use in mods)"""
     mod_loader.mod_data['commands'][cmd_name] = cmd_data
+    mod_loader.generation += 1
 
 def register_room_type(room_type: str, room_data: Dict[str, Any]):
     """Register a room type (for use in mods)"""
@@ -0,0 +1,181 @@
+"""
+Content-addressed world chunks shared by every save slot.
+
+With the "objects" save backend a save slot is a small manifest
+(<name>.manifest): the player fields plus, for every floor, the chunks of
+rooms it contains and the hash of each chunk's contents. The chunks
+themselves live once in saves/objects/, named by that hash. Slots that share
+most of a world (auto_save, a manual save made a minute later, a backup slot)
+share the objects for every chunk they have in common, so disk use grows
+with the differences between slots rather than with the number of slots.
+
+ChunkIndex remembers the hash of every chunk of the world being played and
+which chunks have been touched since, so a save only re-encodes the chunks
+the player actually changed. Objects no manifest refers to any more are
+removed by collect_garbage() when a slot is deleted.
+"""
+
+import hashlib
+import io
+import os
+import threading
+
+from chunk_store import chunk_coords
+
+class ObjectStore:
+    """Files named by the hash of their contents; each distinct content is stored once"""
+
+    def __init__(self, root):
+        self.root = root
+
+    @staticmethod
+    def digest(data):
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def path(self, digest):
+        return os.path.join(self.root, digest[:2], digest[2:])
+
+    def put(self, data):
+        """Store data unless an identical object exists; returns its digest"""
+        digest = self.digest(data)
+        path = self.path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        return digest
+
+    def get(self, digest):
+        with open(self.path(digest), "rb") as f:
+            return f.read()
+
+    def digests(self):
+        """Digests of every stored object"""
+        found = set()
+        if not os.path.isdir(self.root):
+            return found
+        for prefix in os.listdir(self.root):
+            directory = os.path.join(self.root, prefix)
+            if os.path.isdir(directory):
+                found.update(prefix + name for name in os.listdir(directory) if not name.endswith(".tmp"))
+        return found
+
+    def collect_garbage(self, live):
+        """Remove every object whose digest is not in live; returns how many were removed"""
+        removed = 0
+        for digest in self.digests() - set(live):
+            try:
+                os.remove(self.path(digest))
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+def encode_chunk(rooms):
+    """Binary object for {(x, y): saved room fields}, in position order so an unchanged chunk hashes the same"""
+    from save_binary import write_binary_save
+    f = io.BytesIO()
+    write_binary_save(f, [], (((0, x, y), rooms[(x, y)]) for x, y in sorted(rooms)))
+    return f.getvalue()
+
+def decode_chunk(data):
+    """{(x, y): room fields} of a chunk object"""
+    from save_binary import read_binary_save
+    _, worlds = read_binary_save(io.BytesIO(data))
+    return worlds.get(0, {})
+
+class ChunkIndex:
+    """Chunk hashes of the world being played, and the chunks touched since they were hashed"""
+
+    def __init__(self):
+        self.worlds = None
+        self.chunks = {}   # (floor, cx, cy) -> (digest, room count)
+        self.dirty = set() # (floor, cx, cy) touched since its digest was taken
+        self._lock = threading.Lock()
+
+    def touched(self, floor, x, y):
+        """world_generation touch listener"""
+        with self._lock:
+            self.dirty.add((floor,) + chunk_coords(x, y))
+
+    def adopt(self, worlds, chunks, dirty=()):
+        """Start from the chunks of a world that was just loaded from a manifest"""
+        with self._lock:
+            self.worlds = worlds
+            self.chunks = dict(chunks)
+            self.dirty = set(dirty)
+
+    def forget(self):
+        """A save failed or chunks were collected - the next save encodes every chunk again"""
+        with self._lock:
+            self.worlds = None
+            self.chunks = {}
+            self.dirty = set()
+
+    def plan(self, worlds):
+        """(clean chunks, rooms to encode) for a full save of worlds.
+
+        clean chunks is {(floor, cx, cy): (digest, room count)} for chunks that
+        can be reused as they are; rooms to encode is {(floor, x, y): room}
+        for every saved room of the other chunks.
+        """
+        import world_generation
+        with self._lock:
+            if worlds is not self.worlds:
+                self.worlds = worlds
+                self.chunks = {}
+                self.dirty = set()
+                known = False
+            else:
+                known = True
+            dirty, self.dirty = self.dirty, set()
+            clean = {key: value for key, value in self.chunks.items() if key not in dirty}
+
+        rooms = {}
+        if known:
+            from constants import CHUNK_SIZE
+            for floor, cx, cy in dirty:
+                world = worlds.get(floor)
+                if world is None:
+                    continue
+                for x in range(cx * CHUNK_SIZE, (cx + 1) * CHUNK_SIZE):
+                    for y in range(cy * CHUNK_SIZE, (cy + 1) * CHUNK_SIZE):
+                        if (x, y) in world and world_generation.room_needs_saving(world, (x, y)):
+                            rooms[(floor, x, y)] = world[(x, y)]
+        else:
+            for floor, world in worlds.items():
+                for (x, y), room in world_generation.iter_saved_rooms(world):
+                    rooms[(floor, x, y)] = room
+        return clean, rooms
+
+    def record(self, worlds, chunks):
+        """Remember the chunks a save of worlds just wrote"""
+        with self._lock:
+            if worlds is self.worlds:
+                self.chunks = dict(chunks)
+
+_chunk_index = None
+
+def get_chunk_index():
+    """The shared ChunkIndex, registered with world_generation on first use"""
+    global _chunk_index
+    if _chunk_index is None:
+        import world_generation
+        _chunk_index = ChunkIndex()
+        world_generation.touch_listeners.append(_chunk_index.touched)
+    return _chunk_index
+
+def write_chunks(store, clean, rooms):
+    """Store the chunks of rooms ((floor, x, y), saved fields) next to the clean ones.
+
+    Returns {(floor, cx, cy): (digest, room count)} for the whole world.
+    """
+    grouped = {}
+    for (floor, x, y), room_data in rooms:
+        grouped.setdefault((floor,) + chunk_coords(x, y), {})[(x, y)] = room_data
+    chunks = dict(clean)
+    for key, chunk_rooms in grouped.items():
+        chunks[key] = (store.put(encode_chunk(chunk_rooms)), len(chunk_rooms))
+    return chunks
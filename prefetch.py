@@ -0,0 +1,122 @@
+"""
+Background prefetching of rooms around the player.
+
+After the player moves, the rooms within PREFETCH_RADIUS steps are generated
+on a worker thread into a staging area. When the player enters one of them,
+the main loop promotes the staged room into the world instead of generating
+it on the spot.
+
+Prefetching only runs in seeded worlds: every room there comes from its own
+(seed, floor, x, y) random stream, so generating rooms early or in a different
+order gives exactly the rooms the player would have seen anyway.
+"""
+
+import queue
+import threading
+
+import world_generation
+from constants import PREFETCH_RADIUS
+
+class RoomPrefetcher:
+    """Generates nearby rooms ahead of time on a worker thread"""
+
+    def __init__(self, radius=PREFETCH_RADIUS):
+        self.radius = radius
+        self._staged = {}  # (seed, floor, x, y) -> (room, fingerprint)
+        self._lock = threading.Lock()
+        self._requests = queue.Queue()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._thread = None
+        self._last_position = None
+        self.promoted = 0
+
+    def schedule(self, floor, x, y, worlds):
+        """Queue generation of the rooms around (x, y) that are not known yet"""
+        seed = world_generation.world_seed
+        if seed is None or self.radius <= 0:
+            return
+        if self._last_position == (seed, floor, x, y):
+            return
+        self._last_position = (seed, floor, x, y)
+
+        world = worlds[floor] if floor in worlds else None
+        positions = []
+        for dx in range(-self.radius, self.radius + 1):
+            reach = self.radius - abs(dx)
+            for dy in range(-reach, reach + 1):
+                pos = (x + dx, y + dy)
+                if (dx or dy) and not (world is not None and pos in world):
+                    positions.append(pos)
+
+        with self._lock:
+            # Forget staged rooms the player has moved away from
+            for key in list(self._staged):
+                staged_seed, staged_floor, sx, sy = key
+                if (staged_seed, staged_floor) != (seed, floor) or abs(sx - x) + abs(sy - y) > self.radius:
+                    del self._staged[key]
+            self._idle.clear()
+            self._requests.put((seed, floor, positions))
+
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="room-prefetch", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            job = self._requests.get()
+            # Only the newest position matters - skip requests that piled up
+            while job is not None and not self._requests.empty():
+                job = self._requests.get()
+            if job is None:
+                return
+
+            seed, floor, positions = job
+            for x, y in positions:
+                key = (seed, floor, x, y)
+                with self._lock:
+                    if key in self._staged:
+                        continue
+                room = world_generation.generate_seeded_room(seed, floor, x, y)
+                fingerprint = world_generation.room_fingerprint(room)
+                with self._lock:
+                    self._staged[key] = (room, fingerprint)
+                if not self._requests.empty():
+                    break
+
+            with self._lock:
+                if self._requests.empty():
+                    self._idle.set()
+
+    def promote(self, floor, x, y, worlds):
+        """Move a staged room into the world when the player arrives; returns True if one was used"""
+        seed = world_generation.world_seed
+        with self._lock:
+            entry = self._staged.pop((seed, floor, x, y), None)
+        if entry is None:
+            return False
+
+        if floor not in worlds:
+            worlds[floor] = world_generation.SeededFloor(seed, floor)
+        world = worlds[floor]
+        if not isinstance(world, world_generation.SeededFloor) or world.seed != seed or (x, y) in world:
+            return False
+
+        room, fingerprint = entry
+        world.add_pristine((x, y), room, fingerprint)
+        self.promoted += 1
+        return True
+
+    def wait(self, timeout=None):
+        """Block until the worker has finished all queued generation"""
+        return self._idle.wait(timeout)
+
+    def stop(self):
+        """Stop the worker thread"""
+        if self._thread is not None:
+            self._requests.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+        with self._lock:
+            self._staged.clear()
+        self._idle.set()
@@ -0,0 +1,44 @@
+"""
+Random number streams for the game's subsystems.
+
+Room generation already draws from a private stream per room (see
+world_generation.room_rng). Everything that happens while playing - crits,
+money drops, where a fleeing player ends up, repair rolls - draws from its
+own stream here instead of the global random module:
+
+    from rng_streams import streams
+    if streams.combat.random() < crit_chance: ...
+
+Each stream is derived from the game seed and its name, so a game started
+from the same seed and given the same commands plays out the same way, and
+an extra draw in one subsystem (or a mod calling random) can't shift the
+rolls of another.
+"""
+
+import hashlib
+import random
+
+# Subsystems with their own stream
+STREAM_NAMES = ("combat", "loot", "movement", "items")
+
+def stream_seed(seed, name):
+    """Seed of one named stream under the game seed"""
+    key = f"{seed}:{name}".encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "big")
+
+class RandomStreams:
+    """One random.Random per subsystem, all derived from one seed"""
+
+    __slots__ = ("seed",) + STREAM_NAMES
+
+    def __init__(self, seed=None):
+        self.reseed(seed)
+
+    def reseed(self, seed=None):
+        """Restart every stream from seed (None seeds them from the OS)"""
+        self.seed = seed
+        for name in STREAM_NAMES:
+            setattr(self, name, random.Random(stream_seed(seed, name) if seed is not None else None))
+
+# The game's streams
+streams = RandomStreams()
@@ -0,0 +1,296 @@
+"""
+Compact binary save format (.sav).
+
+JSON saves spell out every key of every room and repeat the same
+descriptions, enemy names and weapon names thousands of times. A binary save
+instead stores:
+
+  - a string table: each distinct string once, referenced by index
+  - rooms as fixed-layout records: a bitmask of the fields that differ from
+    their defaults (None, or [] for weapons/armors), then just those values
+  - enemies, weapons and armor as records of their known fields (see
+    models.py), with any other keys kept in a small extra dict
+
+The whole payload is compressed with zlib or lzma. Player fields are small
+and irregular, so they are kept as one JSON object inside the payload.
+
+File layout: MAGIC, format version (1 byte), compression id (1 byte), then the
+compressed payload:
+  varint length + player fields JSON
+  varint string count, then varint length + UTF-8 bytes per string
+  varint floor count, then per floor: zigzag floor, varint room count, rooms
+"""
+
+import json
+import lzma
+import struct
+import zlib
+
+from models import Enemy, Weapon, Armor
+
+MAGIC = b"ADVSAVE"
+FORMAT_VERSION = 1
+COMPRESSIONS = {"zlib": 1, "lzma": 2}
+
+# Room fields in save order; a room stores only those that differ from ROOM_DEFAULTS
+ROOM_FIELDS = ("description", "type", "enemy", "weapons", "armors", "shop", "chest", "crystal_type",
+               "key_required", "requires_mysterious_key", "treasure_looted", "mysterious_key")
+ROOM_DEFAULTS = {field: None for field in ROOM_FIELDS}
+ROOM_DEFAULTS.update(weapons=[], armors=[])
+
+# Which record layout a value is stored with, by the key it is found under
+RECORD_FIELDS = {"enemy": Enemy.FIELDS, "weapon": Weapon.FIELDS, "armor": Armor.FIELDS}
+KEY_RECORDS = {"enemy": "enemy", "weapons": "weapon", "armors": "armor", "items": "weapon", "armor": "armor"}
+
+# Value tags
+T_NONE, T_FALSE, T_TRUE, T_INT, T_FLOAT, T_STR, T_LIST, T_DICT, T_RECORD = range(9)
+
+_double = struct.Struct("<d")
+
+class SaveFormatError(ValueError):
+    """A .sav file that is damaged or not a save"""
+
+# --- Writing ---
+
+class BinarySaveWriter:
+    """Encodes rooms into records that share one string table, then writes the save"""
+
+    def __init__(self):
+        self.strings = {}
+
+    def _string(self, out, text):
+        index = self.strings.get(text)
+        if index is None:
+            index = self.strings[text] = len(self.strings)
+        _varint(out, index)
+
+    def _value(self, out, value, record=None):
+        if value is None:
+            out.append(T_NONE)
+        elif value is True:
+            out.append(T_TRUE)
+        elif value is False:
+            out.append(T_FALSE)
+        elif isinstance(value, int):
+            out.append(T_INT)
+            _varint(out, (value << 1) if value >= 0 else ((-value << 1) - 1))
+        elif isinstance(value, float):
+            out.append(T_FLOAT)
+            out += _double.pack(value)
+        elif isinstance(value, str):
+            out.append(T_STR)
+            self._string(out, value)
+        elif isinstance(value, (list, tuple)):
+            out.append(T_LIST)
+            _varint(out, len(value))
+            for item in value:
+                self._value(out, item, record)
+        elif hasattr(value, "items"):
+            if record is not None:
+                out.append(T_RECORD)
+                self._record(out, value, RECORD_FIELDS[record])
+            else:
+                out.append(T_DICT)
+                self._dict(out, value.items())
+        else:
+            raise TypeError(f"Object of type {type(value).__name__} can't be saved")
+
+    def _dict(self, out, items):
+        items = list(items)
+        _varint(out, len(items))
+        for key, value in items:
+            self._string(out, str(key))
+            self._value(out, value, KEY_RECORDS.get(key))
+
+    def _record(self, out, record, fields):
+        """Bitmask of the fields present (plus one bit for extra keys), then their values"""
+        mask = 0
+        values = []
+        for bit, field in enumerate(fields):
+            if field in record:
+                mask |= 1 << bit
+                values.append((field, record[field]))
+        extra = [(key, value) for key, value in record.items() if key not in fields]
+        if extra:
+            mask |= 1 << len(fields)
+        _varint(out, mask)
+        for field, value in values:
+            self._value(out, value, KEY_RECORDS.get(field))
+        if extra:
+            self._dict(out, extra)
+
+    def encode_room(self, room):
+        """A room's record: bitmask of the fields that differ from ROOM_DEFAULTS, then their values"""
+        out = bytearray()
+        mask = 0
+        values = []
+        for bit, field in enumerate(ROOM_FIELDS):
+            value = room.get(field)
+            if value is not None and value != ROOM_DEFAULTS[field]:
+                mask |= 1 << bit
+                values.append((field, value))
+        _varint(out, mask)
+        for field, value in values:
+            self._value(out, value, KEY_RECORDS.get(field))
+        return bytes(out)
+
+    def write(self, f, fields, rooms, floors=(), compression="zlib"):
+        """Write a save from (name, JSON text) fields and ((floor, x, y), record) rooms; returns the room count"""
+        by_floor = {floor: bytearray() for floor in floors}
+        counts = dict.fromkeys(floors, 0)
+        for (floor, x, y), record in rooms:
+            out = by_floor.setdefault(floor, bytearray())
+            _varint(out, (x << 1) if x >= 0 else ((-x << 1) - 1))
+            _varint(out, (y << 1) if y >= 0 else ((-y << 1) - 1))
+            out += record
+            counts[floor] = counts.get(floor, 0) + 1
+
+        payload = bytearray()
+        fields_json = ("{" + ", ".join(f"{json.dumps(name)}: {encoded}" for name, encoded in fields) + "}").encode()
+        _varint(payload, len(fields_json))
+        payload += fields_json
+        _varint(payload, len(self.strings))
+        for text in self.strings:
+            encoded = text.encode("utf-8")
+            _varint(payload, len(encoded))
+            payload += encoded
+        _varint(payload, len(by_floor))
+        for floor, records in by_floor.items():
+            _varint(payload, (floor << 1) if floor >= 0 else ((-floor << 1) - 1))
+            _varint(payload, counts[floor])
+            payload += records
+
+        f.write(MAGIC + bytes([FORMAT_VERSION, COMPRESSIONS[compression]]))
+        f.write(_compress(bytes(payload), compression))
+        return sum(counts.values())
+
+def write_binary_save(f, fields, rooms, floors=(), compression="zlib"):
+    """Write a save from (name, JSON text) fields and ((floor, x, y), room dict) rooms; returns the room count"""
+    writer = BinarySaveWriter()
+    return writer.write(f, fields, ((key, writer.encode_room(room)) for key, room in rooms), floors, compression)
+
+def _varint(out, value):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _compress(payload, compression):
+    if compression == "lzma":
+        return lzma.compress(payload, preset=6)
+    return zlib.compress(payload, 6)
+
+# --- Reading ---
+
+class _Reader:
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+        self.strings = []
+
+    def varint(self):
+        data = self.data
+        result = shift = 0
+        while True:
+            byte = data[self.pos]
+            self.pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def signed(self):
+        value = self.varint()
+        return (value >> 1) if not value & 1 else -((value + 1) >> 1)
+
+    def value(self, record=None):
+        tag = self.data[self.pos]
+        self.pos += 1
+        if tag == T_NONE:
+            return None
+        if tag == T_TRUE:
+            return True
+        if tag == T_FALSE:
+            return False
+        if tag == T_INT:
+            return self.signed()
+        if tag == T_FLOAT:
+            (value,) = _double.unpack_from(self.data, self.pos)
+            self.pos += 8
+            return value
+        if tag == T_STR:
+            return self.strings[self.varint()]
+        if tag == T_LIST:
+            return [self.value(record) for _ in range(self.varint())]
+        if tag == T_DICT:
+            return self.dict()
+        if tag == T_RECORD:
+            return self.record(RECORD_FIELDS[record])
+        raise SaveFormatError(f"Unknown value tag {tag}")
+
+    def dict(self):
+        result = {}
+        for _ in range(self.varint()):
+            key = self.strings[self.varint()]
+            result[key] = self.value(KEY_RECORDS.get(key))
+        return result
+
+    def record(self, fields):
+        mask = self.varint()
+        result = {}
+        for bit, field in enumerate(fields):
+            if mask & (1 << bit):
+                result[field] = self.value(KEY_RECORDS.get(field))
+        if mask & (1 << len(fields)):
+            result.update(self.dict())
+        return result
+
+    def room(self):
+        mask = self.varint()
+        room = {}
+        for bit, field in enumerate(ROOM_FIELDS):
+            if mask & (1 << bit):
+                room[field] = self.value(KEY_RECORDS.get(field))
+            else:
+                default = ROOM_DEFAULTS[field]
+                room[field] = [] if default == [] else default
+        return room
+
+def read_binary_save(f):
+    """(fields, {floor: {(x, y): room}}) of a binary save"""
+    header = f.read(len(MAGIC) + 2)
+    if len(header) < len(MAGIC) + 2 or not header.startswith(MAGIC):
+        raise SaveFormatError("Not a binary save")
+    version, compression = header[len(MAGIC)], header[len(MAGIC) + 1]
+    if version > FORMAT_VERSION:
+        raise SaveFormatError(f"Binary save format {version} is newer than this game")
+    try:
+        if compression == COMPRESSIONS["lzma"]:
+            payload = lzma.decompress(f.read())
+        elif compression == COMPRESSIONS["zlib"]:
+            payload = zlib.decompress(f.read())
+        else:
+            raise SaveFormatError(f"Unknown compression {compression}")
+    except (zlib.error, lzma.LZMAError) as e:
+        raise SaveFormatError(f"Damaged binary save: {e}") from e
+
+    reader = _Reader(payload)
+    try:
+        length = reader.varint()
+        fields = json.loads(payload[reader.pos:reader.pos + length])
+        reader.pos += length
+        for _ in range(reader.varint()):
+            length = reader.varint()
+            reader.strings.append(payload[reader.pos:reader.pos + length].decode("utf-8"))
+            reader.pos += length
+        worlds = {}
+        for _ in range(reader.varint()):
+            floor = reader.signed()
+            rooms = worlds[floor] = {}
+            for _ in range(reader.varint()):
+                x = reader.signed()
+                y = reader.signed()
+                rooms[(x, y)] = reader.room()
+    except (IndexError, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise SaveFormatError(f"Damaged binary save: {e}") from e
+    return fields, worlds
@@ -0,0 +1,281 @@
+"""
+SQLite save backend (stdlib sqlite3).
+
+A save is one database file with two tables:
+  player - one row per save field (level, inventory, position, ...) as JSON
+  rooms  - one row per saved room, keyed by (floor, x, y)
+
+Loading reads only the player table. Each floor becomes a RoomTable that reads
+a room's row the first time get_room asks for it, so resuming a save no longer
+depends on how much of the world has been explored. Saves go through the same
+SaveTracker as the JSON journal and upsert only the player fields and rooms
+that changed since the last save.
+"""
+
+import json
+import os
+import sqlite3
+
+from constants import COMPACT_ROOMS
+from models import compact_room
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS player (
+    field TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rooms (
+    floor INTEGER NOT NULL,
+    x INTEGER NOT NULL,
+    y INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (floor, x, y)
+) WITHOUT ROWID;
+"""
+
+def connect(path):
+    """Open a save database, creating the tables if needed"""
+    connection = sqlite3.connect(path)
+    # WAL lets the game read rooms while the background saver is writing
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+def remove_database(path):
+    """Delete a save database and its WAL files"""
+    for file_path in (path, path + "-wal", path + "-shm"):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+def decode_room(data):
+    room = json.loads(data)
+    return compact_room(room) if COMPACT_ROOMS else room
+
+class SaveDatabase:
+    """Read side of a save database, used by the main thread while playing"""
+
+    def __init__(self, path):
+        self.path = path
+        self._connection = None
+
+    def connection(self):
+        if self._connection is None:
+            self._connection = connect(self.path)
+        return self._connection
+
+    def read_player_state(self):
+        """{field: JSON text} of the player table"""
+        return dict(self.connection().execute("SELECT field, value FROM player"))
+
+    def floors(self):
+        return [floor for (floor,) in self.connection().execute("SELECT DISTINCT floor FROM rooms ORDER BY floor")]
+
+    def count_rooms(self):
+        return count_rooms(self.connection())
+
+    def read_room(self, floor, x, y):
+        row = self.connection().execute(
+            "SELECT data FROM rooms WHERE floor = ? AND x = ? AND y = ?", (floor, x, y)
+        ).fetchone()
+        return decode_room(row[0]) if row else None
+
+    def iter_rooms(self, floor):
+        for x, y, data in self.connection().execute("SELECT x, y, data FROM rooms WHERE floor = ?", (floor,)):
+            yield (x, y), decode_room(data)
+
+    def rewrite(self, player_rows, room_rows):
+        """Replace the player table and upsert rooms in one transaction (used by save migrations)"""
+        connection = self.connection()
+        with connection:
+            connection.execute("DELETE FROM player")
+            upsert(connection, player_rows,
+                   ((floor, x, y, encoded) for (floor, x, y), encoded in room_rows))
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+class RoomTable:
+    """One floor of a save database as a dict; a room's row is read the first time it is used"""
+
+    def __init__(self, database, floor):
+        self.database = database
+        self.floor = floor
+        self._rooms = {}       # rooms read or added this session
+        self._missing = set()  # positions known to have no row
+        self._complete = False # every row has been read
+
+    def __contains__(self, pos):
+        if pos in self._rooms:
+            return True
+        if self._complete or pos in self._missing:
+            return False
+        room = self.database.read_room(self.floor, pos[0], pos[1])
+        if room is None:
+            self._missing.add(pos)
+            return False
+        self._rooms[pos] = room
+        return True
+
+    def __getitem__(self, pos):
+        if pos not in self:
+            raise KeyError(pos)
+        return self._rooms[pos]
+
+    def __setitem__(self, pos, room):
+        self._missing.discard(pos)
+        self._rooms[pos] = room
+
+    def get(self, pos, default=None):
+        return self[pos] if pos in self else default
+
+    def _read_all(self):
+        if not self._complete:
+            for pos, room in self.database.iter_rooms(self.floor):
+                self._rooms.setdefault(pos, room)
+            self._missing.clear()
+            self._complete = True
+
+    def items(self):
+        self._read_all()
+        return list(self._rooms.items())
+
+    def keys(self):
+        return [pos for pos, _ in self.items()]
+
+    def values(self):
+        return [room for _, room in self.items()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.items())
+
+    def loaded_count(self):
+        """Rooms read from the database (or added) so far"""
+        return len(self._rooms)
+
+def load_worlds(database, world_seed):
+    """{floor: RoomTable} - or seeded floors whose changed rooms come from RoomTables"""
+    from world_generation import SeededFloor
+    worlds = {}
+    for floor in database.floors():
+        table = RoomTable(database, floor)
+        if world_seed is not None:
+            worlds[floor] = SeededFloor(world_seed, floor)
+            worlds[floor].modified = table
+        else:
+            worlds[floor] = table
+    return worlds
+
+def upsert(connection, player_rows, room_rows):
+    connection.executemany("INSERT OR REPLACE INTO player (field, value) VALUES (?, ?)", player_rows)
+    connection.executemany("INSERT OR REPLACE INTO rooms (floor, x, y, data) VALUES (?, ?, ?, ?)", room_rows)
+
+def count_rooms(connection):
+    return connection.execute("SELECT COUNT(*) FROM rooms").fetchone()[0]
+
+def import_json_data(path, data):
+    """One-shot import of a JSON save's data (already read, journal replayed) into a new database"""
+    temp_path = path + ".import"
+    remove_database(temp_path)
+    connection = connect(temp_path)
+    try:
+        with connection:
+            player_rows = [(field, json.dumps(value, sort_keys=True)) for field, value in data.items()
+                           if field not in ("worlds", "world")]
+            room_rows = []
+            if "world" in data:
+                # Old single-floor format
+                worlds_data = {"0": data["world"]}
+                player_rows.append(("player_floor", json.dumps(data.get("player_floor", 1))))
+            else:
+                worlds_data = data.get("worlds", {})
+            for floor, rooms in worlds_data.items():
+                for key, room in rooms.items():
+                    x, y = map(int, key.split(","))
+                    room_rows.append((int(floor), x, y, json.dumps(room, sort_keys=True)))
+            upsert(connection, player_rows, room_rows)
+    finally:
+        connection.close()
+    remove_database(path)
+    os.replace(temp_path, path)
+    remove_database(temp_path)
+
+class DatabaseEntryJob:
+    """Upsert of the player fields and rooms changed since the last save"""
+
+    def __init__(self, tracker, player_changes, room_changes, metadata):
+        self.tracker = tracker
+        self.player_changes = player_changes  # field -> JSON text
+        self.room_changes = room_changes      # (floor, x, y) -> JSON text
+        self.metadata = metadata
+
+    def merge(self, later):
+        """Fold a later entry for the same save into this one; returns False if it can't be"""
+        if type(later) is not type(self) or later.tracker is not self.tracker:
+            return False
+        self.player_changes.update(later.player_changes)
+        self.room_changes.update(later.room_changes)
+        self.metadata = later.metadata
+        return True
+
+    def run(self):
+        from save_load import get_database_file_path, write_save_metadata
+        path = get_database_file_path(self.tracker.save_name)
+        if not self.player_changes and not self.room_changes:
+            return path
+        connection = connect(path)
+        try:
+            with connection:
+                upsert(connection, self.player_changes.items(),
+                       [(floor, x, y, encoded) for (floor, x, y), encoded in self.room_changes.items()])
+                self.metadata["room_count"] = count_rooms(connection)
+        finally:
+            connection.close()
+        write_save_metadata(self.tracker.save_name, self.metadata)
+        return path
+
+    def failed(self):
+        self.tracker.invalidate()
+
+class DatabaseSnapshotJob:
+    """Full rewrite of a save database from a snapshot, in a single transaction"""
+
+    def __init__(self, tracker, player_state, snapshot, metadata):
+        self.tracker = tracker
+        self.player_state = player_state
+        self.snapshot = snapshot
+        self.metadata = metadata
+
+    def run(self):
+        from save_load import get_database_file_path, remove_save_files, write_save_metadata
+        path = get_database_file_path(self.tracker.save_name)
+        connection = connect(path)
+        try:
+            with connection:
+                connection.execute("DELETE FROM player")
+                connection.execute("DELETE FROM rooms")
+                upsert(connection, self.player_state.items(),
+                       ((floor, x, y, encoded) for (floor, x, y), encoded in self.snapshot.encoded_rooms()))
+                self.metadata["room_count"] = count_rooms(connection)
+        finally:
+            connection.close()
+            self.snapshot.release()
+        # The database replaces any JSON or binary save of the same name
+        remove_save_files(self.tracker.save_name, keep=path)
+        write_save_metadata(self.tracker.save_name, self.metadata)
+        return path
+
+    def supersedes(self, earlier):
+        """A full snapshot already contains everything queued before it for the same save"""
+        return getattr(earlier, "tracker", None) is self.tracker
+
+    def failed(self):
+        self.tracker.invalidate()
+
+    def cancel(self):
+        """Dropped in favour of a newer snapshot"""
+        self.snapshot.release()
@@ -1,6 +1,20 @@
+import copy
 import json
 import os
 import glob
+import threading
+import time
+from constants import (COMPACT_ROOMS, JOURNAL_COMPACT_EVERY, ASYNC_AUTO_SAVE, SAVE_BACKEND, BINARY_SAVE_COMPRESSION,
+                       INSTANT_RESUME)
+from models import compact_room, to_plain
+from save_database import remove_database
+from save_binary import SaveFormatError
+from chunk_store import chunk_coords
+from game_state import GameState
+from game_io import say, ask
+from object_store import ObjectStore, get_chunk_index, write_chunks
+from save_migrations import (SAVE_SCHEMA_VERSION, migrate_save, save_schema_version,
+                             ensure_weapon_max_durability, ensure_armor_max_durability, ensure_room_max_durability)
 
 # Default values for save compatibility
 SAVE_DEFAULTS = {
@@ -49,6 +63,8 @@ SAVE_DEFAULTS = {
     "learned_spells": [],
     "spell_scrolls": {},
     "using_fists": False,
+    "status_effects": [],
+    "effect_turn": 0,
     "discovered_uniques": {},
     "materials_inventory": {},
     "floors_visited": [],
@@ -66,30 +82,6 @@ def get_save_field_with_default(data, field_name, default_value=None):
     
     return default_value
 
-def ensure_weapon_max_durability(weapons):
-    """Ensure all weapons have max_durability field for backward compatibility"""
-    if not weapons:
-        return weapons
-    
-    for weapon in weapons:
-        if "max_durability" not in weapon:
-            # Default: max_durability = current_durability + 5
-            weapon["max_durability"] = weapon.get("durability", 10) + 5
-    
-    return weapons
-
-def ensure_armor_max_durability(armors):
-    """Ensure all armor pieces have max_durability field for backward compatibility"""
-    if not armors:
-        return armors
-    
-    for armor in armors:
-        if "max_durability" not in armor:
-            # Default: max_durability = current_durability + 10
-            armor["max_durability"] = armor.get("durability", 10) + 10
-    
-    return armors
-
 # Directory for save files
 SAVE_DIR = "saves"
 DEFAULT_SAVE = "savegame.json"
@@ -110,150 +102,840 @@ def get_save_file_path(save_name):
         safe_name = safe_name.replace(' ', '_')
         return os.path.join(SAVE_DIR, f"{safe_name}.json")
 
+def get_chunk_file_path(save_name):
+    """Get the path of the chunk file that spills a save's world to disk while playing"""
+    save_path = get_save_file_path(save_name)
+    return os.path.splitext(save_path)[0] + ".chunks"
+
+def get_database_file_path(save_name):
+    """Get the path of a save's SQLite database"""
+    save_path = get_save_file_path(save_name)
+    return os.path.splitext(save_path)[0] + ".db"
+
+def get_binary_file_path(save_name):
+    """Get the path of a save in the binary format"""
+    save_path = get_save_file_path(save_name)
+    return os.path.splitext(save_path)[0] + ".sav"
+
+def get_manifest_file_path(save_name):
+    """Get the path of a save's manifest (its chunks are in the shared object store)"""
+    save_path = get_save_file_path(save_name)
+    return os.path.splitext(save_path)[0] + ".manifest"
+
+def get_save_paths(save_name):
+    """Every file a save slot can be stored in, in the order load_game looks for them"""
+    return [get_database_file_path(save_name), get_manifest_file_path(save_name),
+            get_binary_file_path(save_name), get_save_file_path(save_name)]
+
+def remove_save_files(save_name, keep=None):
+    """Delete a slot's save files in every format except keep (a slot holds one save after a full write)"""
+    for path in get_save_paths(save_name):
+        if path != keep and os.path.exists(path):
+            if path.endswith(".db"):
+                remove_database(path)
+            else:
+                os.remove(path)
+
+def get_metadata_file_path(save_name):
+    """Get the path of a save's metadata sidecar"""
+    save_path = get_save_file_path(save_name)
+    return os.path.splitext(save_path)[0] + ".meta"
+
+def read_json_save(save_name):
+    """A JSON save's data with its journal replayed, or None if it can't be read"""
+    try:
+        with open(get_save_file_path(save_name), "r") as f:
+            data = json.load(f)
+        return replay_journal(save_name, data)
+    except (json.JSONDecodeError, FileNotFoundError):
+        return None
+
+def read_player_data(save_name):
+    """A save's fields without building its world (SQLite saves don't read any rooms)"""
+    database_path = get_database_file_path(save_name)
+    if os.path.exists(database_path):
+        from save_database import SaveDatabase
+        database = SaveDatabase(database_path)
+        try:
+            return {field: json.loads(value) for field, value in database.read_player_state().items()}
+        finally:
+            database.close()
+    if os.path.exists(get_manifest_file_path(save_name)):
+        try:
+            data = read_manifest(get_manifest_file_path(save_name))[0]
+        except (json.JSONDecodeError, FileNotFoundError):
+            return None
+        for entry in iter_journal_entries(save_name):
+            data.update(entry.get("player", {}))
+        return data
+    if os.path.exists(get_binary_file_path(save_name)):
+        try:
+            return read_binary_worlds(save_name)[0]
+        except (SaveFormatError, FileNotFoundError):
+            return None
+    return read_json_save(save_name)
+
+# --- Save metadata ---
+# Every save has a small sidecar (<name>.meta) with what the save menus show,
+# so listing saves never parses a world. The save jobs rewrite it right after
+# the save itself.
+
+SAVE_METADATA_FIELDS = ("save_name", "player_level", "player_skill_points", "player_floor", "player_x", "player_y",
+                        "player_hp", "player_max_hp", "player_stamina", "player_max_stamina",
+                        "player_mana", "player_max_mana", "player_money")
+SAVE_METADATA_COUNTS = ("unlocked_floors", "discovered_enemies", "learned_spells", "inventory", "armor_inventory")
+
+def build_save_metadata(state, room_count=None):
+    """The save menu summary of a save's fields"""
+    metadata = {field: state.get(field) for field in SAVE_METADATA_FIELDS}
+    metadata["counts"] = {field: len(state.get(field) or ()) for field in SAVE_METADATA_COUNTS}
+    metadata["saved_at"] = time.time()
+    metadata["room_count"] = room_count
+    return metadata
+
+def write_save_metadata(save_name, metadata):
+    metadata_path = get_metadata_file_path(save_name)
+    temp_path = metadata_path + ".tmp"
+    with open(temp_path, "w") as f:
+        json.dump(metadata, f, sort_keys=True)
+    os.replace(temp_path, metadata_path)
+
+def read_save_metadata(save_name):
+    """A save's metadata, or None if there is no such save or it can't be read"""
+    try:
+        with open(get_metadata_file_path(save_name), "r") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError):
+        pass
+    if not save_exists(save_name):
+        return None
+
+    # Saves written before metadata existed are read in full once
+    data = read_player_data(save_name)
+    if data is None:
+        return None
+    metadata = build_save_metadata(data, count_saved_rooms(save_name, data))
+    for path in get_save_paths(save_name):
+        if os.path.exists(path):
+            metadata["saved_at"] = os.path.getmtime(path)
+            break
+    try:
+        write_save_metadata(save_name, metadata)
+    except OSError:
+        pass
+    return metadata
+
+def count_saved_rooms(save_name, data):
+    if "worlds" in data:
+        return sum(len(rooms) for rooms in data["worlds"].values())
+    if "world" in data:
+        return len(data["world"])
+    if os.path.exists(get_manifest_file_path(save_name)):
+        return sum(count for _, count in read_manifest(get_manifest_file_path(save_name))[2].values())
+    if os.path.exists(get_binary_file_path(save_name)):
+        return sum(len(rooms) for rooms in read_binary_worlds(save_name)[1].values())
+    from save_database import SaveDatabase
+    database = SaveDatabase(get_database_file_path(save_name))
+    try:
+        return database.count_rooms()
+    finally:
+        database.close()
+
+def format_save_summary(metadata):
+    """One line for the save lists: level, floor, money and when it was saved"""
+    if metadata is None:
+        return "unreadable"
+    saved_at = time.strftime("%Y-%m-%d %H:%M", time.localtime(metadata.get("saved_at") or 0))
+    return (f"Level {metadata.get('player_level', '?')}, Floor {metadata.get('player_floor', '?')}, "
+            f"{metadata.get('player_money', '?')} gold - saved {saved_at}")
+
+def print_save_list(save_files):
+    """Numbered save list with each save's summary"""
+    for i, (file_name, display_name) in enumerate(save_files, 1):
+        say(f"  {i}. {display_name} ({format_save_summary(read_save_metadata(file_name))})")
+
+def open_save_database(save_name):
+    """The SaveDatabase of a save, or None for saves that stay JSON.
+
+    With the SQLite backend an existing JSON save is imported into a database
+    the first time it is opened; the JSON file is kept as <name>.json.imported.
+    """
+    from save_database import SaveDatabase, import_json_data
+    database_path = get_database_file_path(save_name)
+    if os.path.exists(database_path):
+        return SaveDatabase(database_path)
+    if SAVE_BACKEND != "sqlite" or not os.path.exists(get_save_file_path(save_name)):
+        return None
+
+    data = read_json_save(save_name)
+    if data is None:
+        return None
+    import_json_data(database_path, data)
+    os.replace(get_save_file_path(save_name), get_save_file_path(save_name) + ".imported")
+    discard_journal(save_name)
+    say(f"Save '{save_name}' was converted to the new save format.")
+    return SaveDatabase(database_path)
+
+def save_exists(save_name):
+    """Whether a save slot exists in any save format"""
+    return any(os.path.exists(path) for path in get_save_paths(save_name))
+
 def list_save_files():
     """List all available save files"""
     ensure_save_directory()
     save_files = []
     
     # Check for auto-save (slot 0)
-    auto_save_path = os.path.join(SAVE_DIR, "auto_save.json")
-    if os.path.exists(auto_save_path):
+    if save_exists("auto_save"):
         save_files.append(("auto_save", "Auto Save (Most Recent)"))
     
     # Check for default save
-    default_path = os.path.join(SAVE_DIR, DEFAULT_SAVE)
-    if os.path.exists(default_path):
+    if save_exists("default"):
         save_files.append(("default", "Default Save"))
     
-    # Check for named saves
-    pattern = os.path.join(SAVE_DIR, "*.json")
-    for file_path in glob.glob(pattern):
-        filename = os.path.basename(file_path)
-        if filename not in ["auto_save.json", DEFAULT_SAVE]:
-            save_name = os.path.splitext(filename)[0]
-            save_name = save_name.replace('_', ' ')
-            save_files.append((save_name, save_name.title()))
+    # Check for named saves (JSON files, manifests, binary saves and SQLite databases)
+    reserved = ["auto_save", os.path.splitext(DEFAULT_SAVE)[0]]
+    seen = set()
+    for pattern in ("*.json", "*.manifest", "*.sav", "*.db"):
+        for file_path in glob.glob(os.path.join(SAVE_DIR, pattern)):
+            stem = os.path.splitext(os.path.basename(file_path))[0]
+            if stem not in reserved and stem not in seen:
+                seen.add(stem)
+                save_name = stem.replace('_', ' ')
+                save_files.append((save_name, save_name.title()))
     
     return save_files
 
-def save_game(save_name, worlds, inventory, armor_inventory, equipped_armor, player_floor, player_x, player_y,
-              player_hp, player_max_hp, player_stamina, player_max_stamina, player_mana, player_max_mana,
-              player_money, player_potions, stamina_potions, mana_potions, mysterious_keys, golden_keys,
-              unlocked_floors, waypoints, waypoint_scrolls, discovered_enemies, learned_spells, spell_scrolls, using_fists,
-              player_level=1, player_xp=0, player_xp_to_next=100, player_skill_points=0, enemies_defeated=0, bosses_defeated=0,
-              total_damage_dealt=0, total_damage_taken=0, critical_hits=0, attack_count=0, rooms_explored=0,
-              floors_visited=None, move_count=0, items_collected=0, weapons_broken=0, gold_earned=0):
-    
-    # Import unique items system to get discovered uniques
-    from unique_items import discovered_uniques
-    
-    # Handle floors_visited set conversion - ensure it's always a set before converting to list
-    if floors_visited is None:
-        floors_visited = set()
-    elif isinstance(floors_visited, int):
-        # Convert old integer format to set
-        floors_visited = set([floors_visited]) if floors_visited > 0 else set()
-    elif not isinstance(floors_visited, (set, list)):
-        # Fallback for any other unexpected types
-        floors_visited = set()
-    
-    data = {
-        "save_name": save_name,
-        "timestamp": "now",  # Could add actual timestamp later
-        "worlds": {
-            str(floor): {
-                f"{x},{y}": {
-                    "description": r["description"],
-                    "type": r.get("type"),
-                    "enemy": r["enemy"],
-                    "weapons": r.get("weapons", []),
-                    "armors": r.get("armors", []),
-                    "shop": r.get("shop"),
-                    "chest": r.get("chest"),
-                    "crystal_type": r.get("crystal_type"),
-                    "key_required": r.get("key_required"),
-                    "requires_mysterious_key": r.get("requires_mysterious_key"),
-                    "treasure_looted": r.get("treasure_looted"),
-                    "mysterious_key": r.get("mysterious_key")
-                } for (x, y), r in world.items()
-            } for floor, world in worlds.items()
-        },
-        "inventory": inventory,
-        "armor_inventory": armor_inventory,
-        "equipped_armor": equipped_armor,
-        "player_floor": player_floor,
-        "player_x": player_x,
-        "player_y": player_y,
-        "player_hp": player_hp,
-        "player_max_hp": player_max_hp,
-        "player_stamina": player_stamina,
-        "player_max_stamina": player_max_stamina,
-        "player_mana": player_mana,
-        "player_max_mana": player_max_mana,
-        "player_money": player_money,
-        "player_potions": player_potions,
-        "stamina_potions": stamina_potions,
-        "mana_potions": mana_potions,
-        "mysterious_keys": mysterious_keys,
-        "golden_keys": golden_keys,
-        "unlocked_floors": list(unlocked_floors) if isinstance(unlocked_floors, set) else [],
-        "waypoints": waypoints,
-        "waypoint_scrolls": waypoint_scrolls,
-        "discovered_enemies": list(discovered_enemies) if isinstance(discovered_enemies, set) else [],
-        "learned_spells": learned_spells,
-        "spell_scrolls": spell_scrolls,
-        "using_fists": using_fists,
-        "discovered_uniques": discovered_uniques,
-        "player_level": player_level,
-        "player_xp": player_xp,
-        "player_xp_to_next": player_xp_to_next,
-        "player_skill_points": player_skill_points,
-        "enemies_defeated": enemies_defeated,
-        "bosses_defeated": bosses_defeated,
-        "total_damage_dealt": total_damage_dealt,
-        "total_damage_taken": total_damage_taken,
-        "critical_hits": critical_hits,
-        "attack_count": attack_count,
-        "rooms_explored": rooms_explored,
-        "floors_visited": list(floors_visited),
-        "move_count": move_count,
-        "items_collected": items_collected,
-        "weapons_broken": weapons_broken,
-        "gold_earned": gold_earned
-    }
-    
-    save_path = get_save_file_path(save_name)
-    with open(save_path, "w") as f:
-        json.dump(data, f)
+def state_from_save_args(worlds, inventory, armor_inventory, equipped_armor, player_floor, player_x, player_y,
+                         player_hp, player_max_hp, player_stamina, player_max_stamina, player_mana, player_max_mana,
+                         player_money, player_potions, stamina_potions, mana_potions, mysterious_keys, golden_keys,
+                         unlocked_floors, waypoints, waypoint_scrolls, discovered_enemies, learned_spells, spell_scrolls, using_fists,
+                         player_level=1, player_xp=0, player_xp_to_next=100, player_skill_points=0, enemies_defeated=0, bosses_defeated=0,
+                         total_damage_dealt=0, total_damage_taken=0, critical_hits=0, attack_count=0, rooms_explored=0,
+                         floors_visited=None, move_count=0, items_collected=0, weapons_broken=0, gold_earned=0):
+    """A GameState from the old positional save arguments"""
+    fields = dict(locals())
+    if not isinstance(fields["floors_visited"], (set, list, int)):
+        fields["floors_visited"] = set()
+    if not isinstance(unlocked_floors, set):
+        fields["unlocked_floors"] = set()
+    if not isinstance(discovered_enemies, set):
+        fields["discovered_enemies"] = set()
+    return GameState(**fields)
+
+def _as_game_state(state, args, kwargs):
+    if isinstance(state, GameState):
+        return state
+    return state_from_save_args(state, *args, **kwargs)
+
+def save_game(save_name, state, *args, **kwargs):
+    """Save the game to a slot.
+
+    state is a GameState; the old positional arguments (worlds, inventory,
+    ...) are still accepted.
+    """
+    state = _as_game_state(state, args, kwargs)
+    worlds = state.worlds
+    data = state.snapshot(save_name)
+    if SAVE_BACKEND == "sqlite":
+        # Upserts only what changed when the world came from (or was last saved to) this slot
+        wait_for_saves()
+        save_path = get_save_tracker(save_name).prepare(worlds, data).run()
+    else:
+        save_path = write_save_data(save_name, data, worlds)
     
     if save_name == "default":
-        print("Game saved to default save!")
+        say("Game saved to default save!")
     else:
-        print(f"Game saved as '{save_name}'!")
+        say(f"Game saved as '{save_name}'!")
     
     return save_path
 
-def auto_save_game(worlds, inventory, armor_inventory, equipped_armor, player_floor, player_x, player_y,
-                   player_hp, player_max_hp, player_stamina, player_max_stamina, player_mana, player_max_mana,
-                   player_money, player_potions, stamina_potions, mana_potions, mysterious_keys, golden_keys,
-                   unlocked_floors, waypoints, waypoint_scrolls, discovered_enemies, learned_spells, spell_scrolls, using_fists,
-                   player_level=1, player_xp=0, player_xp_to_next=100, player_skill_points=0, enemies_defeated=0, bosses_defeated=0,
-                   total_damage_dealt=0, total_damage_taken=0, critical_hits=0, attack_count=0, rooms_explored=0,
-                   floors_visited=None, move_count=0, items_collected=0, weapons_broken=0, gold_earned=0):
-    """Auto-save the game (overwrites previous auto-save)"""
-    
-    # Ensure set parameters are properly converted to lists for JSON serialization
-    unlocked_floors_list = list(unlocked_floors) if isinstance(unlocked_floors, set) else unlocked_floors
-    discovered_enemies_list = list(discovered_enemies) if isinstance(discovered_enemies, set) else discovered_enemies
-    floors_visited_list = list(floors_visited) if isinstance(floors_visited, set) else floors_visited
-    
-    return save_game("auto_save", worlds, inventory, armor_inventory, equipped_armor, player_floor, player_x, player_y,
-                     player_hp, player_max_hp, player_stamina, player_max_stamina, player_mana, player_max_mana,
-                     player_money, player_potions, stamina_potions, mana_potions, mysterious_keys, golden_keys,
-                     unlocked_floors_list, waypoints, waypoint_scrolls, discovered_enemies_list, learned_spells, spell_scrolls, using_fists,
-                     player_level, player_xp, player_xp_to_next, enemies_defeated, bosses_defeated, total_damage_dealt,
-                     total_damage_taken, critical_hits, attack_count, rooms_explored, floors_visited_list, move_count,
-                     items_collected, weapons_broken, gold_earned)
+def build_save_data(save_name, *args, include_worlds=True, **kwargs):
+    """Everything a save file holds from the old positional save arguments; include_worlds=False leaves out the rooms"""
+    state = state_from_save_args(*args, **kwargs)
+    data = dict(state.snapshot(save_name))
+    if include_worlds:
+        data["worlds"] = build_world_data(state.worlds)
+    return data
+
+def encode_fields(data):
+    """{field: JSON text} of save fields; a GameState snapshot already holds them"""
+    encoded = getattr(data, "encoded", None)
+    if encoded is not None:
+        return encoded
+    return {field: json.dumps(value, sort_keys=True, default=to_plain) for field, value in data.items()}
+
+def build_world_data(worlds):
+    """{floor: {"x,y": room}} for every room of every floor that has to be saved"""
+    import world_generation
+    return {
+        str(floor): {
+            f"{x},{y}": build_room_data(r) for (x, y), r in world_generation.iter_saved_rooms(world)
+        } for floor, world in worlds.items()
+    }
+
+def build_room_data(r):
+    """The fields of a room that go into a save"""
+    return {
+        "description": r["description"],
+        "type": r.get("type"),
+        "enemy": r["enemy"],
+        "weapons": r.get("weapons", []),
+        "armors": r.get("armors", []),
+        "shop": r.get("shop"),
+        "chest": r.get("chest"),
+        "crystal_type": r.get("crystal_type"),
+        "key_required": r.get("key_required"),
+        "requires_mysterious_key": r.get("requires_mysterious_key"),
+        "treasure_looted": r.get("treasure_looted"),
+        "mysterious_key": r.get("mysterious_key")
+    }
+
+def iter_room_data(worlds):
+    """((floor, x, y), saved fields) for every room that has to be saved, one room at a time"""
+    import world_generation
+    for floor, world in worlds.items():
+        for (x, y), r in world_generation.iter_saved_rooms(world):
+            yield (floor, x, y), build_room_data(r)
+
+def iter_encoded_rooms(worlds):
+    """((floor, x, y), JSON text) for every room that has to be saved, one room at a time"""
+    for key, room_data in iter_room_data(worlds):
+        yield key, json.dumps(room_data, sort_keys=True, default=to_plain)
+
+def write_save_data(save_name, data, worlds):
+    """Write a full save file, streaming the rooms; it replaces the save's base snapshot and journal.
+
+    The objects backend writes a manifest and only the chunks that changed,
+    the binary backend a .sav file, anything else a JSON file.
+    """
+    wait_for_saves()
+    fields = encode_fields(data).items()
+    if SAVE_BACKEND == "objects":
+        index = get_chunk_index()
+        clean, rooms = index.plan(worlds)
+        try:
+            chunks = write_chunks(get_object_store(), clean,
+                                  ((key, build_room_data(room)) for key, room in rooms.items()))
+        except BaseException:
+            index.forget()
+            raise
+        index.record(worlds, chunks)
+        save_path, room_count = write_manifest(save_name, fields, chunks, list(worlds))
+    elif SAVE_BACKEND == "binary":
+        from save_binary import write_binary_save
+        save_path = get_binary_file_path(save_name)
+        with open(save_path + ".tmp", "wb") as f:
+            room_count = write_binary_save(f, fields, iter_room_data(worlds), list(worlds), BINARY_SAVE_COMPRESSION)
+        os.replace(save_path + ".tmp", save_path)
+    else:
+        from save_stream import write_save_document
+        save_path = get_save_file_path(save_name)
+        with open(save_path + ".tmp", "w") as f:
+            room_count = write_save_document(f, fields, iter_encoded_rooms(worlds), list(worlds))
+        os.replace(save_path + ".tmp", save_path)
+    remove_save_files(save_name, keep=save_path)
+    discard_journal(save_name)
+    write_save_metadata(save_name, build_save_metadata(data, room_count))
+    return save_path
+
+def auto_save_game(state, *args, **kwargs):
+    """Auto-save the game by appending what changed since the last auto-save to the save journal.
+
+    state is a GameState; the old positional arguments are still accepted.
+    """
+    state = _as_game_state(state, args, kwargs)
+    job = get_save_tracker("auto_save").prepare(state.worlds, state.snapshot("auto_save"))
+    if ASYNC_AUTO_SAVE:
+        get_background_saver().submit(job)
+        return get_save_file_path("auto_save")
+    return job.run()
+
+_background_saver = None
+
+def get_background_saver():
+    """The shared background writer for auto-saves"""
+    global _background_saver
+    if _background_saver is None:
+        from background_save import BackgroundSaver
+        _background_saver = BackgroundSaver()
+    return _background_saver
+
+def wait_for_saves(timeout=None):
+    """Block until background auto-saves have been written"""
+    if _background_saver is None:
+        return True
+    return _background_saver.wait(timeout)
+
+def take_save_errors():
+    """Background auto-save failures since the last call"""
+    if _background_saver is None:
+        return []
+    return _background_saver.take_errors()
+
+# --- Incremental saves ---
+# With the JSON backend a save is a base snapshot (the .json file) plus an
+# append-only journal of JSON lines. Each journal entry holds only the player
+# fields and rooms that changed since the previous entry. Every
+# JOURNAL_COMPACT_EVERY entries (or when the journal cannot describe the
+# change, e.g. a different world) the journal is folded into a fresh base
+# snapshot. With the SQLite backend the same changes are upserted into the
+# save database instead (see save_database.py).
+
+def get_journal_file_path(save_name):
+    """Get the path of a save's journal file"""
+    save_path = get_save_file_path(save_name)
+    return os.path.splitext(save_path)[0] + ".journal"
+
+_trackers = {}
+
+def get_save_tracker(save_name):
+    """The incremental save state of a save, created on first use"""
+    if save_name not in _trackers:
+        _trackers[save_name] = SaveTracker(save_name)
+    return _trackers[save_name]
+
+def discard_journal(save_name):
+    """Forget what a save holds: it was just rewritten or deleted"""
+    _trackers.pop(save_name, None)
+    journal_path = get_journal_file_path(save_name)
+    if os.path.exists(journal_path):
+        os.remove(journal_path)
+
+class SaveTracker:
+    """Tracks what one save's storage already holds.
+
+    prepare() runs on the main thread and returns a job holding a frozen copy
+    of what has to be written; the job's run() does the file I/O and can run on
+    the background saver's thread.
+    """
+
+    def __init__(self, save_name):
+        self.save_name = save_name
+        self.backend = SAVE_BACKEND
+        self.path = get_journal_file_path(save_name)
+        self.worlds = None       # world the storage was last fully written from
+        self.world_seed = None
+        self.player_state = {}   # field -> JSON text as last written
+        self.room_fingerprints = {}  # (floor, x, y) -> fingerprint of the room as last written
+        self.room_keys = set()   # (floor, x, y) of every room in the JSON save
+        self.entries = 0
+
+    def record(self, worlds, state):
+        """Write state and the rooms touched since the last save right away; returns the path written"""
+        return self.prepare(worlds, state).run()
+
+    def adopt(self, worlds, player_state):
+        """Start tracking a world that was just loaded from this save"""
+        import world_generation
+        world_generation.take_touched_rooms()
+        self.worlds = worlds
+        self.world_seed = world_generation.world_seed
+        self.player_state = dict(player_state)
+        self.room_fingerprints = {}
+        self.entries = 0
+
+    def _job_classes(self):
+        if self.backend == "sqlite":
+            from save_database import DatabaseEntryJob, DatabaseSnapshotJob
+            return DatabaseEntryJob, DatabaseSnapshotJob
+        if self.backend == "objects":
+            return JournalEntryJob, ManifestSnapshotJob
+        if self.backend == "binary":
+            return JournalEntryJob, BinarySnapshotJob
+        return JournalEntryJob, BaseSnapshotJob
+
+    def prepare(self, worlds, state):
+        """Snapshot the changes since the last save as an entry job or a full snapshot job"""
+        import world_generation
+        if (self.worlds is not worlds or self.world_seed != state.get("world_seed")
+                or (self.backend != "sqlite" and self.entries >= JOURNAL_COMPACT_EVERY)):
+            return self.prepare_snapshot(worlds, state)
+
+        player_changes = {}
+        for field, encoded in encode_fields(state).items():
+            # Unchanged fields of a GameState snapshot are the very same string, so this is cheap
+            if self.player_state.get(field) != encoded:
+                player_changes[field] = encoded
+                self.player_state[field] = encoded
+
+        room_changes = {}
+        for floor, x, y in world_generation.take_touched_rooms():
+            world = worlds.get(floor)
+            if world is None or (x, y) not in world or not world_generation.room_needs_saving(world, (x, y)):
+                continue
+            encoded = json.dumps(build_room_data(world[(x, y)]), sort_keys=True, default=to_plain)
+            fingerprint = world_generation.text_fingerprint(encoded)
+            if self.room_fingerprints.get((floor, x, y)) != fingerprint:
+                self.room_fingerprints[(floor, x, y)] = fingerprint
+                room_changes[(floor, x, y)] = encoded
+
+        if player_changes or room_changes:
+            self.entries += 1
+        self.room_keys.update(room_changes)
+        entry_class, _ = self._job_classes()
+        return entry_class(self, player_changes, room_changes, build_save_metadata(state, len(self.room_keys)))
+
+    def prepare_snapshot(self, worlds, state):
+        """Snapshot the whole save for a full write"""
+        import world_generation
+        self.worlds = worlds
+        self.world_seed = state.get("world_seed")
+        self.entries = 0
+        self.player_state = dict(encode_fields(state))
+        # Rooms are not copied up front: the snapshot copies a room only if the
+        # game touches it before the job has written it
+        clean_chunks = None
+        if self.backend == "objects":
+            # Chunks nobody touched since they were stored are reused as they are
+            clean_chunks, rooms = get_chunk_index().plan(worlds)
+        else:
+            rooms = {
+                (floor, x, y): room
+                for floor, world in worlds.items()
+                for (x, y), room in world_generation.iter_saved_rooms(world)
+            }
+        snapshot = RoomSnapshot(rooms, list(worlds))
+        self.room_keys = set(snapshot.keys())
+
+        # Touched rooms may still be changed by the current command, so those are frozen now
+        self.room_fingerprints = {}
+        for floor, x, y in world_generation.take_touched_rooms():
+            world = worlds.get(floor)
+            if world is not None and (x, y) in world:
+                room = world[(x, y)]
+                snapshot.capture(floor, x, y, room)
+                self.room_fingerprints[(floor, x, y)] = world_generation.room_fingerprint(build_room_data(room))
+        _, snapshot_class = self._job_classes()
+        if clean_chunks is not None:
+            room_count = len(self.room_keys) + sum(count for _, count in clean_chunks.values())
+            return ManifestSnapshotJob(self, dict(self.player_state), snapshot,
+                                       build_save_metadata(state, room_count), clean_chunks)
+        return snapshot_class(self, dict(self.player_state), snapshot, build_save_metadata(state, len(self.room_keys)))
+
+    def invalidate(self):
+        """A write failed - the next save has to be a full one"""
+        self.worlds = None
+        if self.backend == "objects":
+            get_chunk_index().forget()
+
+class RoomSnapshot:
+    """Copy-on-write view of the saved rooms at the moment a full snapshot was taken"""
+
+    def __init__(self, rooms, floors):
+        self.floors = floors
+        self._rooms = rooms   # (floor, x, y) -> live room, or a frozen copy once captured
+        self._frozen = set()  # rooms that are copies or already written
+        self._lock = threading.Lock()
+        import world_generation
+        world_generation.room_snapshots.append(self)
+
+    def keys(self):
+        return list(self._rooms)
+
+    def capture(self, floor, x, y, room):
+        """Called before the game hands out a room: keep a copy if it has not been written yet"""
+        key = (floor, x, y)
+        with self._lock:
+            if key in self._rooms and key not in self._frozen:
+                self._rooms[key] = copy.deepcopy(room)
+                self._frozen.add(key)
+
+    def encoded_rooms(self, encode=None):
+        """((floor, x, y), encoded room) for every room, as it was when the snapshot was taken.
+
+        Rooms are encoded as JSON text unless encode(saved fields) is given.
+        """
+        for key in list(self._rooms):
+            with self._lock:
+                room = self._rooms.pop(key)
+                self._frozen.add(key)
+                if encode is None:
+                    encoded = json.dumps(build_room_data(room), sort_keys=True, default=to_plain)
+                else:
+                    encoded = encode(build_room_data(room))
+            yield key, encoded
+
+    def release(self):
+        import world_generation
+        if self in world_generation.room_snapshots:
+            world_generation.room_snapshots.remove(self)
+
+def encode_floors(rooms, empty_floors=()):
+    """'"floor": {"x,y": room, ...}, ...' JSON text from ((floor, x, y), JSON text) pairs"""
+    floors = {str(floor): [] for floor in empty_floors}
+    for (floor, x, y), encoded in rooms:
+        floors.setdefault(str(floor), []).append(f'"{x},{y}": {encoded}')
+    return ", ".join(f"{json.dumps(floor)}: {{{', '.join(entries)}}}" for floor, entries in floors.items())
+
+class JournalEntryJob:
+    """One journal line: changed player fields and rooms, already encoded"""
+
+    def __init__(self, tracker, player_changes, room_changes, metadata):
+        self.tracker = tracker
+        self.player_changes = player_changes  # field -> JSON text
+        self.room_changes = room_changes      # (floor, x, y) -> JSON text
+        self.metadata = metadata
+
+    def merge(self, later):
+        """Fold a later entry for the same save into this one; returns False if it can't be"""
+        if type(later) is not type(self) or later.tracker is not self.tracker:
+            return False
+        self.player_changes.update(later.player_changes)
+        self.room_changes.update(later.room_changes)
+        self.metadata = later.metadata
+        return True
+
+    def run(self):
+        if not self.player_changes and not self.room_changes:
+            return self.tracker.path
+        line = "".join([
+            '{"player": {',
+            ", ".join(f"{json.dumps(field)}: {encoded}" for field, encoded in self.player_changes.items()),
+            '}, "rooms": {',
+            encode_floors(self.room_changes.items()),
+            "}}\n"
+        ])
+        with open(self.tracker.path, "a") as f:
+            f.write(line)
+        write_save_metadata(self.tracker.save_name, self.metadata)
+        return self.tracker.path
+
+    def failed(self):
+        self.tracker.invalidate()
+
+class BaseSnapshotJob:
+    """A full save written from a snapshot; replaces the base file and empties the journal"""
+
+    def __init__(self, tracker, player_state, snapshot, metadata):
+        self.tracker = tracker
+        self.player_state = player_state
+        self.snapshot = snapshot
+        self.metadata = metadata
+
+    def run(self):
+        from save_stream import write_save_document
+        save_path = get_save_file_path(self.tracker.save_name)
+        temp_path = save_path + ".tmp"
+        try:
+            with open(temp_path, "w") as f:
+                write_save_document(f, self.player_state.items(), self.snapshot.encoded_rooms(), self.snapshot.floors)
+            os.replace(temp_path, save_path)
+        finally:
+            self.snapshot.release()
+        remove_save_files(self.tracker.save_name, keep=save_path)
+        if os.path.exists(self.tracker.path):
+            os.remove(self.tracker.path)
+        write_save_metadata(self.tracker.save_name, self.metadata)
+        return save_path
+
+    def supersedes(self, earlier):
+        """A full snapshot already contains everything queued before it for the same save"""
+        return getattr(earlier, "tracker", None) is self.tracker
+
+    def failed(self):
+        self.tracker.invalidate()
+
+    def cancel(self):
+        """Dropped in favour of a newer snapshot"""
+        self.snapshot.release()
+
+class BinarySnapshotJob(BaseSnapshotJob):
+    """A full save written from a snapshot in the binary format; the journal stays JSON lines"""
+
+    def run(self):
+        from save_binary import BinarySaveWriter
+        save_path = get_binary_file_path(self.tracker.save_name)
+        temp_path = save_path + ".tmp"
+        writer = BinarySaveWriter()
+        try:
+            with open(temp_path, "wb") as f:
+                writer.write(f, self.player_state.items(), self.snapshot.encoded_rooms(writer.encode_room),
+                             self.snapshot.floors, BINARY_SAVE_COMPRESSION)
+            os.replace(temp_path, save_path)
+        finally:
+            self.snapshot.release()
+        remove_save_files(self.tracker.save_name, keep=save_path)
+        if os.path.exists(self.tracker.path):
+            os.remove(self.tracker.path)
+        write_save_metadata(self.tracker.save_name, self.metadata)
+        return save_path
+
+class ManifestSnapshotJob(BaseSnapshotJob):
+    """A full save as a manifest: stores the snapshot's chunks and reuses the clean ones"""
+
+    def __init__(self, tracker, player_state, snapshot, metadata, clean_chunks):
+        super().__init__(tracker, player_state, snapshot, metadata)
+        self.worlds = tracker.worlds
+        self.clean_chunks = clean_chunks
+
+    def run(self):
+        try:
+            # Copied under the snapshot's lock, encoded per chunk afterwards
+            chunks = write_chunks(get_object_store(), self.clean_chunks, self.snapshot.encoded_rooms(copy.deepcopy))
+        finally:
+            self.snapshot.release()
+        get_chunk_index().record(self.worlds, chunks)
+        save_path, _ = write_manifest(self.tracker.save_name, self.player_state.items(), chunks, self.snapshot.floors)
+        remove_save_files(self.tracker.save_name, keep=save_path)
+        if os.path.exists(self.tracker.path):
+            os.remove(self.tracker.path)
+        write_save_metadata(self.tracker.save_name, self.metadata)
+        return save_path
+
+# --- Shared chunk objects ---
+# See object_store.py. A manifest is
+# {"fields": {...}, "floors": {"floor": {"cx,cy": [digest, room count]}}}.
+
+def get_object_store():
+    """The chunk objects shared by every save slot"""
+    return ObjectStore(os.path.join(SAVE_DIR, "objects"))
+
+def write_manifest(save_name, fields, chunks, floors=()):
+    """Write a slot's manifest from (name, JSON text) fields and its chunks; returns (path, room count)"""
+    manifest_floors = {str(floor): {} for floor in floors}
+    for (floor, cx, cy), (digest, count) in sorted(chunks.items()):
+        manifest_floors.setdefault(str(floor), {})[f"{cx},{cy}"] = [digest, count]
+    manifest_path = get_manifest_file_path(save_name)
+    with open(manifest_path + ".tmp", "w") as f:
+        f.write('{"fields": {')
+        f.write(", ".join(f"{json.dumps(name)}: {encoded}" for name, encoded in fields))
+        f.write(f'}}, "floors": {json.dumps(manifest_floors)}}}')
+    os.replace(manifest_path + ".tmp", manifest_path)
+    return manifest_path, sum(count for _, count in chunks.values())
+
+def read_manifest(manifest_path):
+    """(fields, floors, {(floor, cx, cy): (digest, room count)}) of a manifest"""
+    with open(manifest_path, "r") as f:
+        manifest = json.load(f)
+    chunks = {}
+    for floor, floor_chunks in manifest["floors"].items():
+        for position, (digest, count) in floor_chunks.items():
+            cx, cy = map(int, position.split(","))
+            chunks[(int(floor), cx, cy)] = (digest, count)
+    return manifest["fields"], [int(floor) for floor in manifest["floors"]], chunks
+
+def read_manifest_floors(save_name):
+    """(fields, floors, read_floor, chunks, journal rooms) of a manifest save, without reading any rooms yet.
+
+    Floors come nearest to the player's floor first. read_floor(floor) reads
+    one floor's chunks with the journal replayed and is safe to call from
+    another thread.
+    """
+    from object_store import decode_chunk
+    store = get_object_store()
+    data, floors, chunks = read_manifest(get_manifest_file_path(save_name))
+    journal = read_journal(save_name, data)
+    player_floor = data.get("player_floor", 1)
+    floors = sorted(set(floors) | set(journal), key=lambda floor: abs(floor - player_floor))
+
+    def read_floor(floor):
+        rooms = {}
+        for (chunk_floor, _, _), (digest, _) in chunks.items():
+            if chunk_floor == floor:
+                for pos, room in decode_chunk(store.get(digest)).items():
+                    rooms[pos] = compact_room(room) if COMPACT_ROOMS else room
+        rooms.update(journal.get(floor, {}))
+        return rooms
+
+    journal_rooms = {(floor, x, y) for floor, rooms in journal.items() for x, y in rooms}
+    return data, floors, read_floor, chunks, journal_rooms
+
+def collect_save_garbage():
+    """Remove chunk objects that no manifest refers to any more; returns how many were removed"""
+    live = set()
+    for manifest_path in glob.glob(os.path.join(SAVE_DIR, "*.manifest")):
+        try:
+            live.update(digest for digest, _ in read_manifest(manifest_path)[2].values())
+        except (json.JSONDecodeError, OSError, KeyError, ValueError):
+            return 0  # an unreadable manifest might still need its chunks
+    return get_object_store().collect_garbage(live)
+
+def write_migrated_database(database, data, worlds):
+    """Rewrite a migrated SQLite save's fields and rooms; returns its new player table"""
+    player_state = dict(encode_fields(data))
+    database.rewrite(player_state.items(), iter_encoded_rooms(worlds))
+    return player_state
+
+def iter_journal_entries(save_name):
+    """The intact entries of a save's journal, oldest first"""
+    journal_path = get_journal_file_path(save_name)
+    if not os.path.exists(journal_path):
+        return
+    with open(journal_path, "r") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                return  # torn write at the end of the journal - everything before it is intact
+            yield entry
+
+def replay_journal(save_name, data):
+    """Apply a save's journal entries to its base snapshot data"""
+    for entry in iter_journal_entries(save_name):
+        data.update(entry.get("player", {}))
+        worlds_data = data.setdefault("worlds", {})
+        for floor, rooms in entry.get("rooms", {}).items():
+            worlds_data.setdefault(floor, {}).update(rooms)
+    return data
+
+def read_json_worlds(save_name):
+    """(fields, worlds, old_format) of a JSON save, built room by room with the journal replayed.
+
+    Unlike read_json_save this never holds the parsed document and the rebuilt
+    world at the same time. Saves in the old single-floor format come back as
+    floor 0 with old_format set.
+    """
+    from save_stream import iter_save_document
+    data = {}
+    worlds = {}
+    old_format = False
+
+    with open(get_save_file_path(save_name), "r") as f:
+        for item in iter_save_document(f):
+            if item[0] == "field":
+                data[item[1]] = item[2]
+            elif item[0] == "floor":
+                old_format = old_format or item[1] is None
+                worlds.setdefault(0 if item[1] is None else int(item[1]), {})
+            else:
+                _, floor, position, room = item
+                x, y = map(int, position.split(","))
+                worlds.setdefault(0 if floor is None else int(floor), {})[(x, y)] = (
+                    compact_room(room) if COMPACT_ROOMS else room)
+
+    apply_journal(save_name, data, worlds)
+    return data, worlds, old_format
+
+def read_binary_worlds(save_name):
+    """(fields, worlds) of a binary save with the journal replayed"""
+    from save_binary import read_binary_save
+    with open(get_binary_file_path(save_name), "rb") as f:
+        data, worlds = read_binary_save(f)
+    if COMPACT_ROOMS:
+        for rooms in worlds.values():
+            for pos, room in rooms.items():
+                rooms[pos] = compact_room(room)
+    apply_journal(save_name, data, worlds)
+    return data, worlds
+
+def read_journal(save_name, data):
+    """Replay a save's journal fields onto data; returns the journal's rooms as {floor: {(x, y): room}}"""
+    journal = {}
+    for entry in iter_journal_entries(save_name):
+        data.update(entry.get("player", {}))
+        for floor, rooms in entry.get("rooms", {}).items():
+            floor_rooms = journal.setdefault(int(floor), {})
+            for position, room in rooms.items():
+                x, y = map(int, position.split(","))
+                floor_rooms[(x, y)] = compact_room(room) if COMPACT_ROOMS else room
+    return journal
+
+def apply_journal(save_name, data, worlds):
+    """Replay a save's journal onto fields and {floor: {(x, y): room}} that were read from its base file"""
+    for floor, rooms in read_journal(save_name, data).items():
+        worlds.setdefault(floor, {}).update(rooms)
 
 def load_game(save_name=None):
     """Load a game from a specific save file"""
@@ -262,16 +944,15 @@ def load_game(save_name=None):
         save_files = list_save_files()
         
         if not save_files:
-            print("No saved games found.")
+            say("No saved games found.")
             return None
         
-        print("\nAvailable save files:")
-        for i, (file_name, display_name) in enumerate(save_files, 1):
-            print(f"  {i}. {display_name}")
+        say("\nAvailable save files:")
+        print_save_list(save_files)
         
         while True:
             try:
-                choice = input(f"\nSelect save file (1-{len(save_files)}) or type name: ").strip()
+                choice = ask(f"\nSelect save file (1-{len(save_files)}) or type name: ").strip()
                 
                 # Check if it's a number choice
                 if choice.isdigit():
@@ -280,7 +961,7 @@ def load_game(save_name=None):
                         save_name = save_files[choice_num - 1][0]
                         break
                     else:
-                        print(f"Please enter a number between 1 and {len(save_files)}")
+                        say(f"Please enter a number between 1 and {len(save_files)}")
                 else:
                     # Check if it's a valid save name
                     valid_names = [name for name, _ in save_files]
@@ -291,44 +972,88 @@ def load_game(save_name=None):
                         save_name = "default"
                         break
                     else:
-                        print(f"Save file '{choice}' not found. Available saves:")
+                        say(f"Save file '{choice}' not found. Available saves:")
                         for name, display_name in save_files:
-                            print(f"  - {display_name}")
+                            say(f"  - {display_name}")
             except ValueError:
-                print("Please enter a valid number or save name.")
-    
-    save_path = get_save_file_path(save_name)
+                say("Please enter a valid number or save name.")
     
-    if not os.path.exists(save_path):
-        print(f"Save file '{save_name}' not found.")
-        return None
-
-    try:
-        with open(save_path, "r") as f:
-            data = json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        print(f"Error reading save file '{save_name}'. File may be corrupted.")
-        return None
-
-    # Handle old save format
-    if "world" in data:
-        # Convert old single-floor format to new multi-floor format
-        worlds = {}
-        worlds[0] = {}
-        for key, value in data["world"].items():
-            x, y = map(int, key.split(","))
-            worlds[0][(x, y)] = value
+    wait_for_saves()
+    import world_generation
+    from constants import CHUNK_STORE_ENABLED
+    manifest_chunks = None
+    deferred_floors = []
+    database = open_save_database(save_name)
+    if database is not None:
+        # SQLite saves: read only the player table; rooms are read when first visited
+        from save_database import load_worlds
+        player_state = database.read_player_state()
+        data = {field: json.loads(value) for field, value in player_state.items()}
+        world_seed = data.get("world_seed")
+        world_generation.set_world_seed(world_seed)
+        worlds = load_worlds(database, world_seed)
         player_floor = data.get("player_floor", 1)
     else:
-        # New multi-floor format
-        worlds = {}
-        for floor_str, world_data in data["worlds"].items():
-            floor = int(floor_str)
-            worlds[floor] = {}
-            for key, value in world_data.items():
-                x, y = map(int, key.split(","))
-                worlds[floor][(x, y)] = value
+        if not save_exists(save_name):
+            say(f"Save file '{save_name}' not found.")
+            return None
+
+        # The file extension picks the codec. JSON rooms are streamed out of the
+        # file; the old single-floor format becomes floor 0
+        try:
+            if os.path.exists(get_manifest_file_path(save_name)):
+                data, floors, read_floor, manifest_chunks, journal_rooms = read_manifest_floors(save_name)
+                # Instant resume: read the player's floor now and the others in the background
+                if INSTANT_RESUME and CHUNK_STORE_ENABLED and save_schema_version(data) >= SAVE_SCHEMA_VERSION:
+                    deferred_floors = floors[1:]
+                worlds = {floor: read_floor(floor) for floor in floors if floor not in deferred_floors}
+                old_format = False
+            elif os.path.exists(get_binary_file_path(save_name)):
+                data, worlds = read_binary_worlds(save_name)
+                old_format = False
+            else:
+                data, worlds, old_format = read_json_worlds(save_name)
+        except (json.JSONDecodeError, SaveFormatError, FileNotFoundError, KeyError, ValueError):
+            say(f"Error reading save file '{save_name}'. File may be corrupted.")
+            return None
+        if old_format:
+            data.setdefault("player_floor", 1)
         player_floor = data["player_floor"]
+        
+        # Seeded worlds only store changed rooms - everything else is regenerated
+        world_seed = data.get("world_seed")
+        world_generation.set_world_seed(world_seed)
+        if world_seed is not None:
+            worlds = {floor: world_generation.SeededFloor(world_seed, floor, rooms) for floor, rooms in worlds.items()}
+
+        def read_seeded_floor(floor):
+            rooms = read_floor(floor)
+            return world_generation.SeededFloor(world_seed, floor, rooms) if world_seed is not None else rooms
+    
+    # Saves from older versions are migrated once and written back
+    if save_schema_version(data) < SAVE_SCHEMA_VERSION:
+        manifest_chunks = None
+        migrate_save(data, worlds)
+        if database is not None:
+            player_state = write_migrated_database(database, data, worlds)
+        else:
+            write_save_data(save_name, data, worlds)
+        say(f"Save '{save_name}' was updated to the current save format.")
+    
+    # Keep large worlds in chunks so only recently used parts stay in memory
+    if CHUNK_STORE_ENABLED:
+        from chunk_store import ChunkedWorlds, FloorLoader
+        worlds = ChunkedWorlds.from_worlds(get_chunk_file_path(save_name), worlds)
+        if deferred_floors:
+            worlds.defer(FloorLoader(read_seeded_floor, deferred_floors))
+    
+    if database is not None:
+        # The database already holds this world - later saves only upsert what changes
+        get_save_tracker(save_name).adopt(worlds, player_state)
+    elif manifest_chunks is not None:
+        # The object store already holds these chunks - later saves only store the ones that change
+        get_chunk_index().adopt(worlds, manifest_chunks,
+                                {(floor,) + chunk_coords(x, y) for floor, x, y in journal_rooms})
     
     player_x = data["player_x"]
     player_y = data["player_y"]
@@ -347,35 +1072,12 @@ def load_game(save_name=None):
     mana_potions = get_save_field_with_default(data, "mana_potions")
     waypoint_scrolls = get_save_field_with_default(data, "waypoint_scrolls")
     
-    # Handle old mysterious_key format
-    if "mysterious_key" in data and data["mysterious_key"]:
-        mysterious_keys = {1: True}  # Old saves get Floor 1 key
-    else:
-        mysterious_keys = get_save_field_with_default(data, "mysterious_keys")
-    
+    mysterious_keys = get_save_field_with_default(data, "mysterious_keys")
     golden_keys = get_save_field_with_default(data, "golden_keys")
     unlocked_floors = set(get_save_field_with_default(data, "unlocked_floors"))
-    
-    # Handle old waypoint format
-    old_waypoints = get_save_field_with_default(data, "waypoints")
-    if old_waypoints and isinstance(next(iter(old_waypoints.values())), tuple) and len(next(iter(old_waypoints.values()))) == 2:
-        # Convert old (x, y) format to new (floor, x, y) format
-        waypoints = {}
-        for name, (x, y) in old_waypoints.items():
-            waypoints[name] = (0, x, y)
-    else:
-        waypoints = old_waypoints
-    
+    waypoints = get_save_field_with_default(data, "waypoints")
     discovered_enemies = set(get_save_field_with_default(data, "discovered_enemies"))
-    
-    # Handle floors_visited conversion - ensure it's always a set
-    floors_visited_data = get_save_field_with_default(data, "floors_visited")
-    if isinstance(floors_visited_data, int):
-        floors_visited = set([floors_visited_data]) if floors_visited_data > 0 else set()
-    elif isinstance(floors_visited_data, list):
-        floors_visited = set(floors_visited_data)
-    else:
-        floors_visited = set()
+    floors_visited = set(get_save_field_with_default(data, "floors_visited") or ())
     learned_spells = get_save_field_with_default(data, "learned_spells")
     spell_scrolls = get_save_field_with_default(data, "spell_scrolls")
     using_fists = get_save_field_with_default(data, "using_fists")
@@ -390,27 +1092,8 @@ def load_game(save_name=None):
     materials_inventory = get_save_field_with_default(data, "materials_inventory")
     armor_broken = get_save_field_with_default(data, "armor_broken")
     
-    # Ensure all weapons and armor have max_durability fields for backward compatibility
-    inventory = ensure_weapon_max_durability(inventory)
-    armor_inventory = ensure_armor_max_durability(armor_inventory)
-    if equipped_armor:
-        equipped_armor = ensure_armor_max_durability([equipped_armor])[0]
-    
-    # Ensure all weapons and armor in the world have max_durability fields
-    for floor in worlds.values():
-        for room in floor.values():
-            if "weapons" in room:
-                room["weapons"] = ensure_weapon_max_durability(room["weapons"])
-            if "armors" in room:
-                room["armors"] = ensure_armor_max_durability(room["armors"])
-            if "shop" in room and room["shop"]:
-                if "items" in room["shop"]:
-                    room["shop"]["items"] = ensure_weapon_max_durability(room["shop"]["items"])
-                if "armor" in room["shop"] and room["shop"]["armor"]:
-                    room["shop"]["armor"] = ensure_armor_max_durability([room["shop"]["armor"]])[0]
-    
     save_display_name = data.get("save_name", save_name)
-    print(f"Game loaded from '{save_display_name}'!")
+    say(f"Game loaded from '{save_display_name}'!")
     
     return {
         "worlds": worlds,
@@ -439,6 +1122,8 @@ def load_game(save_name=None):
         "learned_spells": learned_spells,
         "spell_scrolls": spell_scrolls,
         "using_fists": using_fists,
+        "status_effects": get_save_field_with_default(data, "status_effects"),
+        "effect_turn": get_save_field_with_default(data, "effect_turn"),
         "discovered_uniques": discovered_uniques,
         "player_level": get_save_field_with_default(data, "player_level"),
         "player_xp": get_save_field_with_default(data, "player_xp"),
@@ -460,49 +1145,57 @@ def load_game(save_name=None):
 
 def delete_save(save_name):
     """Delete a specific save file"""
-    save_path = get_save_file_path(save_name)
+    wait_for_saves()
     
-    if not os.path.exists(save_path):
-        print(f"Save file '{save_name}' not found.")
+    if not save_exists(save_name):
+        say(f"Save file '{save_name}' not found.")
         return False
     
     try:
-        os.remove(save_path)
-        print(f"Save file '{save_name}' deleted!")
+        remove_save_files(save_name)
+        if os.path.exists(get_metadata_file_path(save_name)):
+            os.remove(get_metadata_file_path(save_name))
+        discard_journal(save_name)
+        # Chunks only this slot used go with it, so the index can't trust its digests any more
+        get_chunk_index().forget()
+        collect_save_garbage()
+        say(f"Save file '{save_name}' deleted!")
         return True
     except OSError as e:
-        print(f"Error deleting save file: {e}")
+        say(f"Error deleting save file: {e}")
         return False
 
 def show_save_info(save_name):
     """Show information about a specific save file"""
-    save_path = get_save_file_path(save_name)
+    wait_for_saves()
     
-    if not os.path.exists(save_path):
-        print(f"Save file '{save_name}' not found.")
+    if not save_exists(save_name):
+        say(f"Save file '{save_name}' not found.")
         return
     
-    try:
-        with open(save_path, "r") as f:
-            data = json.load(f)
-        
-        print(f"\n=== SAVE INFO: {data.get('save_name', save_name)} ===")
-        print(f"Player Level: {data.get('player_level', 'Unknown')}")
-        print(f"Skill Points: {data.get('player_skill_points', 'Unknown')}")
-        print(f"Floor: {data.get('player_floor', 'Unknown')}")
-        print(f"Position: ({data.get('player_x', 'Unknown')}, {data.get('player_y', 'Unknown')})")
-        print(f"HP: {data.get('player_hp', 'Unknown')}/{data.get('player_max_hp', 'Unknown')}")
-        print(f"Stamina: {data.get('player_stamina', 'Unknown')}/{data.get('player_max_stamina', 'Unknown')}")
-        print(f"Mana: {data.get('player_mana', 'Unknown')}/{data.get('player_max_mana', 'Unknown')}")
-        print(f"Money: {data.get('player_money', 'Unknown')}")
-        print(f"Unlocked Floors: {len(data.get('unlocked_floors', []))}")
-        print(f"Discovered Enemies: {len(data.get('discovered_enemies', []))}")
-        print(f"Learned Spells: {len(data.get('learned_spells', []))}")
-        print(f"Weapons: {len(data.get('inventory', []))}")
-        print(f"Armor: {len(data.get('armor_inventory', []))}")
-        
-    except (json.JSONDecodeError, FileNotFoundError):
-        print(f"Error reading save file '{save_name}'. File may be corrupted.")
+    # Only the metadata sidecar is read, not the save itself
+    data = read_save_metadata(save_name)
+    if data is None:
+        say(f"Error reading save file '{save_name}'. File may be corrupted.")
+        return
+    counts = data.get("counts", {})
+    
+    say(f"\n=== SAVE INFO: {data.get('save_name') or save_name} ===")
+    say(f"Player Level: {data.get('player_level', 'Unknown')}")
+    say(f"Skill Points: {data.get('player_skill_points', 'Unknown')}")
+    say(f"Floor: {data.get('player_floor', 'Unknown')}")
+    say(f"Position: ({data.get('player_x', 'Unknown')}, {data.get('player_y', 'Unknown')})")
+    say(f"HP: {data.get('player_hp', 'Unknown')}/{data.get('player_max_hp', 'Unknown')}")
+    say(f"Stamina: {data.get('player_stamina', 'Unknown')}/{data.get('player_max_stamina', 'Unknown')}")
+    say(f"Mana: {data.get('player_mana', 'Unknown')}/{data.get('player_max_mana', 'Unknown')}")
+    say(f"Money: {data.get('player_money', 'Unknown')}")
+    say(f"Unlocked Floors: {counts.get('unlocked_floors', 0)}")
+    say(f"Discovered Enemies: {counts.get('discovered_enemies', 0)}")
+    say(f"Learned Spells: {counts.get('learned_spells', 0)}")
+    say(f"Weapons: {counts.get('inventory', 0)}")
+    say(f"Armor: {counts.get('armor_inventory', 0)}")
+    say(f"Saved Rooms: {data.get('room_count', 'Unknown')}")
+    say(f"Saved: {time.strftime('%Y-%m-%d %H:%M', time.localtime(data.get('saved_at') or 0))}")
 
 # Backward compatibility functions
 def save_game_old(worlds, inventory, armor_inventory, equipped_armor, player_floor, player_x, player_y,
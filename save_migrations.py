@@ -0,0 +1,124 @@
+"""
+Versioned save schema.
+
+Every save records the schema_version it was written with. Saves from older
+versions go through the migration steps they haven't had yet, in order, and
+are written back right away, so each step runs once per save. Saves that are
+already current skip this entirely - load_game no longer walks every room
+to patch up old formats on every load.
+
+To change the save format, add a step at the end of MIGRATIONS and it
+becomes the new SAVE_SCHEMA_VERSION.
+"""
+
+# --- Steps ---
+# A step gets the save's fields and its {floor: rooms} world and changes them in place.
+
+def migrate_player_fields(data, worlds):
+    """Old key, waypoint and floors_visited formats"""
+    # A single mysterious_key flag from before keys were per floor
+    if data.get("mysterious_key"):
+        data["mysterious_keys"] = {1: True}  # Old saves get Floor 1 key
+    data.pop("mysterious_key", None)
+
+    # Waypoints from before floors were numbered: (x, y) -> (floor 0, x, y)
+    waypoints = data.get("waypoints")
+    if waypoints:
+        first = next(iter(waypoints.values()))
+        if isinstance(first, (list, tuple)) and len(first) == 2:
+            data["waypoints"] = {name: (0, x, y) for name, (x, y) in waypoints.items()}
+
+    # floors_visited used to be a count
+    floors_visited = data.get("floors_visited")
+    if isinstance(floors_visited, int):
+        data["floors_visited"] = [floors_visited] if floors_visited > 0 else []
+
+def migrate_max_durability(data, worlds):
+    """Weapons and armor from before durability could be repaired have no max_durability"""
+    import world_generation
+    ensure_weapon_max_durability(data.get("inventory"))
+    ensure_armor_max_durability(data.get("armor_inventory"))
+    if data.get("equipped_armor"):
+        ensure_armor_max_durability([data["equipped_armor"]])
+    for world in worlds.values():
+        for _, room in world_generation.iter_saved_rooms(world):
+            ensure_room_max_durability(room)
+
+def migrate_status_effects(data, worlds):
+    """Enemies kept Burning/Poisoned as {"damage", "duration"} keys and Stunned as a turn count"""
+    import world_generation
+    turn = data.get("effect_turn", 0)
+    for world in worlds.values():
+        for _, room in world_generation.iter_saved_rooms(world):
+            enemies = room.get("enemy") or []
+            for enemy in enemies if isinstance(enemies, list) else [enemies]:
+                effects = []
+                for name in ("Burning", "Poisoned"):
+                    effect = enemy.pop(name, None)
+                    if effect:
+                        effects.append([name, effect["damage"], turn + effect["duration"] - 1])
+                stunned = enemy.pop("Stunned", 0)
+                if stunned:
+                    effects.append(["Stunned", 0, turn + stunned - 1])
+                if effects:
+                    enemy["effects"] = effects
+
+MIGRATIONS = [
+    (1, migrate_player_fields),
+    (2, migrate_max_durability),
+    (3, migrate_status_effects),
+]
+SAVE_SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def save_schema_version(data):
+    """The schema version a save was written with; saves from before versioning are 0"""
+    return data.get("schema_version", 0)
+
+def migrate_save(data, worlds):
+    """Run the steps a save is missing; returns the versions applied"""
+    applied = []
+    for version, step in MIGRATIONS:
+        if save_schema_version(data) < version:
+            step(data, worlds)
+            data["schema_version"] = version
+            applied.append(version)
+    return applied
+
+# --- Compatibility helpers ---
+
+def ensure_room_max_durability(room):
+    """Ensure the weapons and armor lying in a room or sold in its shop have max_durability fields"""
+    if "weapons" in room:
+        room["weapons"] = ensure_weapon_max_durability(room["weapons"])
+    if "armors" in room:
+        room["armors"] = ensure_armor_max_durability(room["armors"])
+    if "shop" in room and room["shop"]:
+        if "items" in room["shop"]:
+            room["shop"]["items"] = ensure_weapon_max_durability(room["shop"]["items"])
+        if "armor" in room["shop"] and room["shop"]["armor"]:
+            room["shop"]["armor"] = ensure_armor_max_durability([room["shop"]["armor"]])[0]
+    return room
+
+def ensure_weapon_max_durability(weapons):
+    """Ensure all weapons have max_durability field for backward compatibility"""
+    if not weapons:
+        return weapons
+
+    for weapon in weapons:
+        if "max_durability" not in weapon:
+            # Default: max_durability = current_durability + 5
+            weapon["max_durability"] = weapon.get("durability", 10) + 5
+
+    return weapons
+
+def ensure_armor_max_durability(armors):
+    """Ensure all armor pieces have max_durability field for backward compatibility"""
+    if not armors:
+        return armors
+
+    for armor in armors:
+        if "max_durability" not in armor:
+            # Default: max_durability = current_durability + 10
+            armor["max_durability"] = armor.get("durability", 10) + 10
+
+    return armors
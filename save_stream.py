@@ -0,0 +1,151 @@
+"""
+Streaming reader and writer for JSON saves.
+
+A JSON save is one object: the player fields followed by
+"worlds": {"floor": {"x,y": room, ...}, ...}. Building that as one dict and
+calling json.dump/json.load keeps the whole document in memory next to the
+world itself, so saving or loading a big world needs about twice its size.
+
+write_save_document() writes fields and rooms as they come from generators,
+and iter_save_document() parses a save a piece at a time, handing out each
+room as soon as it has been read. Either way only one room is held as text,
+so peak memory no longer grows with the size of the save file.
+"""
+
+import json
+
+_WHITESPACE = " \t\r\n"
+
+def write_save_document(f, fields, rooms, floors=()):
+    """Write a save from (name, JSON text) fields and ((floor, x, y), JSON text) rooms.
+
+    Rooms must come grouped by floor; floors lists floors to write even when
+    they have no rooms. Returns the number of rooms written.
+    """
+    f.write("{")
+    for name, encoded in fields:
+        f.write(f"{json.dumps(name)}: {encoded}, ")
+    f.write('"worlds": {')
+    count = write_floors(f, rooms, floors)
+    f.write("}}")
+    return count
+
+def write_floors(f, rooms, floors=()):
+    """Write '"floor": {"x,y": room, ...}, ...' from rooms grouped by floor; returns the room count"""
+    written = []
+    current = None
+    count = 0
+    for (floor, x, y), encoded in rooms:
+        floor = str(floor)
+        if floor != current:
+            if floor in written:
+                raise ValueError(f"rooms of floor {floor} are not grouped together")
+            if current is not None:
+                f.write("}, ")
+            f.write(f"{json.dumps(floor)}: {{")
+            written.append(floor)
+            current = floor
+        else:
+            f.write(", ")
+        f.write(f'"{x},{y}": {encoded}')
+        count += 1
+    if current is not None:
+        f.write("}")
+    for floor in map(str, floors):
+        if floor not in written:
+            f.write(f"{', ' if written else ''}{json.dumps(floor)}: {{}}")
+            written.append(floor)
+    return count
+
+class _StreamParser:
+    """Reads JSON values one at a time from a file, keeping only the unread part in memory"""
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        # json.load shares equal keys across a document; values decoded one at
+        # a time would each get their own copies without this
+        self.keys = {}
+        self.decoder = json.JSONDecoder(object_pairs_hook=self._shared_keys)
+
+    def _shared_keys(self, pairs):
+        keys = self.keys
+        return {keys.setdefault(key, key): value for key, value in pairs}
+
+    def _fill(self):
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """The next character that isn't whitespace, or "" at the end of the file"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(f"Expecting one of {chars!r}", self.buffer, self.pos)
+        self.pos += 1
+        return char
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number cut off at the end of the buffer also decodes, so
+                # only trust values that are followed by something
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+    def members(self):
+        """(key) of each member of the object that starts here; the caller reads each value"""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.expect(",}") == "}":
+                return
+
+def iter_save_document(f, chunk_size=1 << 16):
+    """Parse a save a piece at a time.
+
+    Yields ("field", name, value) for player fields, ("floor", floor) when a
+    floor starts and ("room", floor, "x,y", room) for each room. Rooms of the
+    old single-floor "world" format come with floor None.
+    """
+    parser = _StreamParser(f, chunk_size)
+    for key in parser.members():
+        if key == "worlds" and parser.peek() == "{":
+            for floor in parser.members():
+                yield "floor", floor
+                for position in parser.members():
+                    yield "room", floor, position, parser.value()
+        elif key == "world" and parser.peek() == "{":
+            yield "floor", None
+            for position in parser.members():
+                yield "room", None, position, parser.value()
+        else:
+            yield "field", key, parser.value()
+    if parser.peek():
+        raise json.JSONDecodeError("Extra data", parser.buffer, parser.pos)
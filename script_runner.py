@@ -0,0 +1,155 @@
+"""
+Batch mode: run a file of commands through the game engine at full speed.
+
+    python main.py --script commands.txt --seed 42 [--show-rooms]
+
+One command per line. Answers to the prompts a command asks (which item,
+yes/no, ...) follow it on the same line, separated by "|":
+
+    north
+    drop | 1
+    buy | 2 | yes
+
+Blank lines and lines starting with "#" are skipped. The run starts a new
+game in a world made from the seed, with the rng_streams seeded from it too,
+and stops at the end of the file or when
+the game ends. Output is written in large buffered chunks, the room banner is
+only shown with --show-rooms, and the movement auto-save is off (a script
+can still "save" explicitly). A summary of the final state and the timing is
+printed at the end.
+"""
+
+import random
+import sys
+import time
+
+OUTPUT_CHUNK_SIZE = 1 << 16  # Characters of output collected before each write
+
+def parse_script_line(line):
+    """(command, choices) of a script line, or None for blank lines and comments"""
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    command, *choices = (part.strip() for part in line.split("|"))
+    return command, choices
+
+def render_events(events):
+    """Terminal text of engine events"""
+    lines = []
+    for event in events:
+        if event.kind == "message":
+            lines.append(event.text)
+        elif event.kind == "prompt":
+            lines.append(f"{event.text}{event.answer}")
+        elif event.kind == "needs_input":
+            lines.append(f"{event.text}(the script gave no answer - command stopped)")
+    return lines
+
+class ChunkedWriter:
+    """Collects output lines and writes them in chunks of about OUTPUT_CHUNK_SIZE characters"""
+
+    def __init__(self, out, chunk_size=OUTPUT_CHUNK_SIZE):
+        self.out = out
+        self.chunk_size = chunk_size
+        self.lines = []
+        self.size = 0
+
+    def write_lines(self, lines):
+        for line in lines:
+            self.lines.append(line)
+            self.size += len(line) + 1
+        if self.size >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self.lines:
+            self.out.write("\n".join(self.lines) + "\n")
+            self.lines = []
+            self.size = 0
+        self.out.flush()
+
+def run_script(lines, seed=None, show_rooms=False, out=None):
+    """Run script lines in a new game; returns the summary dict that is printed at the end"""
+    turns = (parsed for parsed in map(parse_script_line, lines) if parsed is not None)
+    return run_turns(turns, seed, show_rooms=show_rooms, out=out, title="SCRIPT SUMMARY")
+
+def start_game(seed):
+    """Reset the state to a new game in the world of seed"""
+    import game_engine
+    import world_generation
+    from game_state import state
+    from rng_streams import streams
+    from status_effects import scheduler as effect_scheduler
+
+    random.seed(seed)
+    streams.reseed(seed)
+    world_generation.set_world_seed(seed)
+    state.reset()
+    effect_scheduler.clear()
+    game_engine.auto_save_rooms = 0
+
+def run_turns(turns, seed=None, show_rooms=False, echo=True, out=None, title="SCRIPT SUMMARY"):
+    """Run (command, choices) turns in a new game at full speed and write a summary.
+
+    With echo each command and what it printed is written too. Returns the
+    summary dict, which includes the fingerprint of the final state.
+    """
+    import world_generation
+    from game_engine import GameEngine
+    from game_io import EventRecorder, use_console
+    from game_state import state
+
+    out = out if out is not None else sys.stdout
+    writer = ChunkedWriter(out)
+    seed = seed if seed is not None else world_generation.new_world_seed()
+    start_game(seed)
+    engine = GameEngine()
+
+    counts = {"commands": 0, "unknown": 0, "needs_input": 0}
+    start = time.perf_counter()
+    for command, choices in turns:
+        if show_rooms:
+            recorder = EventRecorder()
+            with use_console(recorder):
+                engine.show_room()
+            writer.write_lines(render_events(recorder.events))
+        events = engine.step(command, choices)
+        counts["commands"] += 1
+        for event in events:
+            if event.kind == "unknown_command":
+                counts["unknown"] += 1
+            elif event.kind == "needs_input":
+                counts["needs_input"] += 1
+        if echo:
+            writer.write_lines([f"> {' | '.join([command, *choices])}", *render_events(events)])
+        if engine.over:
+            break
+    elapsed = time.perf_counter() - start
+
+    summary = {
+        "seed": seed,
+        **counts,
+        "seconds": elapsed,
+        "game_over": engine.over,
+        "floor": state.player_floor,
+        "position": (state.player_x, state.player_y),
+        "level": state.player_level,
+        "hp": state.player_hp,
+        "max_hp": state.player_max_hp,
+        "gold": state.player_money,
+        "enemies_defeated": state.enemies_defeated,
+        "fingerprint": state.fingerprint(),
+    }
+    rate = counts["commands"] / elapsed if elapsed > 0 else float("inf")
+    writer.write_lines([
+        "",
+        f"=== {title} ===",
+        f"Seed: {seed}",
+        f"Commands: {counts['commands']} ({counts['unknown']} unknown, {counts['needs_input']} stopped at a prompt)",
+        f"Time: {elapsed:.3f}s ({rate:,.0f} commands/sec)",
+        f"Final state: Floor {state.player_floor} ({state.player_x}, {state.player_y}), Level {state.player_level}, "
+        f"HP {state.player_hp}/{state.player_max_hp}, Gold {state.player_money}, "
+        f"Enemies defeated {state.enemies_defeated}" + (" - game over" if engine.over else ""),
+    ])
+    writer.flush()
+    return summary
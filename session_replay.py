@@ -0,0 +1,105 @@
+"""
+Record a game and replay it headlessly.
+
+    python main.py --record session.jsonl    # play a new game, recording it
+    python main.py --replay session.jsonl    # replay it at full speed
+
+A recording is the game seed plus every command and every answer typed at
+the prompts it asked, one JSON object per line:
+
+    {"recording": 1, "seed": 42}
+    {"command": "north", "choices": []}
+    {"command": "drop", "choices": ["1"]}
+    {"final": "<state fingerprint>", "turns": 2}
+
+Rooms are generated from the seed and the rolls made while playing come from
+the seeded rng_streams, so replaying the commands in a new game from the same
+seed ends in the same state. The final line stores the fingerprint of that
+state (GameState.fingerprint) and the replay checks it, which makes a folder
+of recordings a regression and performance corpus. Each turn is written and
+flushed as soon as it ends, so a recording cut short by a crash still replays
+up to that point; it just has no fingerprint to check.
+
+Games that load a save or use mod commands can't be replayed: the replay
+starts a new game and runs without mods.
+"""
+
+import json
+import sys
+
+RECORDING_VERSION = 1
+
+class SessionRecorder:
+    """Console wrapper that records the answers a command is given while passing everything through"""
+
+    def __init__(self, console, out, seed):
+        self.console = console
+        self.out = out
+        self.turns = 0
+        self.choices = []
+        self._write({"recording": RECORDING_VERSION, "seed": seed})
+
+    def _write(self, entry):
+        self.out.write(json.dumps(entry) + "\n")
+        self.out.flush()
+
+    def say(self, *args, **kwargs):
+        self.console.say(*args, **kwargs)
+
+    def ask(self, prompt=""):
+        answer = self.console.ask(prompt)
+        self.choices.append(answer)
+        return answer
+
+    def step(self, engine, command):
+        """Run command on engine through this console and record it"""
+        self.choices = []
+        try:
+            engine.step(command, console=self)
+        finally:
+            self._write({"command": command, "choices": self.choices})
+            self.turns += 1
+
+    def finish(self, fingerprint):
+        """End the recording with the fingerprint of the final state"""
+        self._write({"final": fingerprint, "turns": self.turns})
+
+def read_recording(lines):
+    """(seed, [(command, choices)], final fingerprint or None) of a recording"""
+    seed = final = None
+    turns = []
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        if number == 1:
+            if entry.get("recording") != RECORDING_VERSION:
+                raise ValueError(f"Not a version {RECORDING_VERSION} recording")
+            seed = entry["seed"]
+        elif "command" in entry:
+            turns.append((entry["command"], [str(choice) for choice in entry.get("choices", ())]))
+        elif "final" in entry:
+            final = entry["final"]
+    if seed is None:
+        raise ValueError("Empty recording")
+    return seed, turns, final
+
+def replay_session(lines, show_output=False, out=None):
+    """Replay a recording in a new game; returns the run summary plus "matches".
+
+    matches is True or False when the recording has a final fingerprint to
+    compare with, None when it was cut short.
+    """
+    from script_runner import run_turns
+
+    seed, turns, final = read_recording(lines)
+    summary = run_turns(turns, seed, show_rooms=show_output, echo=show_output, out=out, title="REPLAY SUMMARY")
+    summary["matches"] = None if final is None else summary["fingerprint"] == final
+    stream = out if out is not None else sys.stdout
+    if final is None:
+        stream.write("Recording has no final state (cut short) - nothing to compare\n")
+    elif summary["matches"]:
+        stream.write("Final state matches the recording\n")
+    else:
+        stream.write(f"Final state DIFFERS from the recording ({summary['fingerprint']} != {final})\n")
+    return summary
@@ -0,0 +1,153 @@
+"""
+Status effects: Burning, Poisoned, Stunned and whatever mod spells add.
+
+Effects are registered from the spells that inflict them - constants.spells
+here, mod spells as the mod loader reads them. A spell with "effect_damage"
+registers an effect that hurts every turn; one without it registers an
+effect that makes its victim skip its turn (a spell can say otherwise with
+"effect_skips_turn").
+
+Every entity - an enemy, each member of a swarm, the player - keeps its
+effects in one compact list of [name, damage, expires] entries, in
+enemy["effects"] and state.status_effects:
+
+    from status_effects import scheduler, effects_of
+    scheduler.apply(effects_of(enemy), "Burning", enemy["name"])
+    enemy["hp"] -= scheduler.tick(effects_of(enemy), enemy["name"])
+    scheduler.end_turn()
+
+expires is the last turn of the effect clock (state.effect_turn) the effect
+is active on. The clock advances once per combat turn and once per room
+moved. Applying an effect also pushes it on a min-heap keyed by expires, so
+ending a turn pops just the effects that ran out, on any entity, instead of
+walking every enemy in the world; ticking an entity only touches its own
+active effects.
+
+Lists that come back from a save or a reloaded chunk are not in the heap.
+Their entries are dropped the next time the entity ticks, once their last
+turn has passed.
+"""
+
+import heapq
+from itertools import count
+
+from constants import spells
+from game_io import say
+from game_state import state
+
+class EffectType:
+    """What an effect does each turn it is active"""
+
+    __slots__ = ("name", "damage", "duration", "skips_turn", "noun")
+
+    def __init__(self, name, damage=0, duration=1, skips_turn=False, noun=None):
+        self.name = name
+        self.damage = damage          # Per turn
+        self.duration = duration      # Turns, including the one it is inflicted on
+        self.skips_turn = skips_turn
+        self.noun = noun or name.lower()  # "The Goblin takes 3 <noun> damage!"
+
+# {name: EffectType}
+EFFECTS = {}
+
+def register_effect(name, damage=0, duration=1, skips_turn=False, noun=None):
+    EFFECTS[name] = EffectType(name, damage, duration, skips_turn, noun)
+    return EFFECTS[name]
+
+def register_spell_effects(spell_book):
+    """Register the effect of every spell in {name: spell} that inflicts one"""
+    for spell in spell_book.values():
+        name = spell.get("effect")
+        if name:
+            register_effect(name, spell.get("effect_damage", 0), spell.get("effect_duration", 1),
+                            spell.get("effect_skips_turn", "effect_damage" not in spell), spell.get("effect_noun"))
+
+def effects_of(entity):
+    """The effects list of an enemy (dict or models.Enemy), created on first use"""
+    return entity.setdefault("effects", [])
+
+def _subject(who):
+    """("The Goblin", "is", "takes") - or the player's ("You", "are", "take") when who is None"""
+    return ("You", "are", "take") if who is None else (f"The {who}", "is", "takes")
+
+class EffectScheduler:
+    """Expiry min-heap over the effects lists of every entity"""
+
+    def __init__(self):
+        self._heap = []      # (expires, order, effects list, name, who)
+        self._order = count()
+
+    @property
+    def turn(self):
+        return state.effect_turn
+
+    def apply(self, effects, name, who=None, damage=None, duration=None):
+        """Inflict effect name on an entity (who is its name, None for the player), replacing one it already has"""
+        kind = EFFECTS[name]
+        entry = [name, kind.damage if damage is None else damage,
+                 self.turn + (kind.duration if duration is None else duration) - 1]
+        effects[:] = [effect for effect in effects if effect[0] != name]
+        effects.append(entry)
+        heapq.heappush(self._heap, (entry[2], next(self._order), effects, name, who))
+        subject, verb, _ = _subject(who)
+        say(f"{subject} {verb} {name}!")
+        return entry
+
+    def tick(self, effects, who=None):
+        """Damage the entity's active effects deal this turn (saying each), dropping any that ran out unseen"""
+        turn = self.turn
+        if any(expires < turn for _, _, expires in effects):
+            effects[:] = [effect for effect in effects if effect[2] >= turn]
+        subject, _, verb = _subject(who)
+        total = 0
+        for name, damage, _ in effects:
+            if damage:
+                kind = EFFECTS.get(name)
+                say(f"{subject} {verb} {damage} {kind.noun if kind else name.lower()} damage!")
+                total += damage
+        return total
+
+    def skips_turn(self, effects):
+        """Name of an active effect that makes the entity skip its turn, or None"""
+        turn = self.turn
+        for name, _, expires in effects:
+            kind = EFFECTS.get(name)
+            if kind and kind.skips_turn and expires >= turn:
+                return name
+        return None
+
+    def remaining(self, effects):
+        """[(name, damage per turn, turns left)] of the active effects, counting the next turn"""
+        turn = self.turn
+        return [(name, damage, expires - turn + 1) for name, damage, expires in effects if expires >= turn]
+
+    def end_turn(self, shown=()):
+        """Expire the effects whose last turn this was and advance the clock.
+
+        Expiring effects on the lists in shown (the entities in view) are announced.
+        """
+        turn = self.turn
+        heap = self._heap
+        while heap and heap[0][0] <= turn:
+            expires, _, effects, name, who = heapq.heappop(heap)
+            # An effect that was re-applied since has a later entry of its own
+            for i, effect in enumerate(effects):
+                if effect[0] == name and effect[2] == expires:
+                    del effects[i]
+                    if any(effects is seen for seen in shown):
+                        subject, verb, _ = _subject(who)
+                        say(f"{subject} {verb} no longer {name.lower()}.")
+                    break
+        state.effect_turn = turn + 1
+
+    def clear(self):
+        """Forget every scheduled expiry (a new game, or one being loaded)"""
+        self._heap.clear()
+
+    def __len__(self):
+        return len(self._heap)
+
+# The game's effect scheduler
+scheduler = EffectScheduler()
+
+register_spell_effects(spells)
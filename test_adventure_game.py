@@ -1124,6 +1124,1115 @@ class TestAdventureGame(unittest.TestCase):
         # Test that the discovery system works across different coordinates
         self.assertTrue(is_unique_discovered("wanderers_cloak"), "Discovery should persist across different checks")
 
+    def test_seeded_world_generation(self):
+        """Test that seeded worlds regenerate pristine rooms and only keep changed ones"""
+        import world_generation
+        from world_generation import SeededFloor, generate_seeded_room
+        
+        # The same seed always produces the same room, whatever order rooms are visited in
+        first = generate_seeded_room(1234, 1, 7, -3)
+        generate_seeded_room(1234, 1, 2, 2)
+        self.assertEqual(generate_seeded_room(1234, 1, 7, -3), first)
+        
+        floor = SeededFloor(1234, 1)
+        floor.get_room(1, 0)["description"] = "A room the player changed."
+        for x in range(2, SeededFloor.LIVE_ROOMS + 10):
+            floor.get_room(x, 0)
+        
+        # Unchanged rooms were dropped from memory, the changed one was kept
+        self.assertEqual(dict(floor.modified).keys(), {(1, 0)})
+        self.assertLessEqual(len(floor), SeededFloor.LIVE_ROOMS + 1)
+        self.assertEqual(floor.get_room(1, 0)["description"], "A room the player changed.")
+        self.assertEqual(floor.get_room(5, 0), generate_seeded_room(1234, 1, 5, 0))
+        
+        # Saves only contain changed rooms and restore the seed
+        old_seed = world_generation.world_seed
+        with tempfile.TemporaryDirectory() as save_dir, patch('save_load.SAVE_DIR', save_dir), \
+                patch('save_load.SAVE_BACKEND', "json"), patch('builtins.print'):
+            try:
+                world_generation.set_world_seed(1234)
+                save_game("seeded", {1: floor}, [], [], None, 1, 0, 0, 50, 50, 20, 20, 20, 20,
+                          0, 0, 0, 0, {}, 0, set(), {}, 0, set(), [], {}, False)
+                with open(os.path.join(save_dir, "seeded.json")) as f:
+                    self.assertEqual(list(json.load(f)["worlds"]["1"].keys()), ["1,0"])
+                
+                world_generation.set_world_seed(None)
+                loaded = load_game("seeded")
+                self.assertEqual(world_generation.world_seed, 1234)
+                loaded_floor = loaded["worlds"][1]
+                self.assertIsInstance(loaded_floor, SeededFloor)
+                self.assertEqual(loaded_floor.get_room(1, 0)["description"], "A room the player changed.")
+                self.assertEqual(loaded_floor.get_room(9, 9), generate_seeded_room(1234, 1, 9, 9))
+            finally:
+                world_generation.set_world_seed(old_seed)
+
+    def test_chunk_store_eviction(self):
+        """Test that chunked worlds spill cold chunks to disk and page them back in"""
+        from chunk_store import ChunkStore, ChunkedWorlds
+        
+        with tempfile.TemporaryDirectory() as save_dir:
+            store = ChunkStore(os.path.join(save_dir, "test.chunks"), chunk_size=4, max_hot_chunks=2)
+            chunked = ChunkedWorlds(store)
+            try:
+                # Walk east through five chunks; only two may stay in memory
+                for x in range(20):
+                    room = get_room(1, x, 0, chunked, [])
+                    room["visited_order"] = x
+                
+                stats = chunked.get_stats()
+                self.assertEqual(stats["hot_chunks"], 2)
+                self.assertEqual(stats["evictions"], 3)
+                
+                # Going back pages the cold chunk in with its changes intact
+                misses_before = stats["misses"]
+                self.assertEqual(get_room(1, 1, 0, chunked, [])["visited_order"], 1)
+                self.assertEqual(chunked.get_stats()["misses"], misses_before + 1)
+                self.assertGreater(chunked.get_stats()["hits"], 0)
+                
+                # Iterating a floor sees hot and cold rooms alike
+                self.assertEqual(sorted(x for (x, y) in chunked[1].keys()), list(range(20)))
+                self.assertEqual(len(chunked[1]), 20)
+            finally:
+                chunked.close()
+            self.assertEqual(os.listdir(save_dir), [])
+
+    def test_seeded_chunk_store_eviction(self):
+        """Test that the changed rooms of a default seeded world are chunked and spilled"""
+        import world_generation
+        from chunk_store import ChunkStore, ChunkedWorlds
+        from constants import CHUNK_SIZE, MAX_HOT_CHUNKS, WORLD_SEED_MODE
+        
+        self.assertTrue(WORLD_SEED_MODE)
+        old_seed = world_generation.world_seed
+        with tempfile.TemporaryDirectory() as save_dir:
+            chunked = ChunkedWorlds(ChunkStore(os.path.join(save_dir, "test.chunks")))
+            try:
+                world_generation.set_world_seed(4321)
+                # Change one room in each of more chunks than may stay in memory
+                chunk_count = MAX_HOT_CHUNKS + world_generation.SeededFloor.LIVE_ROOMS + 8
+                for i in range(chunk_count):
+                    get_room(1, i * CHUNK_SIZE, 0, chunked, [])["description"] = f"Changed room {i}."
+                
+                stats = chunked.get_stats()
+                self.assertEqual(stats["hot_chunks"], MAX_HOT_CHUNKS)
+                self.assertEqual(stats["evictions"], 8)
+                
+                # A spilled room comes back with its change intact
+                self.assertEqual(get_room(1, 0, 0, chunked, [])["description"], "Changed room 0.")
+                self.assertEqual(len(list(chunked[1].changed_items())), chunk_count)
+            finally:
+                chunked.close()
+                world_generation.set_world_seed(old_seed)
+            self.assertEqual(os.listdir(save_dir), [])
+
+    def test_room_prefetching(self):
+        """Test that prefetched rooms are identical to rooms generated on demand"""
+        import world_generation
+        from prefetch import RoomPrefetcher
+        
+        old_seed = world_generation.world_seed
+        prefetcher = RoomPrefetcher(radius=2)
+        try:
+            world_generation.set_world_seed(99)
+            prefetched_worlds = {}
+            get_room(1, 0, 0, prefetched_worlds, [])
+            prefetcher.schedule(1, 0, 0, prefetched_worlds)
+            self.assertTrue(prefetcher.wait(timeout=10))
+            
+            # Entering a staged room promotes it instead of generating it again
+            self.assertTrue(prefetcher.promote(1, 2, 0, prefetched_worlds))
+            self.assertFalse(prefetcher.promote(1, 5, 5, prefetched_worlds))
+            prefetched_room = get_room(1, 2, 0, prefetched_worlds, [])
+            
+            on_demand_room = get_room(1, 2, 0, {}, [])
+            self.assertEqual(prefetched_room, on_demand_room)
+            self.assertEqual(prefetcher.promoted, 1)
+        finally:
+            prefetcher.stop()
+            world_generation.set_world_seed(old_seed)
+        
+        # Without a world seed prefetching stays off so the global random sequence is untouched
+        legacy = RoomPrefetcher(radius=2)
+        legacy.schedule(1, 0, 0, {})
+        self.assertFalse(legacy.promote(1, 1, 0, {}))
+        legacy.stop()
+
+    def test_bulk_chunk_generation(self):
+        """Test that vectorized chunks are deterministic and keep the room type odds"""
+        import world_generation
+        from bulk_generation import generate_chunk, numpy_available
+        if not numpy_available():
+            self.skipTest("NumPy not installed")
+
+        chunk = generate_chunk(1, 0, 0, size=16, seed=5)
+        self.assertEqual(len(chunk), 256)
+        self.assertEqual(chunk[(0, 0)], world_generation.create_start_room())
+        self.assertIs(type(chunk[(1, 1)]), type(world_generation.generate_room(1, 1, 1, [])))
+        self.assertEqual(chunk, generate_chunk(1, 0, 0, size=16, seed=5))
+        self.assertNotEqual(chunk, generate_chunk(1, 0, 0, size=16, seed=6))
+
+        counts = {"stairwell": 0, "shop": 0, "chest": 0}
+        total = 0
+        for cx in range(10):
+            for room in generate_chunk(2, cx, 3, size=32, seed=5).values():
+                total += 1
+                if room["type"] in counts:
+                    counts[room["type"]] += 1
+                self.assertIn("description", room)
+        # Same cascade as create_room: 1/25 stairwell, then 1/25 key door, 1/15 chest, 10% shop
+        self.assertAlmostEqual(counts["stairwell"] / total, 0.04, delta=0.01)
+        self.assertAlmostEqual(counts["chest"] / total, 0.96 * 0.96 / 15, delta=0.01)
+        self.assertAlmostEqual(counts["shop"] / total, 0.96 * 0.96 * 14 / 15 * 0.1, delta=0.01)
+
+    def test_compact_room_records(self):
+        """Test that __slots__ rooms, enemies and items behave like the dicts they replace"""
+        import pickle
+        from models import Room, Enemy, Weapon, compact_room, to_plain
+
+        room_dict = {
+            "description": "A test room",
+            "type": "normal",
+            "enemy": {"name": "Goblin", "hp": 10, "base_attack": 5},
+            "weapons": [{"name": "Sword", "damage": 8, "durability": 10}],
+            "armors": [],
+            "shop": None
+        }
+        room = compact_room(room_dict)
+        self.assertIsInstance(room, Room)
+        self.assertIsInstance(room["enemy"], Enemy)
+        self.assertIsInstance(room["weapons"][0], Weapon)
+        self.assertEqual(room, room_dict)
+        self.assertEqual(room.enemy.hp, 10)
+        self.assertNotIn("chest", room)
+        self.assertIsNone(room.get("chest"))
+
+        # Status effects and other unknown keys live beside the slots
+        enemy = room["enemy"]
+        enemy["Burning"] = {"turns": 3}
+        self.assertIn("Burning", enemy)
+        del enemy["Burning"]
+        self.assertNotIn("Burning", enemy)
+        self.assertEqual(enemy.pop("Stunned", None), None)
+
+        # Empty item lists materialize on use and stay attached to the room
+        room["armors"].append({"name": "Iron Mail", "defense": 3})
+        self.assertEqual(room["armors"][0]["defense"], 3)
+        taken = room["weapons"].pop(0)
+        self.assertEqual(taken["name"], "Sword")
+        self.assertEqual(room["weapons"], [])
+
+        # JSON saves, chunk file pickles and handlers all see plain values
+        self.assertEqual(json.loads(json.dumps(room, default=to_plain))["armors"][0]["name"], "Iron Mail")
+        self.assertEqual(pickle.loads(pickle.dumps(room)), room)
+        with patch('builtins.print'):
+            handle_attack(room, [], 20, None, 50, set(), {}, 0, 0, [], spells, False)
+        self.assertLess(room["enemy"]["hp"], 10)
+
+    def test_journaled_auto_save(self):
+        """Test that auto-saves append changes to a journal that load_game replays"""
+        import world_generation
+        from save_load import auto_save_game, get_journal_file_path, discard_journal, wait_for_saves
+
+        old_seed = world_generation.world_seed
+        world = {1: {}}
+        with tempfile.TemporaryDirectory() as save_dir, patch('save_load.SAVE_DIR', save_dir), \
+                patch('save_load.SAVE_BACKEND', "json"), patch('builtins.print'):
+            try:
+                world_generation.set_world_seed(None)
+                for x in range(5):
+                    get_room(1, x, 0, world, [])
+
+                def auto_save(player_x, player_money):
+                    auto_save_game(world, [], [], None, 1, player_x, 0, 50, 50, 20, 20, 20, 20,
+                                   player_money, 0, 0, 0, {}, 0, set(), {}, 0, set(), [], {}, False,
+                                   player_skill_points=2)
+                    self.assertTrue(wait_for_saves(timeout=10))
+
+                # The first auto-save writes a full base snapshot
+                auto_save(4, 10)
+                base_path = os.path.join(save_dir, "auto_save.json")
+                with open(base_path) as f:
+                    base = f.read()
+                self.assertFalse(os.path.exists(get_journal_file_path("auto_save")))
+
+                # Later auto-saves only append the changed fields and touched rooms
+                get_room(1, 2, 0, world, [])["description"] = "A room the player changed."
+                auto_save(2, 25)
+                with open(base_path) as f:
+                    self.assertEqual(f.read(), base)
+                with open(get_journal_file_path("auto_save")) as f:
+                    entries = [json.loads(line) for line in f]
+                self.assertEqual(len(entries), 1)
+                self.assertEqual(set(entries[0]["player"]), {"player_x", "player_money"})
+                self.assertEqual(list(entries[0]["rooms"]["1"]), ["2,0"])
+
+                # A torn final line is ignored; the rest of the journal is replayed
+                with open(get_journal_file_path("auto_save"), "a") as f:
+                    f.write('{"player": {"player_mon')
+                loaded = load_game("auto_save")
+                self.assertEqual(loaded["player_money"], 25)
+                self.assertEqual(loaded["player_x"], 2)
+                self.assertEqual(loaded["player_skill_points"], 2)
+                self.assertEqual(loaded["worlds"][1][(2, 0)]["description"], "A room the player changed.")
+                self.assertEqual(len(loaded["worlds"][1]), 5)
+            finally:
+                discard_journal("auto_save")
+                world_generation.set_world_seed(old_seed)
+
+    def test_background_auto_save(self):
+        """Test that background saves write a consistent snapshot, coalesce and report errors"""
+        import threading
+        import world_generation
+        from background_save import BackgroundSaver
+        from save_load import get_save_tracker, discard_journal
+
+        old_seed = world_generation.world_seed
+        world = {1: {}}
+        with tempfile.TemporaryDirectory() as save_dir, patch('save_load.SAVE_DIR', save_dir), \
+                patch('save_load.SAVE_BACKEND', "json"):
+            try:
+                world_generation.set_world_seed(None)
+                get_room(1, 3, 0, world, [])["description"] = "Before the save."
+                journal = get_save_tracker("background")
+                snapshot_job = journal.prepare(world, {"player_money": 5})
+
+                # Changes made after the snapshot was taken are not part of it
+                get_room(1, 3, 0, world, [])["description"] = "After the save."
+                saver = BackgroundSaver()
+                release = threading.Event()
+
+                class BlockingJob:
+                    def run(self):
+                        release.wait(10)
+                    def cancel(self):
+                        pass
+
+                saver.submit(BlockingJob())
+                saver.submit(snapshot_job)
+                # Entries queued behind a running write are merged into one
+                saver.submit(journal.prepare(world, {"player_money": 6}))
+                saver.submit(journal.prepare(world, {"player_money": 7}))
+                self.assertEqual(saver.coalesced, 1)
+                release.set()
+                self.assertTrue(saver.wait(timeout=10))
+
+                with open(os.path.join(save_dir, "background.json")) as f:
+                    base = json.load(f)
+                self.assertEqual(base["worlds"]["1"]["3,0"]["description"], "Before the save.")
+                with open(journal.path) as f:
+                    entries = [json.loads(line) for line in f]
+                self.assertEqual(len(entries), 1)
+                self.assertEqual(entries[0]["player"]["player_money"], 7)
+                self.assertEqual(entries[0]["rooms"]["1"]["3,0"]["description"], "After the save.")
+                self.assertEqual(world_generation.room_snapshots, [])
+
+                # Failures are kept for the next prompt and force a full save next time
+                class FailingJob(BlockingJob):
+                    def run(self):
+                        raise OSError("disk full")
+                    def failed(self):
+                        journal.invalidate()
+
+                saver.submit(FailingJob())
+                self.assertTrue(saver.wait(timeout=10))
+                self.assertEqual([str(e) for e in saver.take_errors()], ["disk full"])
+                self.assertEqual(saver.take_errors(), [])
+                self.assertIsNone(journal.worlds)
+                saver.stop()
+            finally:
+                discard_journal("background")
+                world_generation.set_world_seed(old_seed)
+
+    def test_sqlite_save_backend(self):
+        """Test that SQLite saves load rooms on demand, upsert changed rooms and import JSON saves"""
+        import sqlite3
+        import world_generation
+        from save_load import discard_journal, delete_save, get_database_file_path
+        from save_database import RoomTable
+
+        old_seed = world_generation.world_seed
+        world = {1: {}}
+        with tempfile.TemporaryDirectory() as save_dir, patch('save_load.SAVE_DIR', save_dir), \
+                patch('save_load.SAVE_BACKEND', "sqlite"), patch('builtins.print'):
+            try:
+                world_generation.set_world_seed(None)
+                for x in range(5):
+                    get_room(1, x, 0, world, [])
+                save_game("slot", world, [], [], None, 1, 4, 0, 50, 50, 20, 20, 20, 20,
+                          10, 0, 0, 0, {}, 0, set(), {}, 0, set(), [], {}, False)
+                self.assertFalse(os.path.exists(os.path.join(save_dir, "slot.json")))
+
+                # Loading reads the player table only; rooms are read when used
+                loaded = load_game("slot")
+                self.assertEqual(loaded["player_money"], 10)
+                floor = loaded["worlds"][1]
+                self.assertIsInstance(floor, RoomTable)
+                self.assertEqual(floor.loaded_count(), 0)
+                room = get_room(1, 2, 0, loaded["worlds"], [])
+                self.assertEqual(floor.loaded_count(), 1)
+                self.assertEqual(room["description"], world[1][(2, 0)]["description"])
+
+                # Later saves upsert only the changed rows
+                room["description"] = "A room the player changed."
+                database_path = get_database_file_path("slot")
+                connection = sqlite3.connect(database_path)
+                connection.execute("UPDATE rooms SET data = 'untouched' WHERE x = 3")
+                connection.commit()
+                save_game("slot", loaded["worlds"], [], [], None, 1, 2, 0, 50, 50, 20, 20, 20, 20,
+                          25, 0, 0, 0, {}, 0, set(), {}, 0, set(), [], {}, False)
+                rows = dict(connection.execute("SELECT x, data FROM rooms WHERE floor = 1"))
+                self.assertEqual(rows[3], "untouched")
+                self.assertEqual(json.loads(rows[2])["description"], "A room the player changed.")
+                connection.close()
+                self.assertEqual(floor.loaded_count(), 1)
+
+                # An existing JSON save is imported into a database the first time it is opened
+                with patch('save_load.SAVE_BACKEND', "json"):
+                    save_game("old", world, [], [], None, 1, 1, 0, 50, 50, 20, 20, 20, 20,
+                              7, 0, 0, 0, {}, 0, set(), {}, 0, set(), [], {}, False)
+                    discard_journal("old")
+                imported = load_game("old")
+                self.assertEqual(imported["player_money"], 7)
+                self.assertEqual(len(imported["worlds"][1]), 5)
+                self.assertTrue(os.path.exists(os.path.join(save_dir, "old.json.imported")))
+                self.assertFalse(os.path.exists(os.path.join(save_dir, "old.json")))
+
+                self.assertTrue(delete_save("slot"))
+                self.assertFalse(os.path.exists(database_path))
+            finally:
+                discard_journal("slot")
+                discard_journal("old")
+                world_generation.set_world_seed(old_seed)
+
+    def test_save_metadata(self):
+        """Test that the save menus read a small metadata sidecar instead of the save"""
+        import world_generation
+        from save_load import (auto_save_game, discard_journal, wait_for_saves, read_save_metadata,
+                               show_save_info, get_metadata_file_path, delete_save)
+
+        old_seed = world_generation.world_seed
+        for backend in ("json", "sqlite"):
+            world = {1: {}}
+            with tempfile.TemporaryDirectory() as save_dir, patch('save_load.SAVE_DIR', save_dir), \
+                    patch('save_load.SAVE_BACKEND', backend), patch('builtins.print'):
+                try:
+                    world_generation.set_world_seed(None)
+                    for x in range(3):
+                        get_room(1, x, 0, world, [])
+                    save_game("slot", world, [{"name": "Sword"}], [], None, 1, 2, 0, 40, 50, 20, 20, 20, 20,
+                              15, 0, 0, 0, {}, 0, {1, 2}, {}, 0, set(), [], {}, False, player_level=3)
+                    metadata = read_save_metadata("slot")
+                    self.assertEqual((metadata["player_level"], metadata["player_money"], metadata["room_count"]),
+                                     (3, 15, 3))
+                    self.assertEqual(metadata["counts"]["inventory"], 1)
+                    self.assertEqual(metadata["counts"]["unlocked_floors"], 2)
+
+                    # Auto-saves keep the sidecar up to date
+                    get_room(1, 5, 0, world, [])
+                    for money in (20, 30):
+                        auto_save_game(world, [], [], None, 1, 5, 0, 50, 50, 20, 20, 20, 20,
+                                       money, 0, 0, 0, {}, 0, set(), {}, 0, set(), [], {}, False)
+                    self.assertTrue(wait_for_saves(timeout=10))
+                    metadata = read_save_metadata("auto_save")
+                    self.assertEqual((metadata["player_money"], metadata["room_count"]), (30, 4))
+
+                    # The save info is shown without reading the save itself
+                    with patch('save_load.read_player_data', side_effect=AssertionError):
+                        show_save_info("slot")
+
+                    # Saves without a sidecar get one built from the save
+                    os.remove(get_metadata_file_path("slot"))
+                    self.assertEqual(read_save_metadata("slot")["player_money"], 15)
+                    self.assertTrue(os.path.exists(get_metadata_file_path("slot")))
+                    delete_save("slot")
+                    self.assertFalse(os.path.exists(get_metadata_file_path("slot")))
+                    self.assertIsNone(read_save_metadata("slot"))
+                finally:
+                    discard_journal("slot")
+                    discard_journal("auto_save")
+                    world_generation.set_world_seed(old_seed)
+
+    def test_streaming_save_format(self):
+        """Test that saves are written from generators and parsed a room at a time"""
+        import io
+        from save_stream import write_save_document, iter_save_document
+
+        rooms = [((1, x, 0), json.dumps({"description": f"Room {x}", "enemy": {"hp": 10 ** x}}))
+                 for x in range(30)] + [((2, 0, 0), json.dumps({"description": "Stairs"}))]
+        f = io.StringIO()
+        count = write_save_document(f, [("player_x", "3"), ("save_name", '"slot"')], iter(rooms), [1, 2, 3])
+        self.assertEqual(count, 31)
+        document = json.loads(f.getvalue())
+        self.assertEqual(document["worlds"]["3"], {})
+        self.assertEqual(document["worlds"]["1"]["29,0"]["enemy"]["hp"], 10 ** 29)
+
+        # A tiny read size splits keys, numbers and rooms across reads
+        items = list(iter_save_document(io.StringIO(f.getvalue()), chunk_size=7))
+        self.assertIn(("field", "player_x", 3), items)
+        parsed = {}
+        for item in items:
+            if item[0] == "room":
+                parsed.setdefault(item[1], {})[item[2]] = item[3]
+        self.assertEqual(parsed, {floor: rooms for floor, rooms in document["worlds"].items() if rooms})
+        self.assertIn(("floor", "3"), items)
+
+        # The old single-floor format and truncated files
+        old = list(iter_save_document(io.StringIO('{"world": {"0,1": {"description": "Old"}}, "player_x": 1}')))
+        self.assertEqual(old, [("floor", None), ("room", None, "0,1", {"description": "Old"}), ("field", "player_x", 1)])
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_save_document(io.StringIO(f.getvalue()[:-40]), chunk_size=7))
+        with self.assertRaises(ValueError):
+            write_save_document(io.StringIO(), [], iter([((1, 0, 0), "{}"), ((2, 0, 0), "{}"), ((1, 1, 0), "{}")]))
+
+    def test_save_migrations(self):
+        """Test that old saves are migrated once and current saves skip the compatibility walk"""
+        import world_generation
+        from save_load import discard_journal, read_json_save
+        from save_migrations import SAVE_SCHEMA_VERSION
+
+        old_save = {
+            "save_name": "old", "player_x": 0, "player_y": 1, "player_hp": 30,
+            "mysterious_key": True, "waypoints": {"camp": [2, 3]}, "floors_visited": 2,
+            "inventory": [{"name": "Sword", "damage": 5, "durability": 8}],
+            "world": {"0,1": {"description": "An old room", "enemy": None,
+                              "weapons": [{"name": "Axe", "damage": 6, "durability": 4}],
+                              "shop": {"items": [], "armor": {"name": "Mail", "defense": 2, "durability": 7}}}}
+        }
+        old_seed = world_generation.world_seed
+        for backend in ("json", "sqlite"):
+            with tempfile.TemporaryDirectory() as save_dir, patch('save_load.SAVE_DIR', save_dir), \
+                    patch('save_load.SAVE_BACKEND', backend), patch('builtins.print'):
+                try:
+                    with open(os.path.join(save_dir, "old.json"), "w") as f:
+                        json.dump(old_save, f)
+                    loaded = load_game("old")
+                    self.assertEqual(loaded["mysterious_keys"], {1: True})
+                    self.assertEqual(loaded["waypoints"], {"camp": (0, 2, 3)})
+                    self.assertEqual(loaded["floors_visited"], [2])
+                    self.assertEqual(loaded["inventory"][0]["max_durability"], 13)
+                    room = loaded["worlds"][0][(0, 1)]
+                    self.assertEqual(room["weapons"][0]["max_durability"], 9)
+                    self.assertEqual(room["shop"]["armor"]["max_durability"], 17)
+                    if backend == "json":
+                        self.assertEqual(read_json_save("old")["schema_version"], SAVE_SCHEMA_VERSION)
+
+                    # The migrated save was written back, so the next load runs no steps
+                    with patch('save_load.migrate_save', side_effect=AssertionError):
+                        again = load_game("old")
+                    self.assertEqual(again["waypoints"], {"camp": [0, 2, 3]})
+                    self.assertEqual(again["worlds"][0][(0, 1)]["weapons"][0]["max_durability"], 9)
+                finally:
+                    discard_journal("old")
+                    world_generation.set_world_seed(old_seed)
+
+    def test_binary_save_format(self):
+        """Test that binary saves round-trip rooms and are picked by their file extension"""
+        import io
+        import world_generation
+        from models import to_plain
+        from save_binary import write_binary_save, read_binary_save
+        from save_load import (build_room_data, auto_save_game, wait_for_saves, discard_journal,
+                               get_binary_file_path, read_save_metadata)
+
+        rooms = [((1, x, -x), build_room_data(world_generation.create_room(1, x, -x, ()))) for x in range(40)]
+        rooms[0][1]["enemy"] = [{"name": "Spider", "hp": 3}, {"name": "Spider", "hp": 4, "Poisoned": 2}]
+        rooms[1][1]["shop"] = {"items": [{"name": "Dagger", "damage": 4, "crit_chance": 0.25}], "armor": None}
+        f = io.BytesIO()
+        self.assertEqual(write_binary_save(f, [("player_x", "3")], rooms, [1, 2]), 40)
+        fields, worlds = read_binary_save(io.BytesIO(f.getvalue()))
+        self.assertEqual(fields, {"player_x": 3})
+        self.assertEqual(worlds[2], {})
+        for (floor, x, y), room in rooms:
+            self.assertEqual(worlds[floor][(x, y)], json.loads(json.dumps(room, default=to_plain)))
+
+        old_seed = world_generation.world_seed
+        world = {1: {}}
+        with tempfile.TemporaryDirectory() as save_dir, patch('save_load.SAVE_DIR', save_dir), \
+                patch('save_load.SAVE_BACKEND', "binary"), patch('builtins.print'):
+            try:
+                world_generation.set_world_seed(None)
+                for x in range(4):
+                    get_room(1, x, 0, world, [])
+                save_game("slot", world, [], [], None, 1, 3, 0, 50, 50, 20, 20, 20, 20,
+                          12, 0, 0, 0, {}, 0, set(), {}, 0, set(), [], {}, False)
+                self.assertEqual(os.listdir(save_dir).count("slot.sav"), 1)
+                self.assertFalse(os.path.exists(os.path.join(save_dir, "slot.json")))
+
+                # Auto-saves journal on top of a binary base snapshot
+                for money in (1, 2):
+                    get_room(1, money, 0, world, [])["description"] = f"Changed {money}"
+                    auto_save_game(world, [], [], None, 1, 0, 0, 50, 50, 20, 20, 20, 20,
+                                   money, 0, 0, 0, {}, 0, set(), {}, 0, set(), [], {}, False)
+                self.assertTrue(wait_for_saves(timeout=10))
+                self.assertTrue(os.path.exists(get_binary_file_path("auto_save")))
+                self.assertEqual(read_save_metadata("auto_save")["room_count"], 4)
+
+                # The extension picks the codec whatever the backend is set to
+                with patch('save_load.SAVE_BACKEND', "json"):
+                    loaded = load_game("auto_save")
+                    self.assertEqual(loaded["player_money"], 2)
+                    self.assertEqual(loaded["worlds"][1][(2, 0)]["description"], "Changed 2")
+                    self.assertEqual(load_game("slot")["worlds"][1][(3, 0)]["description"],
+                                     world[1][(3, 0)]["description"])
+
+                with open(get_binary_file_path("slot"), "r+b") as f:
+                    f.seek(12)
+                    f.write(b"garbage")
+                self.assertIsNone(load_game("slot"))
+            finally:
+                discard_journal("slot")
+                discard_journal("auto_save")
+                world_generation.set_world_seed(old_seed)
+
+    def test_shared_chunk_saves(self):
+        """Test that manifest saves share unchanged chunks and deleting a slot collects its garbage"""
+        import world_generation
+        from save_load import (auto_save_game, wait_for_saves, discard_journal, delete_save,
+                               get_manifest_file_path, get_object_store, read_save_metadata)
+
+        def save(name, money):
+            save_game(name, world, [], [], None, 1, 0, 0, 50, 50, 20, 20, 20, 20,
+                      money, 0, 0, 0, {}, 0, set(), {}, 0, set(), [], {}, False)
+
+        old_seed = world_generation.world_seed
+        world = {1: {}}
+        with tempfile.TemporaryDirectory() as save_dir, patch('save_load.SAVE_DIR', save_dir), \
+                patch('save_load.SAVE_BACKEND', "objects"), patch('builtins.print'):
+            try:
+                world_generation.set_world_seed(None)
+                for x in range(0, 64, 4):
+                    get_room(1, x, 0, world, [])
+                save("first", 1)
+                store = get_object_store()
+                objects = store.digests()
+                self.assertEqual(len(objects), 4)  # 16 rooms in four 16x16 chunks
+
+                # An unchanged world adds no objects; one changed room adds one chunk
+                save("second", 2)
+                self.assertEqual(store.digests(), objects)
+                get_room(1, 0, 0, world, [])["description"] = "Changed"
+                save("third", 3)
+                self.assertEqual(len(store.digests()), 5)
+                self.assertEqual(read_save_metadata("third")["room_count"], 16)
+
+                # Auto-saves journal on top of a manifest
+                get_room(1, 60, 0, world, [])["description"] = "Journaled"
+                auto_save_game(world, [], [], None, 1, 0, 0, 50, 50, 20, 20, 20, 20,
+                               7, 0, 0, 0, {}, 0, set(), {}, 0, set(), [], {}, False)
+                self.assertTrue(wait_for_saves(timeout=10))
+                self.assertTrue(os.path.exists(get_manifest_file_path("auto_save")))
+
+                loaded = load_game("first")
+                self.assertEqual(loaded["player_money"], 1)
+                self.assertNotEqual(loaded["worlds"][1][(0, 0)]["description"], "Changed")
+                loaded = load_game("auto_save")
+                self.assertEqual(loaded["player_money"], 7)
+                self.assertEqual(loaded["worlds"][1][(0, 0)]["description"], "Changed")
+                self.assertEqual(loaded["worlds"][1][(60, 0)]["description"], "Journaled")
+
+                # Deleting a slot only removes chunks no other slot uses
+                self.assertTrue(delete_save("third"))
+                self.assertEqual(len(store.digests()), 6)
+                self.assertTrue(delete_save("auto_save"))
+                self.assertEqual(store.digests(), objects)
+                self.assertTrue(delete_save("first"))
+                self.assertTrue(delete_save("second"))
+                self.assertEqual(store.digests(), set())
+
+                # Saving after a delete writes the collected chunks again
+                save("fourth", 4)
+                self.assertTrue(delete_save("fourth") and not store.digests())
+                save("fifth", 5)
+                loaded = load_game("fifth")
+                self.assertEqual(loaded["player_money"], 5)
+                self.assertEqual(loaded["worlds"][1][(0, 0)]["description"], "Changed")
+            finally:
+                discard_journal("auto_save")
+                world_generation.set_world_seed(old_seed)
+
+    def test_instant_resume(self):
+        """Test that loading a manifest save returns before the other floors have been read"""
+        import threading
+        import object_store
+        import world_generation
+        from chunk_store import close_worlds
+        from save_load import discard_journal
+
+        old_seed = world_generation.world_seed
+        world = {}
+        gate = threading.Event()
+        decode_chunk = object_store.decode_chunk
+
+        def gated_decode_chunk(data):
+            if threading.current_thread() is not threading.main_thread():
+                gate.wait(10)
+            return decode_chunk(data)
+
+        with tempfile.TemporaryDirectory() as save_dir, patch('save_load.SAVE_DIR', save_dir), \
+                patch('save_load.SAVE_BACKEND', "objects"), patch('save_load.INSTANT_RESUME', True), \
+                patch('builtins.print'):
+            try:
+                world_generation.set_world_seed(None)
+                for floor in (1, 2, 3):
+                    get_room(floor, 0, 0, world, [])["description"] = f"Floor {floor}"
+                save_game("slot", world, [], [], None, 2, 0, 0, 50, 50, 20, 20, 20, 20,
+                          0, 0, 0, 0, {}, 0, set(), {}, 0, set(), [], {}, False)
+
+                with patch('object_store.decode_chunk', gated_decode_chunk):
+                    loaded = load_game("slot")
+                worlds = loaded["worlds"]
+                self.assertEqual(sorted(worlds.pending_floors()), [1, 3])
+                self.assertEqual(get_room(2, 0, 0, worlds, [])["description"], "Floor 2")
+                self.assertIn(3, worlds)
+
+                # A floor that hasn't arrived yet is waited for on first use
+                gate.set()
+                self.assertEqual(get_room(3, 0, 0, worlds, [])["description"], "Floor 3")
+                self.assertEqual(sorted(floor for floor, _ in worlds.items()), [1, 2, 3])
+                self.assertEqual(worlds.pending_floors(), [])
+                close_worlds(worlds)
+            finally:
+                gate.set()
+                discard_journal("slot")
+                world_generation.set_world_seed(old_seed)
+
+    def test_game_state_snapshots(self):
+        """Test that GameState tracks changed fields and snapshots share everything else"""
+        import world_generation
+        from game_state import GameState
+        from save_load import auto_save_game, discard_journal, read_player_data
+
+        state = GameState(player_money=10)
+        first = state.snapshot("slot")
+        self.assertEqual(state.dirty_fields(), set())
+        self.assertEqual(first["player_money"], 10)
+        self.assertEqual(first["unlocked_floors"], [])
+
+        state.player_hp -= 5
+        state.inventory.append({"name": "Sword", "damage": 8, "durability": 10})
+        state.waypoints  # Handed out but left alone
+        self.assertEqual(state.dirty_fields(), {"player_hp", "inventory", "waypoints"})
+        second = state.snapshot("slot")
+        self.assertEqual(second["player_hp"], 45)
+        self.assertEqual(second["inventory"], [{"name": "Sword", "damage": 8, "durability": 10}])
+        self.assertIs(second.encoded["player_money"], first.encoded["player_money"])
+        self.assertIs(second.encoded["waypoints"], first.encoded["waypoints"])
+        self.assertIsNot(second["inventory"], state.inventory)
+
+        # Saves take the state object
+        old_seed = world_generation.world_seed
+        with tempfile.TemporaryDirectory() as save_dir, patch('save_load.SAVE_DIR', save_dir), \
+                patch('save_load.ASYNC_AUTO_SAVE', False), patch('builtins.print'):
+            try:
+                world_generation.set_world_seed(None)
+                get_room(1, 0, 0, state.worlds, [])
+                save_game("slot", state)
+                state.player_x = 3
+                auto_save_game(state)
+                self.assertEqual(read_player_data("slot")["player_hp"], 45)
+                self.assertEqual(load_game("auto_save")["player_x"], 3)
+            finally:
+                discard_journal("auto_save")
+                world_generation.set_world_seed(old_seed)
+
+    def test_command_registry(self):
+        """Test exact, argument, abbreviated, prefix and mod command dispatch"""
+        from command_registry import CommandRegistry
+
+        calls = []
+        commands = CommandRegistry()
+        for name in ("attack", "save", "saves", "south"):
+            commands.register(name, lambda room, command: calls.append(command))
+        commands.register("guide", lambda room, command: calls.append(command), takes_args=True)
+        commands.register_prefix("dev_", lambda room, command: calls.append(("dev", command)))
+
+        for typed in ("attack", "save", "guide combat", "att", "dev_anything 1"):
+            handler, command = commands.resolve(typed)
+            handler(None, command)
+        self.assertEqual(calls, ["attack", "save", "guide combat", "attack", ("dev", "dev_anything 1")])
+        self.assertEqual(commands.resolve("sa"), (None, "sa"))  # Ambiguous
+        self.assertEqual(commands.resolve("attack now"), (None, "attack now"))  # Takes no arguments
+        self.assertEqual(commands.resolve("jump"), (None, "jump"))
+        self.assertEqual(commands.resolve("so"), (None, "so"))  # Too short to stand for south
+        self.assertEqual(commands.resolve("sou")[1], "south")
+        from game_engine import build_command_registry
+        self.assertEqual(build_command_registry().resolve("no"), (None, "no"))  # A stray yes/no answer isn't "north"
+        self.assertEqual(commands.complete("s"), ["save", "saves", "south"])
+
+        # Mod commands are merged in when the mod loader's generation changes
+        class Mod:
+            def __init__(self):
+                self.args = []
+
+            def handle_dance(self, args):
+                self.args.append(args)
+
+        class Loader:
+            generation = 1
+            loaded_mods = {"party_mod": Mod()}
+            mod_data = {"commands": {"party_mod.dance": {"name": "dance", "function": "handle_dance"},
+                                     "party_mod.attack": {"name": "attack", "function": "handle_dance"}}}
+
+        loader = Loader()
+        commands.sync_mod_commands(loader)
+        handler, command = commands.resolve("dance wildly")
+        handler(None, command)
+        self.assertEqual(loader.loaded_mods["party_mod"].args, [["wildly"]])
+        self.assertEqual(commands.exact["attack"].source, None)  # Built-ins win
+
+        loader.mod_data = {"commands": {}}
+        commands.sync_mod_commands(loader)
+        self.assertIsNotNone(commands.resolve("dance")[0])  # Same generation - nothing to do
+        loader.generation = 2
+        commands.sync_mod_commands(loader)
+        self.assertIsNone(commands.resolve("dance")[0])
+
+        # Commands registered after the mods were loaded are picked up too
+        from mods.mod_loader import mod_loader, register_command
+        commands.sync_mod_commands(mod_loader)
+        waved = []
+        register_command("party_mod.wave", {"name": "wave", "function": waved.append})
+        try:
+            commands.sync_mod_commands(mod_loader)
+            handler, command = commands.resolve("wave hello")
+            handler(None, command)
+            self.assertEqual(waved, [["hello"]])
+        finally:
+            del mod_loader.mod_data['commands']["party_mod.wave"]
+            mod_loader.generation += 1
+
+    def test_headless_engine(self):
+        """Test that GameEngine.step returns events and answers prompts from choices"""
+        import world_generation
+        from game_engine import GameEngine
+        from game_io import Event
+        from game_state import state
+
+        old_seed = world_generation.world_seed
+        try:
+            world_generation.set_world_seed(3)
+            state.reset()
+            state.inventory = [{"name": "Stick", "damage": 2, "durability": 5}]
+            engine = GameEngine()
+            with patch('builtins.print') as mock_print, patch('builtins.input') as mock_input:
+                events = engine.step("drop", ["1"])
+                self.assertIn(Event("prompt", "Enter number (1-1): ", answer="1"), events)
+                self.assertEqual(engine.state.inventory, [])
+                self.assertEqual(engine.current_room()["weapons"][-1]["name"], "Stick")
+
+                # Prompts with no choice left stop the command
+                engine.state.inventory.append({"name": "Club", "damage": 3, "durability": 5})
+                self.assertEqual(engine.step("drop")[-1], Event("needs_input", "Enter number (1-1): "))
+                self.assertEqual(len(engine.state.inventory), 1)
+
+                self.assertEqual(engine.step("dance")[-1], Event("unknown_command", "dance"))
+                mock_print.assert_not_called()
+                mock_input.assert_not_called()
+        finally:
+            state.reset()
+            world_generation.set_world_seed(old_seed)
+
+    def test_script_mode(self):
+        """Test running a command script with prompt answers and a fixed seed"""
+        import world_generation
+        from game_state import state
+        from script_runner import parse_script_line, run_script
+
+        self.assertIsNone(parse_script_line("  # comment"))
+        self.assertEqual(parse_script_line("buy | 2 | yes"), ("buy", ["2", "yes"]))
+
+        script = ["# start", "take", "drop | 1", "take", "drop", "north", "dance"]
+        old_seed = world_generation.world_seed
+        try:
+            outputs = []
+            for _ in range(2):
+                out = StringIO()
+                summary = run_script(script, seed=11, out=out)
+                outputs.append(out.getvalue())
+            self.assertEqual(summary["commands"], 6)
+            self.assertEqual(summary["unknown"], 1)
+            self.assertEqual(summary["needs_input"], 1)
+            self.assertEqual(summary["position"], (0, 1))
+            self.assertIn("> drop | 1\n", outputs[0])
+            self.assertIn("=== SCRIPT SUMMARY ===", outputs[0])
+            self.assertNotIn("=== ROOM ===", outputs[0])
+            # Same seed, same game
+            self.assertEqual(outputs[0].split("Time:")[0], outputs[1].split("Time:")[0])
+        finally:
+            state.reset()
+            world_generation.set_world_seed(old_seed)
+
+    def test_frame_renderer(self):
+        """Test that show_room writes one frame and reuses unchanged status sections"""
+        import world_generation
+        from frame_renderer import status_panel
+        from game_engine import GameEngine
+        from game_state import state
+
+        old_seed = world_generation.world_seed
+        try:
+            world_generation.set_world_seed(3)
+            state.reset()
+            status_panel.clear()
+            engine = GameEngine()
+            with patch('builtins.print') as mock_print:
+                engine.show_room()
+                self.assertEqual(mock_print.call_count, 1)
+                frame = mock_print.call_args[0][0]
+            self.assertIn("--- PLAYER STATUS ---", frame)
+            self.assertIn("Weapons: Empty (using fists)", frame)
+
+            builds = status_panel.stats.builds
+            with patch('builtins.print') as mock_print:
+                engine.show_room()
+                self.assertEqual(status_panel.stats.builds, builds)
+                state.player_hp -= 1
+                engine.show_room()
+                self.assertEqual(status_panel.stats.builds, builds + 1)
+                self.assertIn(f"Hp: {state.player_hp}/", mock_print.call_args[0][0])
+        finally:
+            state.reset()
+            world_generation.set_world_seed(old_seed)
+
+    def test_record_replay(self):
+        """Test that a recorded game replays to the same final state"""
+        import world_generation
+        from game_engine import GameEngine
+        from game_io import EventRecorder
+        from game_state import state
+        from rng_streams import RandomStreams
+        from script_runner import start_game
+        from session_replay import SessionRecorder, replay_session
+
+        a, b = RandomStreams(7), RandomStreams(7)
+        self.assertEqual([a.combat.random() for _ in range(3)], [b.combat.random() for _ in range(3)])
+        self.assertNotEqual(a.loot.random(), a.movement.random())
+
+        commands = ["take", "attack", "north", "attack", "take", "east", "attack", "drop", "south"]
+        old_seed = world_generation.world_seed
+        try:
+            start_game(3)
+            engine = GameEngine()
+            recording = StringIO()
+            recorder = SessionRecorder(EventRecorder(["1"] * 20), recording, 3)
+            for command in commands:
+                recorder.step(engine, command)
+            recorder.finish(state.fingerprint())
+            recorded_state = (state.player_x, state.player_y, state.player_hp, state.player_money)
+
+            lines = recording.getvalue().splitlines()
+            self.assertEqual(len(lines), len(commands) + 2)
+            summary = replay_session(lines, out=StringIO())
+            self.assertTrue(summary["matches"])
+            self.assertEqual((state.player_x, state.player_y, state.player_hp, state.player_money), recorded_state)
+
+            # A recording cut short still replays, with nothing to compare
+            self.assertIsNone(replay_session(lines[:-1], out=StringIO())["matches"])
+        finally:
+            state.reset()
+            world_generation.set_world_seed(old_seed)
+
+    def test_attack_updates_player_state(self):
+        """Test that the engine keeps the HP, gold and statistics an attack changes"""
+        from game_engine import GameEngine
+        from game_state import state
+
+        try:
+            state.reset()
+            engine = GameEngine()
+            room = engine.current_room()
+            room["enemy"] = {"name": "Goblin", "hp": 4, "base_attack": 6}
+            with patch('rng_streams.streams.combat.random', return_value=0.99):
+                engine.step("attack")
+            self.assertEqual(state.player_hp, 44)
+            self.assertEqual(state.total_damage_taken, 6)
+            self.assertEqual(state.attack_count, 1)
+            engine.step("attack")
+            self.assertIsNone(room["enemy"])
+            self.assertEqual(state.enemies_defeated, 1)
+            self.assertGreaterEqual(state.player_money, 5)
+        finally:
+            state.reset()
+
+    def test_balance_harness(self):
+        """Test that bot games are reproducible from their seed and summarized"""
+        import world_generation
+        from balance_harness import RESULT_FIELDS, play_game, run_games, summarize
+        from game_state import state
+
+        old_seed = world_generation.world_seed
+        try:
+            first = play_game(5, max_turns=200)
+            self.assertEqual(play_game(5, max_turns=200), first)
+            self.assertEqual(set(first), set(RESULT_FIELDS))
+            self.assertGreater(first["turns"], 0)
+
+            results = run_games(3, seed=5, workers=1, max_turns=200)
+            self.assertEqual([row["seed"] for row in results], [5, 6, 7])
+            self.assertEqual(results[0], first)
+            report = summarize(results)
+            self.assertEqual(report["games"], 3)
+            self.assertEqual(report["turns"]["count"], 3)
+        finally:
+            state.reset()
+            world_generation.set_world_seed(old_seed)
+
+    def test_combat_matrix(self):
+        """Test the vectorized combat matrix against handle_attack"""
+        from types import SimpleNamespace
+        from combat_matrix import build_matrix, numpy_available, sample_armor, sample_enemies, sample_weapons, simulate_fights
+        from game_io import EventRecorder, use_console
+        if not numpy_available():
+            self.skipTest("NumPy not installed")
+        import numpy as np
+
+        matrix = build_matrix(fights=200, weapons=(("Sword", False), ("Dagger", True)), enemies=("Goblin", "Troll"),
+                              distances=(0, 40), armor_tiers=("none", "scaled"))
+        self.assertEqual(matrix.death_probability.shape, (2, 2, 2, 2))
+        self.assertEqual(len(list(matrix.rows())), 16)
+        # A Troll far from the start is deadlier than a Goblin next to it
+        self.assertGreater(matrix.death_probability[0, 1, 1, 0], matrix.death_probability[0, 0, 0, 0])
+
+        # The same fights played one attack at a time through handle_attack
+        fights = 400
+        rng = np.random.default_rng(3)
+        weapon = sample_weapons(rng, "Axe", False, 40, fights)
+        enemy = sample_enemies(rng, "Troll", 40, fights)
+        armor = sample_armor(rng, "base", 40, fights)
+        outcome, turns, used, hp_lost = simulate_fights(weapon, enemy, armor, rng)
+        deaths = 0
+        with use_console(EventRecorder()):
+            for i in range(fights):
+                room = {"enemy": {"name": "Troll", "hp": int(enemy["hp"][i]), "base_attack": int(enemy["attack"][i]),
+                                  "armor_pierce": int(enemy["pierce"][i])}}
+                inventory = [{"name": "Axe", "damage": int(weapon["damage"][i]),
+                              "durability": int(weapon["durability"][i]), "crit_chance": 0.05, "crit_damage": 2.0}]
+                player = SimpleNamespace(player_hp=50, player_mana=20, player_money=0, equipped_armor=
+                                         {"name": "Armor", "defense": int(armor["defense"][i]),
+                                          "durability": int(armor["durability"][i])})
+                while room["enemy"]:
+                    if not handle_attack(room, inventory, player.player_mana, player.equipped_armor, player.player_hp,
+                                         set(), {}, 1, 0, [], spells, False, player=player):
+                        deaths += 1
+                        break
+        self.assertAlmostEqual(deaths / fights, float((outcome == -1).mean()), delta=0.1)
+
+    def test_odds_command(self):
+        """Test the exact fight odds and the odds command"""
+        from combat_odds import fight_odds, _solver
+        from game_engine import GameEngine
+        from game_io import Event
+
+        # Fists: a crit (5%) kills the 5 HP goblin at once, otherwise it hits back once and dies next attack
+        goblin = {"name": "Goblin", "hp": 5, "base_attack": 4}
+        odds = fight_odds([goblin], [], False, None, 50, 20)
+        self.assertAlmostEqual(odds.win, 1.0)
+        self.assertAlmostEqual(odds.turns, 0.05 * 1 + 0.95 * 2)
+        self.assertAlmostEqual(odds.hp_lost, 0.95 * 4)
+
+        # One hit from the rat (two attacks of 3) is fatal at 6 HP; the sword breaks on its only swing
+        rat = {"name": "Rat", "hp": 12, "base_attack": 3, "extra_turns": 2}
+        sword = {"name": "Sword", "damage": 6, "durability": 1}
+        odds = fight_odds([rat], [sword], False, None, 6, 20)
+        self.assertAlmostEqual(odds.death, 0.95)
+        self.assertAlmostEqual(odds.weapon_breaks, 1.0)
+
+        # The next turn of the same fight was already solved
+        fight_odds([dict(goblin, hp=2)], [], False, None, 46, 20)
+        hits = _solver.cache_info().hits
+        fight_odds([dict(goblin, hp=2)], [], False, None, 46, 20)
+        self.assertEqual(_solver.cache_info().hits, hits + 1)
+
+        try:
+            state.reset()
+            engine = GameEngine()
+            engine.current_room()["enemy"] = dict(goblin)
+            events = engine.step("odds")
+            self.assertIn(Event("message", "Win: 100.0% | Death: 0.0%"), events)
+            self.assertEqual(engine.current_room()["enemy"]["hp"], 5)
+        finally:
+            state.reset()
+
+    def test_fight_command(self):
+        """Test that fight attacks until the enemy is dead or a stop condition is reached"""
+        from game_engine import GameEngine
+        from game_io import Event
+
+        try:
+            state.reset()
+            engine = GameEngine()
+            engine.current_room()["enemy"] = {"name": "Goblin", "hp": 30, "base_attack": 4}
+            events = engine.step("fight")
+            self.assertIsNone(engine.current_room().get("enemy"))
+            self.assertEqual(state.enemies_defeated, 1)
+            self.assertGreaterEqual(state.total_damage_dealt, 30)
+            self.assertEqual(state.player_hp, 50 - state.total_damage_taken)
+            self.assertIn(Event("message", "All enemies have been defeated!"), events)
+            # One summary, no per-hit output
+            self.assertEqual(len([e for e in events if "=== FIGHT" in e.text]), 1)
+
+            # Stops as soon as HP is at the threshold, with the enemy still alive
+            state.reset()
+            engine = GameEngine()
+            engine.current_room()["enemy"] = {"name": "Ogre", "hp": 500, "base_attack": 10}
+            engine.step("fight hp 35")
+            self.assertEqual(state.player_hp, 30)
+            self.assertIsNotNone(engine.current_room().get("enemy"))
+
+            events = engine.step("fight hp lots")
+            self.assertIn(Event("message", "'hp' needs a number"), events)
+        finally:
+            state.reset()
+
+    def test_status_effect_engine(self):
+        """Test that status effects tick on every enemy and the player and expire off the heap"""
+        from game_engine import GameEngine
+        from game_io import Event
+        from save_migrations import migrate_status_effects
+        from status_effects import EFFECTS, scheduler
+
+        self.assertTrue(EFFECTS["Stunned"].skips_turn)
+        self.assertEqual((EFFECTS["Burning"].damage, EFFECTS["Burning"].duration), (3, 3))
+        try:
+            state.reset()
+            scheduler.clear()
+            engine = GameEngine()
+            state.inventory = [{"name": "Spell Book", "damage": 0, "durability": 100}]
+            state.learned_spells = ["Fire", "Stun"]
+            state.player_mana = 100
+            engine.current_room()["enemy"] = [{"name": "Goblin", "hp": 40, "base_attack": 3},
+                                              {"name": "Rat", "hp": 40, "base_attack": 2}]
+            # Burn the rat, then stun the goblin: the rat keeps burning while the goblin is hit
+            engine.step("attack", ["2", "1"])
+            events = engine.step("attack", ["1", "2"])
+            goblin, rat = engine.current_room()["enemy"]
+            self.assertIn(Event("message", "The Rat takes 3 burning damage!"), events)
+            self.assertIn(Event("message", "The Goblin is stunned and can't attack!"), events)
+            self.assertEqual(state.player_hp, 48)
+            events = engine.step("attack", ["1", "1"])
+            self.assertIn(Event("message", "The Rat is no longer burning."), events)
+            self.assertEqual(rat["hp"], 40 - 8 - 3 * 3)
+            self.assertEqual(rat["effects"], [])
+
+            # Enemies can leave effects on the player, which also tick as they walk
+            state.reset()
+            state.player_hp = 10
+            engine.current_room()["enemy"] = {"name": "Spider", "hp": 100, "base_attack": 1, "inflicts": "Poisoned"}
+            engine.step("attack")
+            self.assertEqual(state.player_hp, 10 - 1 - 2)
+            self.assertEqual(state.status_effects[0][0], "Poisoned")
+            engine.current_room()["enemy"] = None
+            engine.step("north")
+            self.assertEqual(state.player_hp, 5)
+
+            # Old saves kept effects as keys on the enemy
+            old = {"enemy": {"name": "Orc", "hp": 9, "Burning": {"damage": 3, "duration": 2}, "Stunned": 1}}
+            migrate_status_effects({}, {1: {(0, 0): old}})
+            self.assertEqual(old["enemy"], {"name": "Orc", "hp": 9, "effects": [["Burning", 3, 1], ["Stunned", 0, 0]]})
+        finally:
+            state.reset()
+            scheduler.clear()
+
 if __name__ == '__main__':
     # Run the tests
     unittest.main(verbosity=2) 
\ No newline at end of file
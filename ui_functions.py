@@ -1,12 +1,14 @@
 from constants import enemy_stats
+from game_io import say
+from frame_renderer import status_panel
 
 def show_map(player_floor, player_x, player_y, waypoints):
     """Display the current map with player location and waypoints"""
-    print(f"\n=== MAP ===")
-    print(f"You are on Floor {player_floor} at: ({player_x}, {player_y})")
+    say(f"\n=== MAP ===")
+    say(f"You are on Floor {player_floor} at: ({player_x}, {player_y})")
     
     if waypoints:
-        print("\nWaypoints:")
+        say("\nWaypoints:")
         for i, (name, (floor, x, y)) in enumerate(waypoints.items(), 1):
             if floor == player_floor:
                 distance = abs(x - player_x) + abs(y - player_y)
@@ -16,117 +18,87 @@ def show_map(player_floor, player_x, player_y, waypoints):
                 if y > player_y: direction += "N"
                 elif y < player_y: direction += "S"
                 if not direction: direction = "HERE"
-                print(f"  {i}. {name}: ({x}, {y}) - {distance} steps {direction}")
+                say(f"  {i}. {name}: ({x}, {y}) - {distance} steps {direction}")
             else:
-                print(f"  {i}. {name}: Floor {floor} ({x}, {y})")
+                say(f"  {i}. {name}: Floor {floor} ({x}, {y})")
     else:
-        print("No waypoints set.")
-    print("===========")
+        say("No waypoints set.")
+    say("===========")
 
 def show_room(current_room, player_floor, player_x, player_y, inventory, player_hp, player_max_hp, 
                player_stamina, player_max_stamina, player_mana, player_max_mana, player_money, 
                player_potions, stamina_potions, mana_potions, waypoint_scrolls, mysterious_keys, 
                golden_keys, equipped_armor, spell_scrolls, learned_spells, discovered_enemies, unlocked_floors,
                player_level=1, player_xp=0, player_xp_to_next=100):
-    
-    # Show player stats FIRST (compact with abbreviated labels)
-    print(f"\n--- PLAYER STATUS ---")
-    print(f"Lv.{player_level} | Hp: {player_hp}/{player_max_hp} | Stm: {player_stamina}/{player_max_stamina} | Mp: {player_mana}/{player_max_mana} | Gold: {player_money}")
-    
-    # Show XP progress
-    if player_level < 100:
-        progress = (player_xp / player_xp_to_next) * 100 if player_xp_to_next > 0 else 0
-        print(f"XP: {player_xp}/{player_xp_to_next} ({progress:.1f}%)")
-    else:
-        print(f"🏆 Level: {player_level} (MAXIMUM LEVEL!)")
-    
-    # Show potions and scrolls
-    print(f"Potions: Hp({player_potions}) Stm({stamina_potions}) Mp({mana_potions}) | Scrolls: {waypoint_scrolls}")
-    
-    # Show keys
-    if mysterious_keys:
-        floor_list = ", ".join([f"Floor {floor}" for floor in mysterious_keys.keys()])
-        print(f"Mysterious Keys: {floor_list}")
-    if golden_keys > 0:
-        print(f"Golden Keys: {golden_keys}")
-    
-    # Show current equipment
-    if equipped_armor:
-        print(f"Armor: {equipped_armor['name']} (Def: {equipped_armor['defense']}, Dur: {equipped_armor['durability']})")
-    else:
-        print("Armor: None")
-    
-    # Show inventory summary
-    inv_names = [f"{w['name']}({w.get('durability', '-')})" for w in inventory if "damage" in w]
-    if not inventory:
-        print("Weapons: Empty (using fists)")
-    else:
-        print(f"Weapons: {', '.join(inv_names)}")
-    
-    if spell_scrolls:
-        scroll_list = ", ".join([f"{name} ({count})" for name, count in spell_scrolls.items()])
-        print(f"Spell Scrolls: {scroll_list}")
-    if learned_spells:
-        spell_list = ", ".join([f"{i+1}.{name}" for i, name in enumerate(learned_spells)])
-        print(f"Learned Spells: {spell_list}")
+    """Show the player status and the room, written to the terminal as one frame"""
+    lines = []
+
+    def out(*parts):
+        lines.append(" ".join(map(str, parts)))
+
+    # Show player stats FIRST (compact with abbreviated labels); unchanged sections come from the cache
+    status_panel.render(lines, inventory, player_hp, player_max_hp, player_stamina, player_max_stamina, player_mana,
+                        player_max_mana, player_money, player_potions, stamina_potions, mana_potions, waypoint_scrolls,
+                        mysterious_keys, golden_keys, equipped_armor, spell_scrolls, learned_spells,
+                        player_level, player_xp, player_xp_to_next)
     
     # Now show room information
-    print(f"\n=== {current_room.get('name', 'ROOM').upper()} ===")
+    out(f"\n=== {current_room.get('name', 'ROOM').upper()} ===")
     
     # Dynamic room description based on current state
     if current_room.get("type") == "key_door":
         if current_room.get("enemy"):
             # Troll is still alive
-            print(f"You enter Floor {player_floor} ({player_x}, {player_y}): You find a glowing golden door… and the Troll guarding it!")
+            out(f"You enter Floor {player_floor} ({player_x}, {player_y}): You find a glowing golden door… and the Troll guarding it!")
         else:
             # Troll is dead, show updated description
             if not current_room.get("treasure_looted"):
-                print(f"You enter Floor {player_floor} ({player_x}, {player_y}): The golden door stands open! A magnificent treasure chamber lies beyond!")
+                out(f"You enter Floor {player_floor} ({player_x}, {player_y}): The golden door stands open! A magnificent treasure chamber lies beyond!")
             else:
-                print(f"You enter Floor {player_floor} ({player_x}, {player_y}): The golden door stands open, but the treasure chamber has been emptied.")
+                out(f"You enter Floor {player_floor} ({player_x}, {player_y}): The golden door stands open, but the treasure chamber has been emptied.")
     else:
         # For other room types, use the original description
-        print(f"You enter Floor {player_floor} ({player_x}, {player_y}):", current_room.get("description", "A mysterious room..."))
+        out(f"You enter Floor {player_floor} ({player_x}, {player_y}):", current_room.get("description", "A mysterious room..."))
 
     if current_room.get("crystal_type") == "life":
-        print("A glowing red crystal pulses on a stone pedestal. Use 'consume' to consume it.")
+        out("A glowing red crystal pulses on a stone pedestal. Use 'consume' to consume it.")
     elif current_room.get("crystal_type") == "stamina":
-        print("A glowing blue crystal pulses on a stone pedestal. Use 'consume' to consume it.")
+        out("A glowing blue crystal pulses on a stone pedestal. Use 'consume' to consume it.")
     elif current_room.get("crystal_type") == "mana":
-        print("A glowing purple crystal pulses on a stone pedestal. Use 'consume' to consume it.")
+        out("A glowing purple crystal pulses on a stone pedestal. Use 'consume' to consume it.")
     elif current_room.get("crystal_type") == "life_stamina":
-        print("Two crystals pulse on stone pedestals - a red life crystal and a blue stamina crystal. Use 'consume' to consume them.")
+        out("Two crystals pulse on stone pedestals - a red life crystal and a blue stamina crystal. Use 'consume' to consume them.")
     elif current_room.get("crystal_type") == "life_mana":
-        print("Two crystals pulse on stone pedestals - a red life crystal and a purple mana crystal. Use 'consume' to consume them.")
+        out("Two crystals pulse on stone pedestals - a red life crystal and a purple mana crystal. Use 'consume' to consume them.")
     elif current_room.get("crystal_type") == "all":
-        print("Three crystals pulse on stone pedestals - a red life crystal, a blue stamina crystal, and a purple mana crystal. Use 'consume' to consume them.")
+        out("Three crystals pulse on stone pedestals - a red life crystal, a blue stamina crystal, and a purple mana crystal. Use 'consume' to consume them.")
 
     if current_room.get("type") == "chest" and current_room.get("chest"):
         if current_room["chest"]["locked"]:
-            print("The chest is locked. You need a golden key to open it.")
+            out("The chest is locked. You need a golden key to open it.")
         else:
-            print("The opened chest lies empty.")
+            out("The opened chest lies empty.")
 
     if current_room.get("type") == "key_door":
         if current_room.get("enemy"):
-            print("A glowing golden door blocks your path. A monstrous Troll stands guard!")
+            out("A glowing golden door blocks your path. A monstrous Troll stands guard!")
         else:
             # Boss defeated, door is now open
             if not current_room.get("treasure_looted"):
-                print("The golden door is now open! A magnificent treasure chamber lies beyond!")
+                out("The golden door is now open! A magnificent treasure chamber lies beyond!")
                 if golden_keys > 0:
-                    print(f"Use 'loot' to collect the treasure with your golden key. (You have {golden_keys})")
+                    out(f"Use 'loot' to collect the treasure with your golden key. (You have {golden_keys})")
                 else:
-                    print("You need a golden key to access the treasure chamber.")
+                    out("You need a golden key to access the treasure chamber.")
             else:
-                print("The golden door stands open, but the treasure chamber has been emptied.")
+                out("The golden door stands open, but the treasure chamber has been emptied.")
 
     if current_room.get("type") == "stairwell":
         if current_room.get("requires_mysterious_key"):
             if player_floor in mysterious_keys or player_floor in unlocked_floors:
-                print("The stairwell is unlocked! Use 'descend' to go deeper.")
+                out("The stairwell is unlocked! Use 'descend' to go deeper.")
             else:
-                print("The stairwell is locked. You need a mysterious key for this floor to proceed.")
+                out("The stairwell is locked. You need a mysterious key for this floor to proceed.")
 
     if current_room.get("enemy"):
         e = current_room["enemy"]
@@ -141,16 +113,16 @@ def show_room(current_room, player_floor, player_x, player_y, inventory, player_
                 if enemy.get("is_training_dummy"):
                     tag = " [TRAINING]"
                     if "Training Dummy" not in discovered_enemies:
-                        print(f"Enemy here: {enemy['name']}{tag} (HP: ???)")
+                        out(f"Enemy here: {enemy['name']}{tag} (HP: ???)")
                     else:
-                        print(f"Enemy here: {enemy['name']}{tag} (HP: {enemy['hp']})")
+                        out(f"Enemy here: {enemy['name']}{tag} (HP: {enemy['hp']})")
                 else:
-                    print(f"Enemy here: {enemy['name']}{tag} (HP: {enemy['hp']})")
+                    out(f"Enemy here: {enemy['name']}{tag} (HP: {enemy['hp']})")
             else:
                 # Multiple enemies in swarm
-                print(f"Enemies here: {len(e)} spiders")
+                out(f"Enemies here: {len(e)} spiders")
                 for i, enemy in enumerate(e, 1):
-                    print(f"  {i}. {enemy['name']} (HP: {enemy['hp']})")
+                    out(f"  {i}. {enemy['name']} (HP: {enemy['hp']})")
         else:
             # Single enemy (dictionary)
             tag = " [BOSS]" if e.get("is_boss") else ""
@@ -158,46 +130,47 @@ def show_room(current_room, player_floor, player_x, player_y, inventory, player_
                 tag = " [TRAINING]"
                 # Show ??? for training dummy HP until defeated
                 if "Training Dummy" not in discovered_enemies:
-                    print(f"Enemy here: {e['name']}{tag} (HP: ???)")
+                    out(f"Enemy here: {e['name']}{tag} (HP: ???)")
                 else:
-                    print(f"Enemy here: {e['name']}{tag} (HP: {e['hp']})")
+                    out(f"Enemy here: {e['name']}{tag} (HP: {e['hp']})")
             else:
-                print(f"Enemy here: {e['name']}{tag} (HP: {e['hp']})")
+                out(f"Enemy here: {e['name']}{tag} (HP: {e['hp']})")
 
     if current_room.get("weapons"):
-        print("Weapons here:")
+        out("Weapons here:")
         for i, w in enumerate(current_room["weapons"], 1):
             if w.get("name") == "Spell Book":
-                print(f"  {i}. {w['name']} (Damage: ???, Durability: {w['durability']})")
+                out(f"  {i}. {w['name']} (Damage: ???, Durability: {w['durability']})")
             elif w.get("requires_mana"):
-                print(f"  {i}. {w['name']} (Damage: {w['damage']}, Durability: {w['durability']}, Mana Cost: {w.get('mana_cost', 10)})")
+                out(f"  {i}. {w['name']} (Damage: {w['damage']}, Durability: {w['durability']}, Mana Cost: {w.get('mana_cost', 10)})")
             else:
-                print(f"  {i}. {w['name']} (Damage: {w['damage']}, Durability: {w['durability']})")
+                out(f"  {i}. {w['name']} (Damage: {w['damage']}, Durability: {w['durability']})")
 
     if current_room.get("armors"):
-        print("Armor here:")
+        out("Armor here:")
         for i, a in enumerate(current_room["armors"], 1):
-            print(f"  {i}. {a['name']} (Defense: {a['defense']}, Durability: {a['durability']})")
+            out(f"  {i}. {a['name']} (Defense: {a['defense']}, Durability: {a['durability']})")
 
     if current_room.get("mysterious_key"):
         key = current_room["mysterious_key"]
         if player_floor in mysterious_keys or player_floor in unlocked_floors:
-            print(f"A {key['name']} lies here, but it's not useful to you.")
+            out(f"A {key['name']} lies here, but it's not useful to you.")
         else:
-            print(f"A {key['name']} lies here. Use 'take' to pick it up.")
+            out(f"A {key['name']} lies here. Use 'take' to pick it up.")
 
     if current_room.get("shop"):
         shop = current_room["shop"]
-    if shop.get("is_blacksmith"):
-      print("This is a blacksmith's forge. Type 'buy' to see what's for sale and repair services.")
-    else:
-      print("This is a shop. Type 'buy' to see what's for sale.")
+        if shop.get("is_blacksmith"):
+            out("This is a blacksmith's forge. Type 'buy' to see what's for sale and repair services.")
+        else:
+            out("This is a shop. Type 'buy' to see what's for sale.")
 
-    print("\nType 'guide' to see a list of commands.")
+    out("\nType 'guide' to see a list of commands.")
+    say("\n".join(lines))
 
 def show_bestiary(discovered_enemies):
     """Display information about discovered enemies in the game"""
-    print("\n=== BESTIARY ===")
+    say("\n=== BESTIARY ===")
     
     # Check if developer mode is enabled
     developer_mode = False
@@ -209,8 +182,8 @@ def show_bestiary(discovered_enemies):
     
     # If developer mode is enabled, show all enemies
     if developer_mode:
-        print("🔧 DEVELOPER MODE: All enemies visible in bestiary")
-        print("\n📖 All Enemies in Game:")
+        say("🔧 DEVELOPER MODE: All enemies visible in bestiary")
+        say("\n📖 All Enemies in Game:")
         
         # Show all regular enemies from constants
         for enemy_name, base_hp in enemy_stats.items():
@@ -236,22 +209,22 @@ def show_bestiary(discovered_enemies):
             elif enemy_name == "Spider":
                 health_desc = "Very Low Health, Swarm Enemy"
             
-            print(f"  🐺 {enemy_name}: {base_hp} HP - {health_desc}")
+            say(f"  🐺 {enemy_name}: {base_hp} HP - {health_desc}")
         
         # Show special enemies
-        print("  🎯 Training Dummy: ??? HP - Practice Target (No Rewards)")
-        print("  👹 Troll: ??? HP - Boss Enemy (Drops Mysterious Key)")
-        print("  🐉 Baby Dragon: ??? HP - Boss Enemy (Drops Mysterious Key + Dragon Scales)")
+        say("  🎯 Training Dummy: ??? HP - Practice Target (No Rewards)")
+        say("  👹 Troll: ??? HP - Boss Enemy (Drops Mysterious Key)")
+        say("  🐉 Baby Dragon: ??? HP - Boss Enemy (Drops Mysterious Key + Dragon Scales)")
         
     else:
         # Normal mode - only show discovered enemies
         if not discovered_enemies:
-            print("You have no enemy info!")
-            print("Defeat enemies to unlock their files in the bestiary.")
-            print("==================")
+            say("You have no enemy info!")
+            say("Defeat enemies to unlock their files in the bestiary.")
+            say("==================")
             return
         
-        print("\n📖 Discovered Enemies:")
+        say("\n📖 Discovered Enemies:")
         for enemy_name in discovered_enemies:
             if enemy_name in enemy_stats:
                 base_hp = enemy_stats[enemy_name]
@@ -277,37 +250,37 @@ def show_bestiary(discovered_enemies):
                 elif enemy_name == "Spider":
                     health_desc = "Very Low Health, Swarm Enemy"
                 
-                print(f"  🐺 {enemy_name}: {base_hp} HP - {health_desc}")
+                say(f"  🐺 {enemy_name}: {base_hp} HP - {health_desc}")
             elif enemy_name == "Training Dummy":
-                print("  🎯 Training Dummy: ??? HP - Practice Target (No Rewards)")
+                say("  🎯 Training Dummy: ??? HP - Practice Target (No Rewards)")
             elif enemy_name == "Troll":
-                print("  👹 Troll: ??? HP - Boss Enemy (Drops Mysterious Key)")
+                say("  👹 Troll: ??? HP - Boss Enemy (Drops Mysterious Key)")
     
     # Combat tips
-    print("\n💡 Combat Tips:")
-    print("  - Enemies scale with distance from (0,0) but cap at 100 rooms")
-    print("  - Boss enemies can be escaped from by moving away")
-    print("  - Regular enemies block your path until defeated")
-    print("  - Hungry Wolves: Kill quickly due to high attack potential")
-    print("  - Orcs: Tough opponents, use your best weapons")
-    print("  - Rats: Attack twice per turn but deal reduced damage")
-    print("  - Spiders: Attack in swarms of 2-4, very low damage")
+    say("\n💡 Combat Tips:")
+    say("  - Enemies scale with distance from (0,0) but cap at 100 rooms")
+    say("  - Boss enemies can be escaped from by moving away")
+    say("  - Regular enemies block your path until defeated")
+    say("  - Hungry Wolves: Kill quickly due to high attack potential")
+    say("  - Orcs: Tough opponents, use your best weapons")
+    say("  - Rats: Attack twice per turn but deal reduced damage")
+    say("  - Spiders: Attack in swarms of 2-4, very low damage")
     
     if developer_mode:
-        print("  - Baby Dragons: Floor 2 boss, tougher than Trolls but drop valuable scales")
+        say("  - Baby Dragons: Floor 2 boss, tougher than Trolls but drop valuable scales")
     
-    print("==================")
+    say("==================")
 
 def show_help():
     """Display help information organized by sections"""
-    print("\n=== HELP SYSTEM ===")
-    print("Type 'guide' followed by a section name to view specific help:")
-    print("  guide combat     - Combat commands and tips")
-    print("  guide movement   - Movement and exploration")
-    print("  guide items      - Weapons, armor, and inventory")
-    print("  guide resources  - Potions, crystals, and resources")
-    print("  guide progression - Keys, floors, and progression")
-    print("  guide utility    - Map, waypoints, save/load")
+    say("\n=== HELP SYSTEM ===")
+    say("Type 'guide' followed by a section name to view specific help:")
+    say("  guide combat     - Combat commands and tips")
+    say("  guide movement   - Movement and exploration")
+    say("  guide items      - Weapons, armor, and inventory")
+    say("  guide resources  - Potions, crystals, and resources")
+    say("  guide progression - Keys, floors, and progression")
+    say("  guide utility    - Map, waypoints, save/load")
     
     # Show mod guide sections automatically
     try:
@@ -329,182 +302,185 @@ def show_help():
                     except ImportError:
                         continue  # Skip if can't check permission
             
-            print(f"  guide {guide_name:<10} - {description}")
+            say(f"  guide {guide_name:<10} - {description}")
     except ImportError:
         pass  # Mod system not available
     
-    print("  guide all        - Show all commands")
-    print("==================")
+    say("  guide all        - Show all commands")
+    say("==================")
 
 def show_combat_help():
     """Display combat-related help"""
-    print("\n=== COMBAT HELP ===")
-    print("Commands:")
-    print("  attack - Attack an enemy")
-    print("  run - Run away from an enemy (costs 10 stamina)")
-    print("\nCombat Tips:")
-    print("  - All weapons have a 5% chance to land critical hits (2x damage)")
-    print("  - Daggers have 20% crit chance and deal 2.6x damage on crits")
-    print("  - Axes deal 2.8x damage on critical hits for devastating blows")
-    print("  - Magic staffs require mana to use but deal extra damage and have high durability")
-    print("  - Boss enemies can be escaped from by moving away")
-    print("  - Regular enemies block your path until defeated")
-    print("  - Hungry Wolves: Kill quickly due to high attack potential")
-    print("  - Orcs: Tough opponents, use your best weapons")
-    print("  - Rats: Attack twice per turn but deal reduced damage")
-    print("==================")
+    say("\n=== COMBAT HELP ===")
+    say("Commands:")
+    say("  attack - Attack an enemy")
+    say("  odds - Show your exact chances of winning the fight in this room")
+    say("  fight [hp N] [durability N] [spell NAME] - Attack until the fight ends, your HP falls to N")
+    say("      (default: a quarter of your max HP), your weapon is down to N durability, casting NAME each turn")
+    say("  run - Run away from an enemy (costs 10 stamina)")
+    say("\nCombat Tips:")
+    say("  - All weapons have a 5% chance to land critical hits (2x damage)")
+    say("  - Daggers have 20% crit chance and deal 2.6x damage on crits")
+    say("  - Axes deal 2.8x damage on critical hits for devastating blows")
+    say("  - Magic staffs require mana to use but deal extra damage and have high durability")
+    say("  - Boss enemies can be escaped from by moving away")
+    say("  - Regular enemies block your path until defeated")
+    say("  - Hungry Wolves: Kill quickly due to high attack potential")
+    say("  - Orcs: Tough opponents, use your best weapons")
+    say("  - Rats: Attack twice per turn but deal reduced damage")
+    say("==================")
 
 def show_movement_help():
     """Display movement-related help"""
-    print("\n=== MOVEMENT HELP ===")
-    print("Commands:")
-    print("  north/south/east/west - Move in that direction")
-    print("  descend - Use stairwell to go deeper")
-    print("\nMovement Tips:")
-    print("  - You can escape from boss enemies by moving away")
-    print("  - Regular enemies will block your path until defeated")
-    print("  - Training dummy at (0,0) on Floor 1 can be moved past freely")
-    print("  - Each floor has its own world to explore")
-    print("==================")
+    say("\n=== MOVEMENT HELP ===")
+    say("Commands:")
+    say("  north/south/east/west - Move in that direction")
+    say("  descend - Use stairwell to go deeper")
+    say("\nMovement Tips:")
+    say("  - You can escape from boss enemies by moving away")
+    say("  - Regular enemies will block your path until defeated")
+    say("  - Training dummy at (0,0) on Floor 1 can be moved past freely")
+    say("  - Each floor has its own world to explore")
+    say("==================")
 
 def show_items_help():
     """Display item-related help"""
-    print("\n=== ITEMS HELP ===")
-    print("Commands:")
-    print("  take - Pick up weapons, armor, or keys")
-    print("    • Use 'take all' to pick up everything you can carry")
-    print("    • Smart inventory management - skips items when full")
-    print("  drop - Drop weapons or armor (shows both types)")
-    print("  switch - Switch between weapons (includes fists option)")
-    print("  equip - Equip armor")
-    print("  equipment - Show all weapons and armor")
-    print("  use - Use spell scrolls, waypoint scrolls, or potions")
-    print("  repair - Repair weapons and armor at shops")
-    print("  repair_status - Show repair status and costs for all weapons")
-    print("\nItem Tips:")
-    print("  - Weapons and armor have durability that decreases with use")
-    print("  - Items and enemies scale with distance from (0,0) but cap at 100 rooms away")
-    print("  - Floor 1 gear caps at ~25 damage and ~40 durability")
-    print("  - To find better gear, you must descend to higher floors")
-    print("  - Use 'inventory' to see your weapons and 'armor' to see armor")
-    print("  - Spell Books can cast learned spells (buy scrolls from shops) and have high durability")
-    print("  - Use 'switch' to select fists (option 0) if you have no spells for Spell Book")
-    print("  - Use 'repair' at shops to restore durability to weapons and armor")
-    print("==================")
+    say("\n=== ITEMS HELP ===")
+    say("Commands:")
+    say("  take - Pick up weapons, armor, or keys")
+    say("    • Use 'take all' to pick up everything you can carry")
+    say("    • Smart inventory management - skips items when full")
+    say("  drop - Drop weapons or armor (shows both types)")
+    say("  switch - Switch between weapons (includes fists option)")
+    say("  equip - Equip armor")
+    say("  equipment - Show all weapons and armor")
+    say("  use - Use spell scrolls, waypoint scrolls, or potions")
+    say("  repair - Repair weapons and armor at shops")
+    say("  repair_status - Show repair status and costs for all weapons")
+    say("\nItem Tips:")
+    say("  - Weapons and armor have durability that decreases with use")
+    say("  - Items and enemies scale with distance from (0,0) but cap at 100 rooms away")
+    say("  - Floor 1 gear caps at ~25 damage and ~40 durability")
+    say("  - To find better gear, you must descend to higher floors")
+    say("  - Use 'inventory' to see your weapons and 'armor' to see armor")
+    say("  - Spell Books can cast learned spells (buy scrolls from shops) and have high durability")
+    say("  - Use 'switch' to select fists (option 0) if you have no spells for Spell Book")
+    say("  - Use 'repair' at shops to restore durability to weapons and armor")
+    say("==================")
 
 def show_resources_help():
     """Display resource-related help"""
-    print("\n=== RESOURCES HELP ===")
-    print("Commands:")
-    print("  consume - Use crystals or potions (automatically detects what's available)")
-    print("\nResource Tips:")
-    print("  - Health potions restore 30 HP")
-    print("  - Stamina potions restore 10 stamina")
-    print("  - Mana potions restore 15 mana")
-    print("  - Life crystals: +10 max HP, +20 current HP")
-    print("  - Stamina crystals: +10 max stamina, +10 current stamina")
-    print("  - Mana crystals: +10 max mana, +10 current mana")
-    print("  - Crystal rooms can have single, dual, or triple crystals")
-    print("  - The consume command automatically detects and uses the best available resource")
-    print("==================")
+    say("\n=== RESOURCES HELP ===")
+    say("Commands:")
+    say("  consume - Use crystals or potions (automatically detects what's available)")
+    say("\nResource Tips:")
+    say("  - Health potions restore 30 HP")
+    say("  - Stamina potions restore 10 stamina")
+    say("  - Mana potions restore 15 mana")
+    say("  - Life crystals: +10 max HP, +20 current HP")
+    say("  - Stamina crystals: +10 max stamina, +10 current stamina")
+    say("  - Mana crystals: +10 max mana, +10 current mana")
+    say("  - Crystal rooms can have single, dual, or triple crystals")
+    say("  - The consume command automatically detects and uses the best available resource")
+    say("==================")
 
 def show_progression_help():
     """Display progression-related help"""
-    print("\n=== PROGRESSION HELP ===")
-    print("Commands:")
-    print("  take_key - Pick up a mysterious key")
-    print("  drop_mysterious_key - Drop your mysterious key")
-    print("  open - Open a chest")
-    print("  loot - Loot treasure chambers")
-    print("  buy - Buy from a shop")
-    print("  repair - Repair weapons and armor at shops")
-    print("  repair_status - Show repair status and costs for all weapons")
-    print("\nProgression Tips:")
-    print("  - Mysterious keys are floor-specific and unlock stairwells permanently")
-    print("  - Bosses drop mysterious keys for their specific floor")
-    print("  - Golden keys (max 3) are needed to loot treasure chambers")
-    print("  - Golden keys can be bought from shops for 50 gold")
-    print("  - Treasure chambers contain gold, potions, and mysterious keys")
-    print("  - Stairwell rooms (1 in 25) require mysterious keys to descend")
-    print("  - Repair costs scale with item power (damage/defense)")
-    print("  - Blacksmith shops (30% chance) offer better repair prices and bonus durability!")
-    print("  - Blacksmith shops can upgrade max durability (+1 for 2 gold)")
-    print("  - Use 'repair_status' to see repair costs for all weapons")
-    print("==================")
+    say("\n=== PROGRESSION HELP ===")
+    say("Commands:")
+    say("  take_key - Pick up a mysterious key")
+    say("  drop_mysterious_key - Drop your mysterious key")
+    say("  open - Open a chest")
+    say("  loot - Loot treasure chambers")
+    say("  buy - Buy from a shop")
+    say("  repair - Repair weapons and armor at shops")
+    say("  repair_status - Show repair status and costs for all weapons")
+    say("\nProgression Tips:")
+    say("  - Mysterious keys are floor-specific and unlock stairwells permanently")
+    say("  - Bosses drop mysterious keys for their specific floor")
+    say("  - Golden keys (max 3) are needed to loot treasure chambers")
+    say("  - Golden keys can be bought from shops for 50 gold")
+    say("  - Treasure chambers contain gold, potions, and mysterious keys")
+    say("  - Stairwell rooms (1 in 25) require mysterious keys to descend")
+    say("  - Repair costs scale with item power (damage/defense)")
+    say("  - Blacksmith shops (30% chance) offer better repair prices and bonus durability!")
+    say("  - Blacksmith shops can upgrade max durability (+1 for 2 gold)")
+    say("  - Use 'repair_status' to see repair costs for all weapons")
+    say("==================")
 
 def show_utility_help():
     """Display utility command help"""
-    print("\n=== UTILITY HELP ===")
-    print("Commands:")
-    print("  map - Show map and waypoints")
-    print("  waypoint - Manage waypoints (add, view, delete, teleport)")
-    print("  bestiary - Show information about enemies")
-    print("  level - Show level status and XP progress")
-    print("  stats - Show detailed player statistics")
-    print("  save - Save the game (asks for save name)")
-    print("  load - Load your saved game")
-    print("  saves - List and view all save files")
-    print("  delete_save - Delete a specific save file")
-    print("  bug_report - Generate a manual bug report for testing")
-    print("  guide - Show this help system")
-    print("  quit - Exit the game")
-    print("\nSave System:")
-    print("  - Multiple named save files supported")
-    print("  - Press Enter for default save, or type a custom name")
-    print("  - Use 'saves' to see all your save files")
-    print("  - Use 'delete_save' to remove unwanted saves")
-    print("  - Auto-save: Every 3 rooms moved, on quit, and before restart")
-    print("  - Auto-save slot: Slot 0 (Auto Save - Most Recent)")
-    print("\nUtility Tips:")
-    print("  - Use waypoints to mark important locations (max 10)")
-    print("  - Waypoint scrolls can teleport you to any waypoint, even during combat")
-    print("  - Waypoint scrolls can be bought from shops for 40 gold (max 3)")
-    print("  - The training dummy at (0,0) on Floor 1 can be attacked without losing durability")
-    print("==================")
+    say("\n=== UTILITY HELP ===")
+    say("Commands:")
+    say("  map - Show map and waypoints")
+    say("  waypoint - Manage waypoints (add, view, delete, teleport)")
+    say("  bestiary - Show information about enemies")
+    say("  level - Show level status and XP progress")
+    say("  stats - Show detailed player statistics")
+    say("  save - Save the game (asks for save name)")
+    say("  load - Load your saved game")
+    say("  saves - List and view all save files")
+    say("  delete_save - Delete a specific save file")
+    say("  bug_report - Generate a manual bug report for testing")
+    say("  guide - Show this help system")
+    say("  quit - Exit the game")
+    say("\nSave System:")
+    say("  - Multiple named save files supported")
+    say("  - Press Enter for default save, or type a custom name")
+    say("  - Use 'saves' to see all your save files")
+    say("  - Use 'delete_save' to remove unwanted saves")
+    say("  - Auto-save: Every 3 rooms moved, on quit, and before restart")
+    say("  - Auto-save slot: Slot 0 (Auto Save - Most Recent)")
+    say("\nUtility Tips:")
+    say("  - Use waypoints to mark important locations (max 10)")
+    say("  - Waypoint scrolls can teleport you to any waypoint, even during combat")
+    say("  - Waypoint scrolls can be bought from shops for 40 gold (max 3)")
+    say("  - The training dummy at (0,0) on Floor 1 can be attacked without losing durability")
+    say("==================")
 
 def show_all_help():
     """Display all commands"""
-    print("\n=== ALL COMMANDS ===")
-    print("Combat:")
-    print("  attack, run")
-    print("Movement:")
-    print("  north/south/east/west, descend")
-    print("Items:")
-    print("  take, drop, switch, equip, equipment, use, repair, repair_status")
-    print("Resources:")
-    print("  consume")
-    print("Progression:")
-    print("  open, loot, buy, repair")
-    print("Utility:")
-    print("  map, waypoint, bestiary, level, stats, save, load, saves, delete_save, bug_report, guide, quit")
-    print("==================")
+    say("\n=== ALL COMMANDS ===")
+    say("Combat:")
+    say("  attack, run")
+    say("Movement:")
+    say("  north/south/east/west, descend")
+    say("Items:")
+    say("  take, drop, switch, equip, equipment, use, repair, repair_status")
+    say("Resources:")
+    say("  consume")
+    say("Progression:")
+    say("  open, loot, buy, repair")
+    say("Utility:")
+    say("  map, waypoint, bestiary, level, stats, save, load, saves, delete_save, bug_report, guide, quit")
+    say("==================")
 
 def show_developer_help():
     """Display developer tools help (only shown if developer mod is loaded)"""
-    print("\n=== DEVELOPER TOOLS HELP ===")
-    print("⚠️  WARNING: These are developer tools for testing and debugging!")
-    print("⚠️  Use responsibly and only in development environments!")
-    print("\nCommands:")
-    print("  dev_info - Show developer mod information and status")
-    print("  dev_teleport <floor> <x> <y> - Teleport to any location")
-    print("  dev_stats <stat> <value> - Modify player stats")
-    print("  dev_weapon <name> <damage> <durability> - Create custom weapon")
-    print("  dev_spawn <type> <name> - Spawn enemies, items, or equipment")
-    print("  dev_disable - Disable developer mode")
-    print("\nUsage Examples:")
-    print("  dev_teleport 3 15 20     - Move to Floor 3, coordinates (15,20)")
-    print("  dev_stats hp 100          - Set current HP to 100")
-    print("  dev_stats max_hp 200      - Set maximum HP to 200")
-    print("  dev_weapon 'Super Sword' 50 200 - Create weapon with 50 damage, 200 durability")
-    print("  dev_spawn enemy 'Baby Dragon'  - Spawn a baby dragon enemy")
-    print("  dev_spawn weapon 'Laser'  - Spawn a laser weapon")
-    print("\nAvailable Stats:")
-    print("  hp, max_hp, stamina, max_stamina, mana, max_mana, money")
-    print("\nSpawn Types:")
-    print("  enemy, weapon, armor, item")
-    print("\nSecurity:")
-    print("  - Developer mode must be enabled at startup")
-    print("  - All commands check if developer mode is active")
-    print("  - Can be disabled anytime with 'dev_disable'")
-    print("  - Commands are isolated from normal gameplay")
-    print("==================") 
\ No newline at end of file
+    say("\n=== DEVELOPER TOOLS HELP ===")
+    say("⚠️  WARNING: These are developer tools for testing and debugging!")
+    say("⚠️  Use responsibly and only in development environments!")
+    say("\nCommands:")
+    say("  dev_info - Show developer mod information and status")
+    say("  dev_teleport <floor> <x> <y> - Teleport to any location")
+    say("  dev_stats <stat> <value> - Modify player stats")
+    say("  dev_weapon <name> <damage> <durability> - Create custom weapon")
+    say("  dev_spawn <type> <name> - Spawn enemies, items, or equipment")
+    say("  dev_disable - Disable developer mode")
+    say("\nUsage Examples:")
+    say("  dev_teleport 3 15 20     - Move to Floor 3, coordinates (15,20)")
+    say("  dev_stats hp 100          - Set current HP to 100")
+    say("  dev_stats max_hp 200      - Set maximum HP to 200")
+    say("  dev_weapon 'Super Sword' 50 200 - Create weapon with 50 damage, 200 durability")
+    say("  dev_spawn enemy 'Baby Dragon'  - Spawn a baby dragon enemy")
+    say("  dev_spawn weapon 'Laser'  - Spawn a laser weapon")
+    say("\nAvailable Stats:")
+    say("  hp, max_hp, stamina, max_stamina, mana, max_mana, money")
+    say("\nSpawn Types:")
+    say("  enemy, weapon, armor, item")
+    say("\nSecurity:")
+    say("  - Developer mode must be enabled at startup")
+    say("  - All commands check if developer mode is active")
+    say("  - Can be disabled anytime with 'dev_disable'")
+    say("  - Commands are isolated from normal gameplay")
+    say("==================") 
\ No newline at end of file
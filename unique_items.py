@@ -1,6 +1,7 @@
 import random
 import json
 import os
+from game_io import say
 
 # File to track discovered unique items
 UNIQUE_ITEMS_FILE = "unique_items.json"
@@ -190,17 +191,17 @@ def create_unique_consumable(unique_id, x, y, floor):
 def show_unique_collection():
     """Display all discovered unique items"""
     if not discovered_uniques:
-        print("You haven't discovered any unique items yet.")
+        say("You haven't discovered any unique items yet.")
         return
     
-    print("\n=== UNIQUE ITEMS COLLECTION ===")
+    say("\n=== UNIQUE ITEMS COLLECTION ===")
     for unique_id, info in discovered_uniques.items():
-        print(f"  • {unique_id}")
+        say(f"  • {unique_id}")
         if info.get("location"):
             loc = info["location"]
             if "floor" in loc and "x" in loc and "y" in loc:
-                print(f"    Found at: Floor {loc['floor']} ({loc['x']}, {loc['y']})")
-    print("================================")
+                say(f"    Found at: Floor {loc['floor']} ({loc['x']}, {loc['y']})")
+    say("================================")
 
 # Initialize unique items system
 # Note: load_unique_items() is called when needed, not at module import
@@ -1,41 +1,47 @@
 import random
-from constants import weapon_names, enemy_stats, spells
+import hashlib
+import json
+from collections import OrderedDict
+from constants import weapon_names, enemy_stats, spells, COMPACT_ROOMS
+from models import compact_room, to_plain
+
+armor_names = ["Leather Armor", "Iron Mail", "Bone Plate", "Troll Hide"]
 
 def distance_from_start(x, y):
     return abs(x) + abs(y)
 
-def create_weapon(x, y):
-    base_damage = random.randint(5, 10)
-    base_durability = random.randint(5, 15)
+def create_weapon(x, y, rng=random):
+    base_damage = rng.randint(5, 10)
+    base_durability = rng.randint(5, 15)
     distance = distance_from_start(x, y)
     # Cap scaling at 100 rooms away from (0,0)
     capped_distance = min(distance, 100)
     # Adjust scaling to cap at ~25 damage and ~40 durability
     scaled = capped_distance // 4  # Reduced from // 2
-    damage_bonus = scaled * random.randint(1, 2)
-    durability_bonus = scaled * random.randint(1, 2)
-    weapon_name = random.choice(weapon_names)
+    damage_bonus = scaled * rng.randint(1, 2)
+    durability_bonus = scaled * rng.randint(1, 2)
+    weapon_name = rng.choice(weapon_names)
     
     # 4% chance for weapon to spawn broken
-    is_broken = random.random() < 0.04
+    is_broken = rng.random() < 0.04
     
     # Make staffs stronger but require mana
     if weapon_name == "Magic Staff":
-        damage = base_damage + damage_bonus + random.randint(1, 3)  # +1 to +3 extra damage
+        damage = base_damage + damage_bonus + rng.randint(1, 3)  # +1 to +3 extra damage
         if is_broken:
             # Broken weapons get enhanced stats: +50% damage, +25% crit chance, +50% crit damage, -25% mana cost
             damage = int(damage * 1.5)
             crit_chance = 0.25  # 25% crit chance
             crit_damage = 3.0   # 3x crit damage
-            mana_cost = max(5, int((damage + random.randint(-2, 2)) * 0.75))  # 25% less mana cost
+            mana_cost = max(5, int((damage + rng.randint(-2, 2)) * 0.75))  # 25% less mana cost
         else:
             crit_chance = 0.05  # Base 5% crit chance
             crit_damage = 2.0   # Base 2x crit damage
-            mana_cost = max(10, damage + random.randint(-2, 2))  # Base 10 + scaling with damage
+            mana_cost = max(10, damage + rng.randint(-2, 2))  # Base 10 + scaling with damage
         
-        durability = 0 if is_broken else (base_durability + durability_bonus + random.randint(5, 8))  # +5 to +8 extra durability
+        durability = 0 if is_broken else (base_durability + durability_bonus + rng.randint(5, 8))  # +5 to +8 extra durability
         # Max durability scales 1.25x more than regular durability with some RNG
-        max_durability_bonus = int((durability_bonus * 1.25) + random.randint(2, 6))  # 1.25x scaling + 2-6 RNG
+        max_durability_bonus = int((durability_bonus * 1.25) + rng.randint(2, 6))  # 1.25x scaling + 2-6 RNG
         max_durability = durability + max_durability_bonus
         
         return {
@@ -50,9 +56,9 @@ def create_weapon(x, y):
             "crit_damage": crit_damage
         }
     elif weapon_name == "Spell Book":
-        durability = 0 if is_broken else (random.randint(15, 25) + durability_bonus + random.randint(5, 8))  # +5 to +8 extra durability
+        durability = 0 if is_broken else (rng.randint(15, 25) + durability_bonus + rng.randint(5, 8))  # +5 to +8 extra durability
         # Max durability scales 1.25x more than regular durability with some RNG
-        max_durability_bonus = int((durability_bonus * 1.25) + random.randint(2, 6))  # 1.25x scaling + 2-6 RNG
+        max_durability_bonus = int((durability_bonus * 1.25) + rng.randint(2, 6))  # 1.25x scaling + 2-6 RNG
         max_durability = durability + max_durability_bonus
         
         return {
@@ -65,7 +71,7 @@ def create_weapon(x, y):
     elif weapon_name == "Sword":
         # Swords are versatile - good damage and durability for all situations
         # +2-4 base damage and +3-5 durability bonus
-        damage = base_damage + damage_bonus + random.randint(2, 4)
+        damage = base_damage + damage_bonus + rng.randint(2, 4)
         if is_broken:
             # Broken weapons get enhanced stats: +50% damage, +25% crit chance, +50% crit damage
             damage = int(damage * 1.5)
@@ -75,9 +81,9 @@ def create_weapon(x, y):
             crit_chance = 0.05  # Base 5% crit chance
             crit_damage = 2.0   # Base 2x crit damage
         
-        durability = 0 if is_broken else (base_durability + durability_bonus + random.randint(3, 5))
+        durability = 0 if is_broken else (base_durability + durability_bonus + rng.randint(3, 5))
         # Max durability scales 1.25x more than regular durability with some RNG
-        max_durability_bonus = int((durability_bonus * 1.25) + random.randint(2, 6))  # 1.25x scaling + 2-6 RNG
+        max_durability_bonus = int((durability_bonus * 1.25) + rng.randint(2, 6))  # 1.25x scaling + 2-6 RNG
         max_durability = durability + max_durability_bonus
         
         return {
@@ -102,7 +108,7 @@ def create_weapon(x, y):
         
         durability = 0 if is_broken else (base_durability + durability_bonus)
         # Max durability scales 1.25x more than regular durability with some RNG
-        max_durability_bonus = int((durability_bonus * 1.25) + random.randint(2, 6))  # 1.25x scaling + 2-6 RNG
+        max_durability_bonus = int((durability_bonus * 1.25) + rng.randint(2, 6))  # 1.25x scaling + 2-6 RNG
         max_durability = durability + max_durability_bonus
         
         return {
@@ -115,58 +121,69 @@ def create_weapon(x, y):
             "crit_damage": crit_damage
         }
 
-def create_armor(x, y):
-    base_defense = random.randint(2, 4)  # Reduced from 5-8 to 2-4
-    base_durability = random.randint(8, 15)
+def create_armor(x, y, rng=random):
+    base_defense = rng.randint(2, 4)  # Reduced from 5-8 to 2-4
+    base_durability = rng.randint(8, 15)
     distance = distance_from_start(x, y)
     # Cap scaling at 100 rooms away from (0,0)
     capped_distance = min(distance, 100)
     scaled = capped_distance // 4  # Reduced scaling from //2 to //4
     
     # 4% chance for armor to spawn broken
-    is_broken = random.random() < 0.04
+    is_broken = rng.random() < 0.04
     
-    durability = 0 if is_broken else (base_durability + scaled * random.choice([0, 1]))
+    durability_roll = 0 if is_broken else rng.choice([0, 1])
+    max_durability_roll = rng.choice([0, 1])
+    max_durability_extra = rng.randint(2, 6)
+    name = rng.choice(armor_names)
+    defense_roll = rng.choice([0, 1])
+    return build_armor(scaled, base_defense, base_durability, is_broken, durability_roll,
+                       max_durability_roll, max_durability_extra, name, defense_roll)
+
+def build_armor(scaled, base_defense, base_durability, is_broken, durability_roll,
+                max_durability_roll, max_durability_extra, name, defense_roll):
+    """Armor dict from already drawn rolls (shared by create_armor and bulk generation)"""
+    durability = 0 if is_broken else (base_durability + scaled * durability_roll)
     # Max durability scales 1.25x more than regular durability with some RNG
-    max_durability_bonus = int((scaled * random.choice([0, 1]) * 1.25) + random.randint(2, 6))  # 1.25x scaling + 2-6 RNG
+    max_durability_bonus = int((scaled * max_durability_roll * 1.25) + max_durability_extra)  # 1.25x scaling + 2-6 RNG
     max_durability = durability + max_durability_bonus
     
     return {
-        "name": random.choice(["Leather Armor", "Iron Mail", "Bone Plate", "Troll Hide"]),
-        "defense": base_defense + scaled * random.choice([0, 1]),
+        "name": name,
+        "defense": base_defense + scaled * defense_roll,
         "durability": durability,
         "max_durability": max_durability
     }
 
-def create_chest_weapon(dist):
-    base_damage = random.randint(5, 10)
-    base_durability = random.randint(5, 15)
+def create_chest_weapon(dist, rng=random):
+    base_damage = rng.randint(5, 10)
+    base_durability = rng.randint(5, 15)
     # Cap scaling at 100 rooms away from (0,0)
     capped_dist = min(dist, 100)
     # Adjust scaling to cap at ~25 damage and ~40 durability
     scaled = capped_dist // 4  # Reduced from // 2
-    damage_bonus = scaled * random.randint(1, 2)
-    durability_bonus = scaled * random.randint(1, 2)
-    weapon_name = random.choice(weapon_names)
+    damage_bonus = scaled * rng.randint(1, 2)
+    durability_bonus = scaled * rng.randint(1, 2)
+    weapon_name = rng.choice(weapon_names)
     
     # 4% chance for weapon to spawn broken
-    is_broken = random.random() < 0.04
+    is_broken = rng.random() < 0.04
     
     # Make staffs stronger but require mana
     if weapon_name == "Magic Staff":
-        damage = base_damage + damage_bonus + random.randint(1, 3)  # +1 to +3 extra damage
+        damage = base_damage + damage_bonus + rng.randint(1, 3)  # +1 to +3 extra damage
         if is_broken:
             # Broken weapons get enhanced stats: +50% damage, +25% crit chance, +50% crit damage, -25% mana cost
             damage = int(damage * 1.5)
             crit_chance = 0.25  # 25% crit chance
             crit_damage = 3.0   # 3x crit damage
-            mana_cost = max(5, int((damage + random.randint(-2, 2)) * 0.75))  # 25% less mana cost
+            mana_cost = max(5, int((damage + rng.randint(-2, 2)) * 0.75))  # 25% less mana cost
         else:
             crit_chance = 0.05  # Base 5% crit chance
             crit_damage = 2.0   # Base 2x crit damage
-            mana_cost = max(10, damage + random.randint(-2, 2))  # Base 10 + scaling with damage
+            mana_cost = max(10, damage + rng.randint(-2, 2))  # Base 10 + scaling with damage
         
-        durability = 0 if is_broken else (base_durability + durability_bonus + random.randint(5, 8))  # +5 to +8 extra durability
+        durability = 0 if is_broken else (base_durability + durability_bonus + rng.randint(5, 8))  # +5 to +8 extra durability
         return {
             "name": weapon_name,
             "damage": damage,
@@ -179,7 +196,7 @@ def create_chest_weapon(dist):
             "crit_damage": crit_damage
         }
     elif weapon_name == "Spell Book":
-        durability = 0 if is_broken else (random.randint(15, 25) + durability_bonus + random.randint(5, 8))  # +5 to +8 extra durability
+        durability = 0 if is_broken else (rng.randint(15, 25) + durability_bonus + rng.randint(5, 8))  # +5 to +8 extra durability
         return {
             "name": weapon_name,
             "damage": "???",
@@ -198,9 +215,9 @@ def create_chest_weapon(dist):
             crit_chance = 0.05  # Base 5% crit chance
             crit_damage = 2.0   # Base 2x crit damage
         
-            durability = 0 if is_broken else (base_durability + durability_bonus)
+        durability = 0 if is_broken else (base_durability + durability_bonus)
     # Max durability scales 1.25x more than regular durability with some RNG
-    max_durability_bonus = int((durability_bonus * 1.25) + random.randint(2, 6))  # 1.25x scaling + 2-6 RNG
+    max_durability_bonus = int((durability_bonus * 1.25) + rng.randint(2, 6))  # 1.25x scaling + 2-6 RNG
     max_durability = durability + max_durability_bonus
     
     return {
@@ -213,32 +230,32 @@ def create_chest_weapon(dist):
         "crit_damage": crit_damage
     }
 
-def create_chest_armor(x, y):
-    dist = distance_from_start(x, y) + random.randint(3, 5)
+def create_chest_armor(x, y, rng=random):
+    dist = distance_from_start(x, y) + rng.randint(3, 5)
     # Cap scaling at 100 rooms away from (0,0)
     capped_dist = min(dist, 100)
     scaled = capped_dist // 4  # Reduced scaling from //2 to //4
-    base_defense = random.randint(3, 6)  # Reduced from 5-8 to 3-6
-    base_durability = random.randint(8, 15)
-    bonus_def = scaled * random.choice([1, 2])
-    bonus_dur = scaled * random.choice([1, 2])
+    base_defense = rng.randint(3, 6)  # Reduced from 5-8 to 3-6
+    base_durability = rng.randint(8, 15)
+    bonus_def = scaled * rng.choice([1, 2])
+    bonus_dur = scaled * rng.choice([1, 2])
     
     # 4% chance for armor to spawn broken
-    is_broken = random.random() < 0.04
+    is_broken = rng.random() < 0.04
     
     durability = 0 if is_broken else (base_durability + bonus_dur)
     # Max durability scales 1.25x more than regular durability with some RNG
-    max_durability_bonus = int((bonus_dur * 1.25) + random.randint(2, 6))  # 1.25x scaling + 2-6 RNG
+    max_durability_bonus = int((bonus_dur * 1.25) + rng.randint(2, 6))  # 1.25x scaling + 2-6 RNG
     max_durability = durability + max_durability_bonus
     
     return {
-        "name": random.choice(["Enchanted Mail", "Reinforced Hide", "Darksteel Vest", "Trollbone Harness"]),
+        "name": rng.choice(["Enchanted Mail", "Reinforced Hide", "Darksteel Vest", "Trollbone Harness"]),
         "defense": base_defense + bonus_def,
         "durability": durability,
         "max_durability": max_durability
     }
 
-def create_enemy(x, y, force_boss=None):
+def create_enemy(x, y, force_boss=None, rng=random):
     dist = distance_from_start(x, y)
     # Cap scaling at 100 rooms away from (0,0)
     capped_dist = min(dist, 100)
@@ -247,33 +264,37 @@ def create_enemy(x, y, force_boss=None):
 
     if force_boss == "Troll":
         base_hp = 60
-        variation = random.randint(-3, 3)
+        variation = rng.randint(-3, 3)
         return {
             "name": "Troll",
-            "hp": base_hp + variation + scaled * random.randint(1, 2),
+            "hp": base_hp + variation + scaled * rng.randint(1, 2),
             "base_attack": 10 + scaled,
             "armor_pierce": 2 + scaled // 3,  # Bosses have more armor piercing, scales with distance from (0,0)
             "is_boss": True
         }
     elif force_boss == "Baby Dragon":
         base_hp = 75  # Slightly more HP than Troll
-        variation = random.randint(-5, 5)
+        variation = rng.randint(-5, 5)
         return {
             "name": "Baby Dragon",
-            "hp": base_hp + variation + scaled * random.randint(1, 3),  # Better scaling than Troll
+            "hp": base_hp + variation + scaled * rng.randint(1, 3),  # Better scaling than Troll
             "base_attack": int((12 + scaled) * 1.4),  # 1.4x damage multiplier
             "armor_pierce": 3 + scaled // 2,  # More armor piercing than Troll
             "is_boss": True
         }
 
-    name = random.choice(list(enemy_stats.keys()))
+    name = rng.choice(list(enemy_stats.keys()))
+    variation = rng.randint(-3, 3)
+    return build_enemy(scaled, name, variation, rng.randint(1, 2))
+
+def build_enemy(scaled, name, variation, hp_roll):
+    """Regular enemy dict from already drawn rolls (shared by create_enemy and bulk generation)"""
     base_hp = enemy_stats[name]
-    variation = random.randint(-3, 3)
     
     # Create enemy with base stats
     enemy = {
         "name": name,
-        "hp": base_hp + variation + scaled * random.randint(1, 2),
+        "hp": base_hp + variation + scaled * hp_roll,
         "base_attack": 5 + scaled,
         "armor_pierce": 1 + scaled // 6,  # Regular enemies have some armor piercing, scales with distance from (0,0)
         "is_boss": False
@@ -290,14 +311,14 @@ def create_enemy(x, y, force_boss=None):
     
     return enemy
 
-def create_spider_swarm(x, y):
+def create_spider_swarm(x, y, rng=random):
     """Create a swarm of spiders with 2-4 spiders based on probability"""
     dist = distance_from_start(x, y)
     capped_dist = min(dist, 100)
     scaled = capped_dist // 4
     
     # Determine swarm size based on probability
-    rand = random.random()
+    rand = rng.random()
     if rand < 0.5:
         swarm_size = 2  # 50% chance
     elif rand < 0.8:
@@ -309,10 +330,10 @@ def create_spider_swarm(x, y):
     spiders = []
     for i in range(swarm_size):
         base_hp = 6
-        variation = random.randint(-2, 2)
+        variation = rng.randint(-2, 2)
         spider = {
             "name": "Spider",
-            "hp": base_hp + variation + scaled * random.randint(0, 1),
+            "hp": base_hp + variation + scaled * rng.randint(0, 1),
             "base_attack": 2 + scaled,  # Very low damage
             "armor_pierce": 0,  # No armor piercing
             "is_boss": False,
@@ -322,167 +343,208 @@ def create_spider_swarm(x, y):
     
     return spiders
 
-def create_room(floor, x, y, learned_spells):
+def create_stairwell_room():
+    """Stairwell down to the next floor - requires a mysterious key"""
+    return {
+        "description": "You find a mysterious stairwell leading deeper into the dungeon...",
+        "type": "stairwell",
+        "enemy": None,
+        "weapons": [],
+        "armors": [],
+        "shop": None,
+        "chest": None,
+        "life_crystal": False,
+        "requires_mysterious_key": True
+    }
+
+def create_key_door_room(floor, x, y, rng=random):
+    """Golden key door guarded by the floor's boss"""
+    # Choose boss based on floor
+    if floor == 2:
+        boss_type = "Baby Dragon"
+        description = "You find a glowing golden door… and a Baby Dragon guarding it!"
+    else:
+        boss_type = "Troll"
+        description = "You find a glowing golden door… and the Troll guarding it!"
+    
+    return {
+        "description": description,
+        "type": "key_door",
+        "key_required": True,
+        "enemy": create_enemy(x, y, force_boss=boss_type, rng=rng),
+        "weapons": [],
+        "armors": [],
+        "shop": None,
+        "chest": None,
+        "life_crystal": False,
+        "treasure_room": True  # Indicates there's a treasure room behind this boss
+    }
+
+def create_chest_room(x, y, rng=random):
+    """Stone chamber with a locked chest"""
+    loot = {
+        "weapons": [create_chest_weapon(distance_from_start(x, y) + rng.randint(3, 5), rng)],
+        "potions": 2,
+        "locked": True,
+        "life_crystal": rng.random() < 0.2,
+        "armor": create_chest_armor(x, y, rng) if rng.random() < 0.5 else None
+    }
+    if rng.random() < 0.3:
+        loot["weapons"].append(create_chest_weapon(distance_from_start(x, y) + rng.randint(3, 5), rng))
+    return {
+        "description": "You find an old stone chamber with a heavy locked chest.",
+        "type": "chest",
+        "chest": loot,
+        "enemy": None,
+        "weapons": [],
+        "armors": [],
+        "shop": None,
+        "life_crystal": False
+    }
+
+def create_shop_room(x, y, learned_spells, rng=random):
+    """Shop, discount shop or blacksmith"""
+    items = []
+    for _ in range(rng.randint(0, 2)):
+        base = create_weapon(x, y, rng)
+        bonus = rng.randint(1, 3)
+        
+        # Handle Spell Book damage (which is "???")
+        if base["name"] == "Spell Book":
+            damage = "???"
+        else:
+            damage = base["damage"] + bonus
+        
+        items.append({
+            "name": f"{base['name']}+{bonus}",
+            "damage": damage,
+            "durability": base["durability"] + bonus,
+            "cost": rng.randint(10, 25)
+        })
+    
+    # Generate spell scrolls (40% chance, then 30% chance for 2 different spells)
+    spell_scrolls_shop = {}
+    if rng.random() < 0.4:
+        available_spells = [spell for spell in spells.keys() if spell not in learned_spells]
+        if available_spells:
+            spell1 = rng.choice(available_spells)
+            spell_scrolls_shop[spell1] = 1
+            if rng.random() < 0.3 and len(available_spells) > 1:
+                spell2 = rng.choice([s for s in available_spells if s != spell1])
+                spell_scrolls_shop[spell2] = 1
+    
+    # 35% chance for discount shop
+    is_discount_shop = rng.random() < 0.35
+    discount_multiplier = 0.875 if is_discount_shop else 1.0  # 7.5-12.5% discount (average 10%)
+    
+    # 30% chance for blacksmith shop (when shop is generated)
+    is_blacksmith = rng.random() < 0.3
+    
+    shop = {
+        "items": items,
+        "potion_price": int(rng.randint(8, 15) * discount_multiplier),
+        "stamina_potion_price": int(rng.randint(6, 12) * discount_multiplier),
+        "mana_potion_price": int(rng.randint(15, 20) * discount_multiplier),
+        "has_key": rng.random() < 0.4,
+        "armor": create_armor(x, y, rng) if rng.random() < 0.35 else None,
+        "life_crystal": rng.random() < 0.1,
+        "health_potions": rng.randint(2, 4),  # Always have health potions
+        "stamina_potions": rng.randint(1, 2) if rng.random() < 0.6 else 0,
+        "mana_potions": rng.randint(1, 2) if rng.random() < 0.6 else 0,
+        "waypoint_scrolls": rng.randint(1, 2) if rng.random() < 0.3 else 0,
+        "waypoint_scroll_price": int(rng.randint(25, 35) * discount_multiplier),
+        "spell_scrolls": spell_scrolls_shop,
+        "is_discount_shop": is_discount_shop,
+        "is_blacksmith": is_blacksmith,
+        "repair_price": int(1 * discount_multiplier) if is_blacksmith else None,  # Cost per durability point (1 gold base)
+        "repair_bonus": rng.randint(1, 3) if is_blacksmith else 0  # Extra durability restored
+    }
+    
+    # Apply discount to weapon costs
+    for item in shop["items"]:
+        item["cost"] = int(item["cost"] * discount_multiplier)
+    
+    # Apply discount to spell scroll prices and store calculated prices
+    if shop["spell_scrolls"]:
+        shop["spell_scroll_discount"] = discount_multiplier
+        # Calculate and store spell scroll prices to avoid random price changes
+        shop["spell_scroll_prices"] = {}
+        for spell_name in shop["spell_scrolls"].keys():
+            base_price = rng.randint(40, 80)
+            if is_discount_shop:
+                price = int(base_price * 0.7 * discount_multiplier)
+            else:
+                price = int(base_price * 0.7)
+            shop["spell_scroll_prices"][spell_name] = price
+    
+    if is_blacksmith:
+        shop_description = "A blacksmith's forge with weapons for sale and repair services available!"
+    elif is_discount_shop:
+        shop_description = "A cozy discount shop with items for sale at reduced prices!"
+    else:
+        shop_description = "A cozy shop with items for sale."
+    
+    return {
+        "description": shop_description,
+        "type": "shop",
+        "shop": shop,
+        "enemy": None,
+        "weapons": [],
+        "armors": [],
+        "chest": None,
+        "life_crystal": False
+    }
+
+def create_mysterious_key(floor):
+    return {
+        "floor": floor,
+        "name": f"Mysterious Key (Floor {floor})"
+    }
+
+def create_room_enemy(x, y, is_swarm, rng=random):
+    """Enemy for a normal room: a spider swarm or a single enemy"""
+    if is_swarm:
+        return create_spider_swarm(x, y, rng)
+    return create_enemy(x, y, rng=rng)
+
+def create_normal_room(description, enemy, weapons, armors, mysterious_key_item):
+    return {
+        "description": description,
+        "type": "normal",
+        "enemy": enemy,
+        "weapons": weapons,
+        "armors": armors,
+        "shop": None,
+        "chest": None,
+        "crystal_type": None,  # Crystals only spawn in special crystal rooms
+        "mysterious_key": mysterious_key_item
+    }
+
+def create_room(floor, x, y, learned_spells, rng=random):
     from constants import room_descriptions
     
     # Stairwell room (1 in 25) - requires mysterious key
-    if random.randint(1, 25) == 1:
-        return {
-            "description": "You find a mysterious stairwell leading deeper into the dungeon...",
-            "type": "stairwell",
-            "enemy": None,
-            "weapons": [],
-            "armors": [],
-            "shop": None,
-            "chest": None,
-            "life_crystal": False,
-            "requires_mysterious_key": True
-        }
+    if rng.randint(1, 25) == 1:
+        return create_stairwell_room()
 
     # Golden key door room (1 in 25)
-    if random.randint(1, 25) == 1:
-        # Choose boss based on floor
-        if floor == 2:
-            boss_type = "Baby Dragon"
-            description = "You find a glowing golden door… and a Baby Dragon guarding it!"
-        else:
-            boss_type = "Troll"
-            description = "You find a glowing golden door… and the Troll guarding it!"
-        
-        return {
-            "description": description,
-            "type": "key_door",
-            "key_required": True,
-            "enemy": create_enemy(x, y, force_boss=boss_type),
-            "weapons": [],
-            "armors": [],
-            "shop": None,
-            "chest": None,
-            "life_crystal": False,
-            "treasure_room": True  # Indicates there's a treasure room behind this boss
-        }
+    if rng.randint(1, 25) == 1:
+        return create_key_door_room(floor, x, y, rng)
 
     # Chest room (1 in 15)
-    if random.randint(1, 15) == 1:
-        loot = {
-            "weapons": [create_chest_weapon(distance_from_start(x, y) + random.randint(3, 5))],
-            "potions": 2,
-            "locked": True,
-            "life_crystal": random.random() < 0.2,
-            "armor": create_chest_armor(x, y) if random.random() < 0.5 else None
-        }
-        if random.random() < 0.3:
-            loot["weapons"].append(create_chest_weapon(distance_from_start(x, y) + random.randint(3, 5)))
-        return {
-            "description": "You find an old stone chamber with a heavy locked chest.",
-            "type": "chest",
-            "chest": loot,
-            "enemy": None,
-            "weapons": [],
-            "armors": [],
-            "shop": None,
-            "life_crystal": False
-        }
+    if rng.randint(1, 15) == 1:
+        return create_chest_room(x, y, rng)
 
     # Shop (10% chance)
-    if random.random() < 0.1:
-        items = []
-        for _ in range(random.randint(0, 2)):
-            base = create_weapon(x, y)
-            bonus = random.randint(1, 3)
-            
-            # Handle Spell Book damage (which is "???")
-            if base["name"] == "Spell Book":
-                damage = "???"
-            else:
-                damage = base["damage"] + bonus
-            
-            items.append({
-                "name": f"{base['name']}+{bonus}",
-                "damage": damage,
-                "durability": base["durability"] + bonus,
-                "cost": random.randint(10, 25)
-            })
-        
-        # Generate spell scrolls (40% chance, then 30% chance for 2 different spells)
-        spell_scrolls_shop = {}
-        if random.random() < 0.4:
-            available_spells = [spell for spell in spells.keys() if spell not in learned_spells]
-            if available_spells:
-                spell1 = random.choice(available_spells)
-                spell_scrolls_shop[spell1] = 1
-                if random.random() < 0.3 and len(available_spells) > 1:
-                    spell2 = random.choice([s for s in available_spells if s != spell1])
-                    spell_scrolls_shop[spell2] = 1
-        
-        # 35% chance for discount shop
-        is_discount_shop = random.random() < 0.35
-        discount_multiplier = 0.875 if is_discount_shop else 1.0  # 7.5-12.5% discount (average 10%)
-        
-        # 30% chance for blacksmith shop (when shop is generated)
-        is_blacksmith = random.random() < 0.3
-        
-        shop = {
-            "items": items,
-            "potion_price": int(random.randint(8, 15) * discount_multiplier),
-            "stamina_potion_price": int(random.randint(6, 12) * discount_multiplier),
-            "mana_potion_price": int(random.randint(15, 20) * discount_multiplier),
-            "has_key": random.random() < 0.4,
-            "armor": create_armor(x, y) if random.random() < 0.35 else None,
-            "life_crystal": random.random() < 0.1,
-            "health_potions": random.randint(2, 4),  # Always have health potions
-            "stamina_potions": random.randint(1, 2) if random.random() < 0.6 else 0,
-            "mana_potions": random.randint(1, 2) if random.random() < 0.6 else 0,
-            "waypoint_scrolls": random.randint(1, 2) if random.random() < 0.3 else 0,
-            "waypoint_scroll_price": int(random.randint(25, 35) * discount_multiplier),
-            "spell_scrolls": spell_scrolls_shop,
-            "is_discount_shop": is_discount_shop,
-            "is_blacksmith": is_blacksmith,
-            "repair_price": int(1 * discount_multiplier) if is_blacksmith else None,  # Cost per durability point (1 gold base)
-            "repair_bonus": random.randint(1, 3) if is_blacksmith else 0  # Extra durability restored
-        }
-        
-        # Apply discount to weapon costs
-        for item in shop["items"]:
-            item["cost"] = int(item["cost"] * discount_multiplier)
-        
-        # Apply discount to spell scroll prices and store calculated prices
-        if shop["spell_scrolls"]:
-            shop["spell_scroll_discount"] = discount_multiplier
-            # Calculate and store spell scroll prices to avoid random price changes
-            shop["spell_scroll_prices"] = {}
-            for spell_name in shop["spell_scrolls"].keys():
-                base_price = random.randint(40, 80)
-                if is_discount_shop:
-                    price = int(base_price * 0.7 * discount_multiplier)
-                else:
-                    price = int(base_price * 0.7)
-                shop["spell_scroll_prices"][spell_name] = price
-        
-        if is_blacksmith:
-            shop_description = "A blacksmith's forge with weapons for sale and repair services available!"
-        elif is_discount_shop:
-            shop_description = "A cozy discount shop with items for sale at reduced prices!"
-        else:
-            shop_description = "A cozy shop with items for sale."
-        
-        return {
-            "description": shop_description,
-            "type": "shop",
-            "shop": shop,
-            "enemy": None,
-            "weapons": [],
-            "armors": [],
-            "chest": None,
-            "life_crystal": False
-        }
+    if rng.random() < 0.1:
+        return create_shop_room(x, y, learned_spells, rng)
 
     # Crystal room (5% chance) - can have life, stamina, or mana crystal, or combinations
     crystal_type = None
-    if random.random() < 0.05:
-        crystal_roll = random.random()
+    if rng.random() < 0.05:
+        crystal_roll = rng.random()
         if crystal_roll < 0.175:  # 17.5% chance for dual crystals
-            if random.random() < 0.5:
+            if rng.random() < 0.5:
                 crystal_type = "life_stamina"  # Life + Stamina
             else:
                 crystal_type = "life_mana"  # Life + Mana
@@ -490,7 +552,7 @@ def create_room(floor, x, y, learned_spells):
             crystal_type = "all"  # All three crystals
         else:
             # Single crystal (78% chance within crystal rooms)
-            crystal_choice = random.random()
+            crystal_choice = rng.random()
             if crystal_choice < 0.33:
                 crystal_type = "life"
             elif crystal_choice < 0.67:
@@ -499,67 +561,218 @@ def create_room(floor, x, y, learned_spells):
                 crystal_type = "mana"
     
     weapons = []
-    if random.random() < 0.3:
-        weapons.append(create_weapon(x, y))
+    if rng.random() < 0.3:
+        weapons.append(create_weapon(x, y, rng))
     armors = []
-    if random.random() < 0.2:
-        armors.append(create_armor(x, y))
+    if rng.random() < 0.2:
+        armors.append(create_armor(x, y, rng))
     
     # Mysterious key (1 in 50 chance)
     mysterious_key_item = None
-    if random.randint(1, 50) == 1:
-        mysterious_key_item = {
-            "floor": floor,
-            "name": f"Mysterious Key (Floor {floor})"
-        }
+    if rng.randint(1, 50) == 1:
+        mysterious_key_item = create_mysterious_key(floor)
     
     # Enemy generation with spider swarm support
     enemy = None
-    if random.random() < 0.5:
+    if rng.random() < 0.5:
         # 15% chance for spider swarm, 85% chance for regular enemy
-        if random.random() < 0.15:
-            enemy = create_spider_swarm(x, y)
-        else:
-            enemy = create_enemy(x, y)
+        enemy = create_room_enemy(x, y, rng.random() < 0.15, rng)
     
+    return create_normal_room(rng.choice(room_descriptions), enemy, weapons, armors, mysterious_key_item)
+
+def create_start_room():
+    """Create the training dummy clearing at Floor 1 (0, 0)"""
     return {
-        "description": random.choice(room_descriptions),
+        "description": "You are in a clearing with a training dummy.",
         "type": "normal",
-        "enemy": enemy,
-        "weapons": weapons,
-        "armors": armors,
+        "enemy": {
+            "name": "Training Dummy",
+            "hp": 999,  # Very high HP so it doesn't die
+            "base_attack": 0,  # No damage
+            "is_boss": False,
+            "is_training_dummy": True  # Special flag for training dummy
+        },
+        "weapons": [{
+            "name": "Rusty Sword",
+            "damage": 5,
+            "durability": 10
+        }],
+        "armors": [],
         "shop": None,
         "chest": None,
-        "crystal_type": None,  # Crystals only spawn in special crystal rooms
-        "mysterious_key": mysterious_key_item
+        "crystal_type": None
     }
 
+def generate_room(floor, x, y, learned_spells, rng=random):
+    """Generate a fresh room, including the fixed starting room"""
+    if floor == 1 and x == 0 and y == 0:
+        room = create_start_room()
+    else:
+        room = create_room(floor, x, y, learned_spells, rng)
+    return compact_room(room) if COMPACT_ROOMS else room
+
+# --- Seeded worlds ---
+# When a world seed is set, every room is derived from a hash of
+# (seed, floor, x, y) instead of the global random module. Pristine rooms can
+# then be regenerated at any time, so only rooms the player changed are kept.
+world_seed = None
+
+def new_world_seed():
+    """Pick a seed for a new world"""
+    return random.getrandbits(63)
+
+def set_world_seed(seed):
+    """Switch new floors to seeded generation (None restores the legacy mode)"""
+    global world_seed
+    world_seed = seed
+
+def room_seed(seed, floor, x, y):
+    """Counter-based hash of a room's coordinates under the world seed"""
+    key = f"{seed}:{floor}:{x}:{y}".encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "big")
+
+def room_rng(seed, floor, x, y):
+    """Private random stream for a single room"""
+    return random.Random(room_seed(seed, floor, x, y))
+
+def generate_seeded_room(seed, floor, x, y):
+    """Regenerate the pristine version of a room in a seeded world.
+
+    Shop spell scrolls are drawn from every spell rather than the ones the
+    player has not learned yet, so the same room always comes back the same.
+    """
+    return generate_room(floor, x, y, (), room_rng(seed, floor, x, y))
+
+def room_fingerprint(room):
+    """Hash of a room's full contents, used to spot rooms the player changed"""
+    return text_fingerprint(json.dumps(room, sort_keys=True, default=to_plain))
+
+def text_fingerprint(text):
+    """Fingerprint of a room that is already encoded as sorted JSON"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+class SeededFloor:
+    """One floor of a seeded world that stores only changed rooms.
+
+    Recently visited rooms stay in a small live cache together with the
+    fingerprint they had when generated. When a room falls out of the cache it
+    is kept in `modified` only if its contents changed; otherwise it is simply
+    dropped and regenerated the next time it is needed.
+    """
+    LIVE_ROOMS = 64
+
+    def __init__(self, seed, floor, modified=None):
+        self.seed = seed
+        self.floor = floor
+        self.modified = dict(modified) if modified else {}
+        self._live = OrderedDict()  # (x, y) -> (room, pristine fingerprint)
+
+    def get_room(self, x, y):
+        pos = (x, y)
+        if pos in self.modified:
+            return self.modified[pos]
+        entry = self._live.get(pos)
+        if entry is not None:
+            self._live.move_to_end(pos)
+            return entry[0]
+        room = generate_seeded_room(self.seed, self.floor, x, y)
+        self.add_pristine(pos, room, room_fingerprint(room))
+        return room
+
+    def add_pristine(self, pos, room, fingerprint):
+        """Place a freshly generated room in the live cache"""
+        self._live[pos] = (room, fingerprint)
+        while len(self._live) > self.LIVE_ROOMS:
+            old_pos, (old_room, old_fingerprint) = self._live.popitem(last=False)
+            if room_fingerprint(old_room) != old_fingerprint:
+                self.modified[old_pos] = old_room
+
+    def is_changed(self, pos):
+        if pos in self.modified:
+            return True
+        entry = self._live.get(pos)
+        return entry is not None and room_fingerprint(entry[0]) != entry[1]
+
+    def changed_items(self):
+        """(x, y), room pairs that differ from their generated version"""
+        for pos, (room, fingerprint) in self._live.items():
+            if room_fingerprint(room) != fingerprint:
+                yield pos, room
+        yield from self.modified.items()
+
+    # Dict-style access so code written for plain floor dicts keeps working
+    def __contains__(self, pos):
+        return pos in self.modified or pos in self._live
+
+    def __getitem__(self, pos):
+        return self.get_room(*pos)
+
+    def __setitem__(self, pos, room):
+        self._live.pop(pos, None)
+        self.modified[pos] = room
+
+    def __len__(self):
+        return len(self.modified) + len(self._live)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self):
+        return list(self.modified) + list(self._live)
+
+    def values(self):
+        return list(self.modified.values()) + [room for room, _ in self._live.values()]
+
+    def items(self):
+        return list(self.modified.items()) + [(pos, room) for pos, (room, _) in self._live.items()]
+
+def room_needs_saving(world, pos):
+    """Whether a room differs from what loading the save would recreate without it"""
+    if isinstance(world, SeededFloor):
+        return world.is_changed(pos)
+    return True
+
+def iter_saved_rooms(world):
+    """Rooms of one floor that need to be written to a save"""
+    if isinstance(world, SeededFloor):
+        return world.changed_items()
+    return world.items()
+
+# Rooms handed out by get_room since the last save; the save journal only
+# looks at these instead of every room in the world
+touched_rooms = set()
+
+# Background saves that are still reading rooms. A room is copied into them
+# before it is handed out, so the save sees it as it was when the save started.
+room_snapshots = []
+
+# Called with (floor, x, y) for every touched room, e.g. to mark its save chunk dirty
+touch_listeners = []
+
+def touch_room(floor, x, y, room):
+    """Mark a room that is about to change so the next incremental save picks it up"""
+    touched_rooms.add((floor, x, y))
+    for snapshot in room_snapshots:
+        snapshot.capture(floor, x, y, room)
+    for listener in touch_listeners:
+        listener(floor, x, y)
+
+def take_touched_rooms():
+    """Return and reset the rooms touched since the last call"""
+    global touched_rooms
+    rooms, touched_rooms = touched_rooms, set()
+    return rooms
+
 def get_room(floor, x, y, worlds, learned_spells):
     if floor not in worlds:
-        worlds[floor] = {}
-    
-    if (x, y) not in worlds[floor]:
-        if floor == 1 and x == 0 and y == 0:
-            worlds[floor][(x, y)] = {
-                "description": "You are in a clearing with a training dummy.",
-                "type": "normal",
-                "enemy": {
-                    "name": "Training Dummy",
-                    "hp": 999,  # Very high HP so it doesn't die
-                    "base_attack": 0,  # No damage
-                    "is_boss": False,
-                    "is_training_dummy": True  # Special flag for training dummy
-                },
-                "weapons": [{
-                    "name": "Rusty Sword",
-                    "damage": 5,
-                    "durability": 10
-                }],
-                "armors": [],
-                "shop": None,
-                "chest": None,
-                "crystal_type": None
-            }
-        else:
-            worlds[floor][(x, y)] = create_room(floor, x, y, learned_spells)
-    return worlds[floor][(x, y)] 
\ No newline at end of file
+        worlds[floor] = SeededFloor(world_seed, floor) if world_seed is not None else {}
+    
+    world = worlds[floor]
+    if isinstance(world, SeededFloor):
+        room = world.get_room(x, y)
+    else:
+        if (x, y) not in world:
+            world[(x, y)] = generate_room(floor, x, y, learned_spells)
+        room = world[(x, y)]
+    touch_room(floor, x, y, room)
+    return room